@@ -4,6 +4,8 @@ import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 from trimesh.creation import torus
 
+from render_cache import cached_render
+
 
 FUSELAGE_LENGTH = 20.0
 FUSELAGE_RADIUS = 1.35
@@ -326,33 +328,40 @@ def create_parabolic_antenna():
     return [cone, mast]
 
 # --- Función combine_meshes y plot_mesh ya definidas por ti ---
-def plot_mesh(mesh, filename="Falcon_Parker_Advanced_Enhanced_2.png"):
-    fig = plt.figure(figsize=(14, 14))
-    ax = fig.add_subplot(111, projection='3d')
+def plot_mesh(mesh, filename="Falcon_Parker_Advanced_Enhanced_2.png", elev=35, azim=40, dpi=300):
+    # Se omite el render si la misma geometría/cámara ya está en la caché
+    camera = {"elev": elev, "azim": azim, "margin": 3}
+    image = {"figsize": (14, 14), "dpi": dpi}
+
+    def render(mesh, filename):
+        fig = plt.figure(figsize=(14, 14))
+        ax = fig.add_subplot(111, projection='3d')
+
+        faces = mesh.faces
+        vertices = mesh.vertices
 
-    faces = mesh.faces
-    vertices = mesh.vertices
+        # Normalizar colores de las caras si existen
+        face_colors = mesh.visual.face_colors / 255.0 if hasattr(mesh.visual, 'face_colors') else (0.2, 0.4, 0.6, 0.9)
 
-    # Normalizar colores de las caras si existen
-    face_colors = mesh.visual.face_colors / 255.0 if hasattr(mesh.visual, 'face_colors') else (0.2, 0.4, 0.6, 0.9)
+        collection = Poly3DCollection(vertices[faces], alpha=0.9, linewidths=0.7, edgecolors=(0.1, 0.1, 0.1, 0.8))
+        collection.set_facecolor(face_colors)
+        ax.add_collection3d(collection)
 
-    collection = Poly3DCollection(vertices[faces], alpha=0.9, linewidths=0.7, edgecolors=(0.1, 0.1, 0.1, 0.8))
-    collection.set_facecolor(face_colors)
-    ax.add_collection3d(collection)
+        bounds = mesh.bounds
+        margin = 3
+        ax.set_xlim(bounds[0][0] - margin, bounds[1][0] + margin)
+        ax.set_ylim(bounds[0][1] - margin, bounds[1][1] + margin)
+        ax.set_zlim(bounds[0][2] - margin, bounds[1][2] + margin)
 
-    bounds = mesh.bounds
-    margin = 3
-    ax.set_xlim(bounds[0][0] - margin, bounds[1][0] + margin)
-    ax.set_ylim(bounds[0][1] - margin, bounds[1][1] + margin)
-    ax.set_zlim(bounds[0][2] - margin, bounds[1][2] + margin)
+        ax.set_axis_off()
+        ax.view_init(elev=elev, azim=azim)
 
-    ax.set_axis_off()
-    ax.view_init(elev=35, azim=40)
+        plt.tight_layout()
+        plt.savefig(filename, dpi=dpi)
+        plt.close()
+        print(f"Imagen renderizada guardada como: {filename}")
 
-    plt.tight_layout()
-    plt.savefig(filename, dpi=300)
-    plt.close()
-    print(f"Imagen renderizada guardada como: {filename}")
+    return cached_render(mesh, filename, render, camera=camera, image=image)
 
 def main():
     components = [
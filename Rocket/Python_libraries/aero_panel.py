@@ -0,0 +1,216 @@
+# aero_panel.py
+# Aerodinámica hipersónica por paneles: Newton modificado y cuña tangente, con sombreado.
+# Cp depende de cada cara solo a través de sin(δ); las caras se proyectan una vez por dirección (α, β)
+# sobre una base lineal en sin(δ) y el barrido en Mach es un producto de matrices.
+
+import hashlib
+import os
+import sys
+import time
+
+import numpy as np
+
+from assembly import Assembly, falcon_parker_assembly
+from ray_caster import RayCaster
+from render_cache import DiskLRUCache, cache_dir
+
+GAMMA = 1.4
+SIN_NODES = 257              # nodos de la base lineal en sin(δ)
+DETACHMENT_DEG = 40.0        # por encima: Newton modificado; por debajo: cuña tangente
+DIRECTIONS_PER_CHUNK = 32
+SHADOW_CACHE_DIR = cache_dir("aero_shadow")
+
+
+# ----------------------------
+# COEFICIENTES DE PRESIÓN
+# ----------------------------
+
+def cp_max(mach, gamma=GAMMA):
+    """Stagnation-point Cp behind a normal shock (Rayleigh pitot formula)"""
+    m2 = np.asarray(mach, dtype=float) ** 2
+    p02_p1 = (((gamma + 1) ** 2 * m2 / (4 * gamma * m2 - 2 * (gamma - 1))) ** (gamma / (gamma - 1))
+              * (1 - gamma + 2 * gamma * m2) / (gamma + 1))
+    return 2 / (gamma * m2) * (p02_p1 - 1)
+
+
+def cp_newtonian(mach, sin_delta, gamma=GAMMA):
+    return cp_max(mach, gamma)[..., None] * np.maximum(sin_delta, 0) ** 2
+
+
+def cp_tangent_wedge(mach, sin_delta, gamma=GAMMA):
+    """Hypersonic tangent-wedge: Cp = 2 s² [(γ+1)/4 + sqrt(((γ+1)/4)² + 1/(M s)²)], s = sin δ"""
+    s = np.maximum(sin_delta, 0)
+    k = np.asarray(mach, dtype=float)[..., None] * s
+    g = (gamma + 1) / 4
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cp = 2 * s ** 2 * (g + np.sqrt(g ** 2 + 1 / k ** 2))
+    return np.where(s > 0, cp, 0.0)
+
+
+def pressure_coefficient(mach, sin_delta, method="auto", gamma=GAMMA):
+    """(n_mach, n_faces) Cp for 'newtonian', 'tangent_wedge' or 'auto' (wedge on shallow faces)"""
+    if method == "newtonian":
+        return cp_newtonian(mach, sin_delta, gamma)
+    if method == "tangent_wedge":
+        return cp_tangent_wedge(mach, sin_delta, gamma)
+    shallow = sin_delta < np.sin(np.radians(DETACHMENT_DEG))
+    return np.where(shallow, cp_tangent_wedge(mach, sin_delta, gamma), cp_newtonian(mach, sin_delta, gamma))
+
+
+# ----------------------------
+# GEOMETRÍA DEL FLUJO
+# ----------------------------
+
+def flow_directions(alpha_deg, beta_deg, nose_axis=2, lift_axis=0):
+    """Direction the air moves in body axes, (n_alpha, n_beta, 3). The flow arrives on the nose
+    (+nose_axis); positive α brings it from below (-lift_axis), positive β from -side axis."""
+    side_axis = 3 - nose_axis - lift_axis
+    a = np.radians(np.asarray(alpha_deg, dtype=float))[:, None]
+    b = np.radians(np.asarray(beta_deg, dtype=float))[None, :]
+    d = np.zeros(a.shape[:1] + b.shape[1:] + (3,))
+    d[..., nose_axis] = -np.cos(a) * np.cos(b)
+    d[..., lift_axis] = np.sin(a) * np.cos(b)
+    d[..., side_axis] = np.sin(b)
+    return d
+
+
+class AeroModel:
+    """Face data of a mesh or Assembly reduced to what the panel method needs"""
+
+    def __init__(self, model, reference_point=None, s_ref=None, l_ref=None, nose_axis=2, lift_axis=0):
+        self.assembly = model if isinstance(model, Assembly) else Assembly.from_meshes([model])
+        asm = self.assembly
+        self.nose_axis, self.lift_axis = nose_axis, lift_axis
+        extent = asm.bounds[1] - asm.bounds[0]
+        self.reference_point = asm.bounds.mean(axis=0) if reference_point is None else np.asarray(reference_point)
+        others = [i for i in range(3) if i != nose_axis]
+        self.s_ref = s_ref if s_ref is not None else np.pi / 4 * extent[others[0]] * extent[others[1]]
+        self.l_ref = l_ref if l_ref is not None else extent[nose_axis]
+
+        # Fuerza de la cara por unidad de q·Cp: -n A; momento: r × (-n A)
+        force = -asm.face_normals * asm.face_areas[:, None]
+        moment = np.cross(asm.face_centers - self.reference_point, force)
+        self.loads = np.hstack([force, moment])
+        self._caster = None
+
+    def shadow_masks(self, directions, use_cache=True):
+        """(n_dirs, n_faces) True where the face centre is hidden upstream by other geometry"""
+        digest = hashlib.blake2b(np.round(directions, 9).tobytes(), digest_size=8).hexdigest()
+        key = f"{self.assembly.fingerprint()}-{digest}"
+        cache = DiskLRUCache(SHADOW_CACHE_DIR) if use_cache else None
+        n_faces = len(self.assembly.faces)
+        if cache is not None:
+            cached = cache.get(key, ".npy")
+            if cached is not None:
+                return np.unpackbits(np.load(cached), axis=1, count=n_faces).astype(bool)
+
+        if self._caster is None:
+            self._caster = RayCaster(self.assembly)
+        asm = self.assembly
+        masks = np.zeros((len(directions), n_faces), dtype=bool)
+        for i, d in enumerate(directions):
+            windward = asm.face_normals @ d < 0
+            faces = np.nonzero(windward)[0]
+            origins = asm.face_centers[faces] + asm.face_normals[faces] * 1e-6
+            masks[i, faces] = self._caster.occluded(origins, np.broadcast_to(-d, origins.shape))
+        if cache is not None:
+            tmp = cache.path_for(key, ".build.npy")
+            np.save(tmp, np.packbits(masks, axis=1))
+            cache.put(key, tmp, ".npy")
+            os.remove(tmp)
+        return masks
+
+
+# ----------------------------
+# BARRIDO
+# ----------------------------
+
+class AeroTable:
+    """Coefficients over the (mach, alpha, beta) grid; forces/moments in body axes, CL/CD in wind axes"""
+
+    def __init__(self, mach, alpha, beta, body_forces, body_moments, flow, lift_axis, s_ref, l_ref):
+        self.mach, self.alpha, self.beta = mach, alpha, beta
+        self.CF = body_forces      # (M, A, B, 3) fuerza / (q S_ref)
+        self.CM = body_moments     # (M, A, B, 3) momento / (q S_ref L_ref)
+        self.CD = np.einsum("mabi,abi->mab", body_forces, flow)
+        # Sustentación: perpendicular al flujo, en el plano morro-eje de sustentación
+        up = np.zeros(3)
+        up[lift_axis] = 1.0
+        lift_dir = up - (flow @ up)[..., None] * flow
+        lift_dir /= np.maximum(np.linalg.norm(lift_dir, axis=-1, keepdims=True), 1e-12)
+        self.CL = np.einsum("mabi,abi->mab", body_forces, lift_dir)
+        self.s_ref, self.l_ref = s_ref, l_ref
+
+    def save_npz(self, filename):
+        np.savez(filename, mach=self.mach, alpha=self.alpha, beta=self.beta, CF=self.CF, CM=self.CM,
+                 CD=self.CD, CL=self.CL, s_ref=self.s_ref, l_ref=self.l_ref)
+        return filename
+
+
+def aero_sweep(model, mach, alpha_deg, beta_deg, method="auto", shadowing="rays", gamma=GAMMA,
+               chunk=DIRECTIONS_PER_CHUNK):
+    """Forces and moments for every (Mach, α, β) at once.
+
+    shadowing='normals' only drops leeward faces (Newtonian shadow); 'rays' also drops windward faces
+    hidden by upstream parts, using the shared ray caster (masks cached per geometry and direction set).
+    """
+    aero = model if isinstance(model, AeroModel) else AeroModel(model)
+    mach = np.atleast_1d(np.asarray(mach, dtype=float))
+    alpha_deg = np.atleast_1d(alpha_deg)
+    beta_deg = np.atleast_1d(beta_deg)
+    flow = flow_directions(alpha_deg, beta_deg, aero.nose_axis, aero.lift_axis)
+    directions = flow.reshape(-1, 3)
+    normals = aero.assembly.face_normals
+
+    # Cp en los nodos de la base: (n_mach, SIN_NODES)
+    nodes = np.linspace(0, 1, SIN_NODES)
+    cp_nodes = pressure_coefficient(mach, nodes, method, gamma)
+
+    projected = np.zeros((len(directions), SIN_NODES, 6))
+    for lo in range(0, len(directions), chunk):
+        block = directions[lo:lo + chunk]
+        sin_delta = -(normals @ block.T).T                      # (chunk, F)
+        if shadowing == "rays":
+            sin_delta[aero.shadow_masks(block)] = 0.0
+        dir_idx, face = np.nonzero(sin_delta > 0)
+        s = sin_delta[dir_idx, face] * (SIN_NODES - 1)
+        k = np.minimum(s.astype(np.int64), SIN_NODES - 2)
+        frac = s - k
+        bucket = dir_idx * SIN_NODES + k
+        size = len(block) * SIN_NODES
+        for c in range(6):
+            load = aero.loads[face, c]
+            projected[lo:lo + len(block), :, c] += (np.bincount(bucket, load * (1 - frac), minlength=size)
+                                                    + np.bincount(bucket + 1, load * frac, minlength=size)
+                                                    ).reshape(len(block), SIN_NODES)
+
+    totals = np.einsum("mk,dkc->mdc", cp_nodes, projected).reshape(len(mach), len(alpha_deg), len(beta_deg), 6)
+    return AeroTable(mach, alpha_deg, beta_deg, totals[..., :3] / aero.s_ref,
+                     totals[..., 3:] / (aero.s_ref * aero.l_ref), flow, aero.lift_axis, aero.s_ref, aero.l_ref)
+
+
+if __name__ == "__main__":
+    # Uso: python aero_panel.py [caras_mínimas] [normals|rays]
+    min_faces = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    shadowing = sys.argv[2] if len(sys.argv) > 2 else "rays"
+
+    ship = falcon_parker_assembly()
+    mesh = ship.to_mesh()
+    while len(mesh.faces) < min_faces:
+        mesh = mesh.subdivide()
+    aero = AeroModel(Assembly.from_meshes([mesh], names=["falcon_parker"]))
+
+    mach = np.linspace(2, 25, 50)
+    alpha = np.linspace(-10, 40, 50)
+    beta = np.linspace(-10, 10, 10)
+    start = time.perf_counter()
+    table = aero_sweep(aero, mach, alpha, beta, shadowing=shadowing)
+    elapsed = time.perf_counter() - start
+    print(f"{len(mesh.faces)} caras, barrido {len(mach)}x{len(alpha)}x{len(beta)} en {elapsed:.2f} s "
+          f"(sombreado: {shadowing})")
+    m10, b0 = np.argmin(np.abs(mach - 10)), np.argmin(np.abs(beta))
+    for a in range(0, len(alpha), 7):
+        print(f"  M={mach[m10]:.1f} α={alpha[a]:5.1f}°  CD={table.CD[m10, a, b0]:7.3f}  CL={table.CL[m10, a, b0]:7.3f}  "
+              f"Cm={table.CM[m10, a, b0, 1]:7.3f}")
+    table.save_npz("aero_table.npz")
+    print("Tabla guardada en aero_table.npz")
@@ -0,0 +1,192 @@
+# antenna_blockage.py
+# Línea de vista de las antenas sobre toda la esfera (rejilla HEALPix, píxeles de igual área).
+# Todas las antenas se lanzan en un solo lote contra el mismo BVH; el resultado se guarda en caché
+# por huella de la geometría.
+
+import hashlib
+import os
+import sys
+import time
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from assembly import falcon_parker_assembly
+from ray_caster import RayCaster
+from render_cache import DiskLRUCache, cache_dir
+
+NSIDE = 32                   # 12 * 32² = 12288 direcciones por antena
+CONTACT_DISTANCE = 0.01      # m: componentes que tocan el centro de fase no cuentan como bloqueo
+BLOCKAGE_CACHE_DIR = cache_dir("antenna_blockage")
+
+
+# ----------------------------
+# REJILLA HEALPIX (ESQUEMA RING)
+# ----------------------------
+
+def healpix_directions(nside):
+    """Unit vectors at the centres of the 12 * nside² equal-area HEALPix pixels, RING ordering"""
+    npix = 12 * nside ** 2
+    ncap = 2 * nside * (nside - 1)
+    p = np.arange(npix)
+    z = np.empty(npix)
+    phi = np.empty(npix)
+
+    north = p < ncap
+    i = np.floor((1 + np.sqrt(1 + 2 * p[north])) / 2)
+    j = p[north] - 2 * i * (i - 1) + 1
+    z[north] = 1 - i ** 2 / (3 * nside ** 2)
+    phi[north] = (j - 0.5) * np.pi / (2 * i)
+
+    belt = (p >= ncap) & (p < npix - ncap)
+    q = p[belt] - ncap
+    i = np.floor(q / (4 * nside)) + nside
+    j = q % (4 * nside) + 1
+    s = (i - nside + 1) % 2
+    z[belt] = 4 / 3 - 2 * i / (3 * nside)
+    phi[belt] = (j - s / 2) * np.pi / (2 * nside)
+
+    south = p >= npix - ncap
+    q = npix - p[south]
+    i = np.floor((1 + np.sqrt(2 * q - 1)) / 2)
+    j = 4 * i + 1 - (q - 2 * i * (i - 1))
+    z[south] = -1 + i ** 2 / (3 * nside ** 2)
+    phi[south] = (j - 0.5) * np.pi / (2 * i)
+
+    r = np.sqrt(1 - z ** 2)
+    return np.column_stack([r * np.cos(phi), r * np.sin(phi), z])
+
+
+# ----------------------------
+# ANTENAS
+# ----------------------------
+
+def antenna_phase_centers(assembly, prefix="comms/"):
+    """Phase centre of every antenna component: top centre of its bounding box (masts, tips, dishes)"""
+    names, centers = [], []
+    for index in assembly.select(prefix):
+        lo, hi = assembly.meshes[index].bounds
+        names.append(assembly.names[index])
+        centers.append([(lo[0] + hi[0]) / 2, (lo[1] + hi[1]) / 2, hi[2] + 1e-3])
+    return names, np.array(centers)
+
+
+def contact_mask(assembly, centers, distance=CONTACT_DISTANCE):
+    """(n_antennas, n_components) True for components touching each phase centre (its own mast, tip...)"""
+    lo = np.array([m.bounds[0] for m in assembly.meshes])
+    hi = np.array([m.bounds[1] for m in assembly.meshes])
+    gap = np.maximum(np.maximum(lo[None] - centers[:, None], centers[:, None] - hi[None]), 0)
+    return np.linalg.norm(gap, axis=2) <= distance
+
+
+class BlockageMap:
+    """blocker[a, p]: component that blocks antenna a towards pixel p, -1 for a clear line of sight"""
+
+    def __init__(self, names, antenna_names, centers, nside, blocker):
+        self.names = list(names)
+        self.antenna_names = list(antenna_names)
+        self.centers = centers
+        self.nside = int(nside)
+        self.blocker = blocker
+
+    @property
+    def directions(self):
+        return healpix_directions(self.nside)
+
+    @property
+    def clear(self):
+        return self.blocker < 0
+
+    def coverage(self):
+        """Clear fraction of the sphere per antenna (pixels have equal area)"""
+        return self.clear.mean(axis=1)
+
+    def combined_coverage(self, min_antennas=1):
+        """Figure of merit: fraction of the sphere seen by at least min_antennas antennas"""
+        return float((self.clear.sum(axis=0) >= min_antennas).mean())
+
+    def blockers(self, antenna, top=5):
+        """Components blocking one antenna, sorted by blocked solid angle (sr)"""
+        row = self.antenna_names.index(antenna) if isinstance(antenna, str) else antenna
+        counts = np.bincount(self.blocker[row][self.blocker[row] >= 0], minlength=len(self.names))
+        pixel_sr = 4 * np.pi / self.blocker.shape[1]
+        order = np.argsort(counts)[::-1][:top]
+        return [(self.names[i], counts[i] * pixel_sr) for i in order if counts[i] > 0]
+
+    def save_npz(self, filename):
+        np.savez(filename, names=np.array(self.names), antenna_names=np.array(self.antenna_names),
+                 centers=self.centers, nside=self.nside, blocker=self.blocker)
+        return filename
+
+    @classmethod
+    def load_npz(cls, filename):
+        with np.load(filename) as data:
+            return cls([str(n) for n in data["names"]], [str(n) for n in data["antenna_names"]], data["centers"],
+                       data["nside"], data["blocker"])
+
+    def plot(self, filename="antenna_coverage.png", dpi=120):
+        directions = self.directions
+        lon = np.arctan2(directions[:, 1], directions[:, 0])
+        lat = np.arcsin(np.clip(directions[:, 2], -1, 1))
+        n = len(self.antenna_names) + 1
+        cols = 3
+        rows = (n + cols - 1) // cols
+        fig = Figure(figsize=(5 * cols, 3 * rows))
+        FigureCanvasAgg(fig)
+        panels = [(name, self.clear[a].astype(float)) for a, name in enumerate(self.antenna_names)]
+        panels.append((f"Combinada ({self.combined_coverage() * 100:.1f}% ≥1 antena)", self.clear.sum(axis=0)))
+        for k, (title, values) in enumerate(panels):
+            ax = fig.add_subplot(rows, cols, k + 1, projection="mollweide")
+            ax.scatter(lon, lat, c=values, s=1, cmap="viridis")
+            ax.set_title(title, fontsize=8)
+            ax.set_xticklabels([])
+            ax.set_yticklabels([])
+        fig.tight_layout()
+        fig.savefig(filename, dpi=dpi)
+        return filename
+
+
+def blockage_map(assembly, antenna_names=None, centers=None, nside=NSIDE, caster=None, processes=1, use_cache=True):
+    """Cast one ray per HEALPix pixel from every phase centre and keep the first blocking component"""
+    if centers is None:
+        antenna_names, centers = antenna_phase_centers(assembly)
+    centers = np.atleast_2d(np.asarray(centers, dtype=float))
+    digest = hashlib.blake2b(centers.tobytes() + ",".join(antenna_names).encode(), digest_size=8).hexdigest()
+    key = f"{assembly.fingerprint()}-{digest}-nside{nside}"
+    cache = DiskLRUCache(BLOCKAGE_CACHE_DIR) if use_cache else None
+    if cache is not None:
+        cached = cache.get(key, ".npz")
+        if cached is not None:
+            return BlockageMap.load_npz(cached)
+
+    caster = caster if caster is not None else RayCaster(assembly)
+    directions = healpix_directions(nside)
+    n_antennas, n_pix = len(centers), len(directions)
+    hits = caster.intersect_ignoring(np.repeat(centers, n_pix, axis=0), np.tile(directions, (n_antennas, 1)),
+                                     contact_mask(assembly, centers), group=np.repeat(np.arange(n_antennas), n_pix),
+                                     processes=processes)
+    result = BlockageMap(assembly.names, antenna_names, centers, nside,
+                         hits.component.reshape(n_antennas, n_pix).astype(np.int32))
+    if cache is not None:
+        tmp = cache.path_for(key, ".build.npz")
+        result.save_npz(tmp)
+        cache.put(key, tmp, ".npz")
+        os.remove(tmp)
+    return result
+
+
+if __name__ == "__main__":
+    # Uso: python antenna_blockage.py [nside]
+    nside = int(sys.argv[1]) if len(sys.argv) > 1 else NSIDE
+    ship = falcon_parker_assembly()
+    start = time.perf_counter()
+    result = blockage_map(ship, nside=nside)
+    print(f"{len(result.antenna_names)} antenas x {12 * nside ** 2} direcciones en {time.perf_counter() - start:.2f} s")
+    for a, name in enumerate(result.antenna_names):
+        main = ", ".join(f"{blocker} {sr:.2f} sr" for blocker, sr in result.blockers(a, top=2))
+        print(f"  {name:<28} cobertura {result.coverage()[a] * 100:5.1f}%  {main}")
+    print(f"Cobertura combinada: {result.combined_coverage() * 100:.1f}% (≥1 antena), "
+          f"{result.combined_coverage(2) * 100:.1f}% (≥2 antenas)")
+    result.plot("antenna_coverage.png")
+    print("Mapas guardados en antenna_coverage.png")
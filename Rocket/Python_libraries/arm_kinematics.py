@@ -0,0 +1,393 @@
+# arm_kinematics.py
+# Cinemática de brazos robóticos con parámetros Denavit-Hartenberg: cinemática directa por lotes,
+# inversa por mínimos cuadrados amortiguados (DLS) sobre miles de objetivos a la vez y mapas de alcance y
+# destreza en una rejilla de vóxeles. Los brazos salen de RoboticArm (CarbonCarbon.py) y de la base de
+# create_robotic_arm(); la demo comprueba el alcance de todo el casco para el robot de soldadura.
+
+import hashlib
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from assembly import falcon_parker_assembly, import_script
+from render_cache import DiskLRUCache, cache_dir
+from shielding import sector_directions
+
+REACH_CACHE_DIR = cache_dir("reachability")
+PYTHON_FILES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "SpaceShip", "Files",
+                            "python_files")
+
+DAMPING = 0.05               # λ de DLS (m)
+IK_ITERATIONS = 100
+SEED_SAMPLES = 50_000
+IK_TOLERANCE = 1e-4          # m
+ORIENTATION_WEIGHT = 0.5     # m por rad de error de eje de herramienta
+MAP_SAMPLES = 2_000_000
+MAP_DIRECTIONS = 32
+CHUNK = 200_000
+
+# Reparto de RoboticArm.length_m entre hombro, brazo, antebrazo y herramienta
+ARM_PROPORTIONS = (0.1, 0.45, 0.4, 0.05)
+
+
+# ----------------------------
+# CADENA DH
+# ----------------------------
+
+def dh_transforms(theta, d, a, alpha):
+    """Standard DH link transforms for broadcast arrays of parameters: (..., 4, 4)"""
+    theta, d, a, alpha = np.broadcast_arrays(theta, d, a, alpha)
+    ct, st = np.cos(theta), np.sin(theta)
+    ca, sa = np.cos(alpha), np.sin(alpha)
+    zero, one = np.zeros_like(ct), np.ones_like(ct)
+    return np.stack([
+        np.stack([ct, -st * ca, st * sa, a * ct], axis=-1),
+        np.stack([st, ct * ca, -ct * sa, a * st], axis=-1),
+        np.stack([zero, sa, ca, d], axis=-1),
+        np.stack([zero, zero, zero, one], axis=-1),
+    ], axis=-2)
+
+
+class DHChain:
+    """Serial chain of revolute joints in standard DH convention, mounted at base (4x4 pose)"""
+
+    def __init__(self, a, alpha, d, offset=None, limits=None, base=None, name="arm", tolerance=IK_TOLERANCE):
+        self.a = np.asarray(a, dtype=float)
+        self.alpha = np.asarray(alpha, dtype=float)
+        self.d = np.asarray(d, dtype=float)
+        n = len(self.a)
+        self.offset = np.zeros(n) if offset is None else np.asarray(offset, dtype=float)
+        self.limits = np.tile([-np.pi, np.pi], (n, 1)) if limits is None else np.asarray(limits, dtype=float)
+        self.base = np.eye(4) if base is None else np.asarray(base, dtype=float)
+        self.name = name
+        self.tolerance = tolerance
+        self._seeds = None
+
+    @classmethod
+    def anthropomorphic(cls, length, base=None, name="arm", tolerance=IK_TOLERANCE):
+        """6-DOF elbow manipulator with a spherical wrist, total length split by ARM_PROPORTIONS"""
+        d1, a2, d4, d6 = (p * length for p in ARM_PROPORTIONS)
+        h = np.pi / 2
+        limits = np.radians([[-180, 180], [-120, 120], [-150, 150], [-180, 180], [-120, 120], [-180, 180]])
+        return cls(a=[0, a2, 0, 0, 0, 0], alpha=[h, 0, h, -h, h, 0], d=[d1, 0, 0, d4, 0, d6],
+                   offset=[0, h, 0, 0, 0, 0], limits=limits, base=base, name=name, tolerance=tolerance)
+
+    @classmethod
+    def from_robotic_arm(cls, arm, base=None, name="arm"):
+        """Chain for a RoboticArm dataclass of CarbonCarbon.py: length_m sets the links, accuracy_mm the IK
+        tolerance"""
+        return cls.anthropomorphic(arm.length_m, base, name, arm.accuracy_mm / 1000.0)
+
+    def __len__(self):
+        return len(self.a)
+
+    @property
+    def reach(self):
+        return float(np.abs(self.a).sum() + np.abs(self.d).sum())
+
+    def key(self):
+        """Digest of the DH parameters and limits (the base pose is not part of it)"""
+        data = np.concatenate([self.a, self.alpha, self.d, self.offset, self.limits.ravel()])
+        return hashlib.blake2b(data.tobytes(), digest_size=12).hexdigest()
+
+    def frames(self, q, base=True):
+        """Poses of every joint frame for a batch of configurations q (..., n): (..., n + 1, 4, 4)"""
+        q = np.asarray(q, dtype=float)
+        links = dh_transforms(q + self.offset, self.d, self.a, self.alpha)
+        frames = np.empty(q.shape[:-1] + (len(self) + 1, 4, 4))
+        frames[..., 0, :, :] = self.base if base else np.eye(4)
+        for i in range(len(self)):
+            frames[..., i + 1, :, :] = frames[..., i, :, :] @ links[..., i, :, :]
+        return frames
+
+    def forward(self, q, base=True):
+        """End-effector poses (..., 4, 4)"""
+        return self.frames(q, base)[..., -1, :, :]
+
+    def jacobian(self, q, frames=None):
+        """Geometric Jacobian (..., 6, n): linear rows on top, angular rows below"""
+        frames = self.frames(q) if frames is None else frames
+        z = frames[..., :-1, :3, 2]
+        p = frames[..., :-1, :3, 3]
+        end = frames[..., -1:, :3, 3]
+        return np.concatenate([np.cross(z, end - p), z], axis=-1).swapaxes(-1, -2)
+
+    def random_configurations(self, n, rng=None):
+        rng = np.random.default_rng(0) if rng is None else rng
+        return rng.uniform(self.limits[:, 0], self.limits[:, 1], (n, len(self)))
+
+    def at(self, base):
+        """Same chain mounted at another base pose (the IK seeds are shared)"""
+        chain = DHChain(self.a, self.alpha, self.d, self.offset, self.limits, base, self.name, self.tolerance)
+        chain._seeds = self._seeds
+        return chain
+
+    def seed_table(self, samples=SEED_SAMPLES):
+        """Random configurations and a k-d tree of their tool positions and weighted axes in the base frame"""
+        if self._seeds is None or len(self._seeds[0]) != samples:
+            q = self.random_configurations(samples, np.random.default_rng(1))
+            pose = self.forward(q, base=False)
+            self._seeds = q, cKDTree(np.hstack([pose[:, :3, 3], ORIENTATION_WEIGHT * pose[:, :3, 2]]))
+        return self._seeds
+
+    def _task_error(self, end, positions, axes):
+        """Weighted task error (N, 3 or 6): position error, then the rotation taking the tool z-axis to axes"""
+        e = positions - end[:, :3, 3]
+        if axes is None:
+            return e
+        return np.concatenate([e, ORIENTATION_WEIGHT * np.cross(end[:, :3, 2], axes)], axis=1)
+
+    def inverse(self, positions, axes=None, q0=None, damping=DAMPING, iterations=IK_ITERATIONS,
+                tolerance=None, restarts=2, rng=None):
+        """Damped least-squares IK for a batch of target positions (N, 3) and optional tool z-axis
+        directions (N, 3). Starts from the nearest sampled configuration unless q0 is given.
+        Returns (q (N, n), error (N,), converged (N,))"""
+        positions = np.asarray(positions, dtype=float)
+        axes = None if axes is None else np.asarray(axes, dtype=float)
+        tolerance = self.tolerance if tolerance is None else tolerance
+        rng = np.random.default_rng(0) if rng is None else rng
+        n = len(positions)
+        if q0 is None:
+            inverse = np.linalg.inv(self.base)
+            local = positions @ inverse[:3, :3].T + inverse[:3, 3]
+            query = local if axes is None else np.hstack([local, ORIENTATION_WEIGHT * axes @ inverse[:3, :3].T])
+            seeds, tree = self.seed_table()
+            if axes is None:
+                tree = cKDTree(tree.data[:, :3])
+            q = seeds[tree.query(query)[1]]
+        else:
+            q = np.array(q0, dtype=float)
+        error = np.full(n, np.inf)
+        converged = np.zeros(n, dtype=bool)
+        for attempt in range(restarts + 1):
+            todo = np.flatnonzero(~converged)
+            if len(todo) == 0:
+                break
+            if attempt > 0:
+                q[todo] = self.random_configurations(len(todo), rng)
+            q[todo], error[todo] = self._dls(q[todo], positions[todo], None if axes is None else axes[todo],
+                                             damping, iterations, tolerance)
+            converged[todo] = error[todo] <= tolerance
+        return q, error, converged
+
+    def _dls(self, q, positions, axes, damping, iterations, tolerance):
+        """Levenberg-Marquardt style DLS: per target, the damping halves after an improving step and grows
+        fourfold (step rejected) otherwise"""
+        rows = 3 if axes is None else 6
+        frames = self.frames(q)
+        e = self._task_error(frames[:, -1], positions, axes)
+        cost = np.linalg.norm(e, axis=1)
+        lam = np.full(len(q), damping)
+        active = np.flatnonzero(np.abs(e).max(axis=1) > tolerance)
+        for _ in range(iterations):
+            if len(active) == 0:
+                break
+            J = self.jacobian(None, frames[active])[:, :rows]
+            if axes is not None:
+                J[:, 3:] *= ORIENTATION_WEIGHT
+            JJt = J @ J.swapaxes(1, 2) + (lam[active] ** 2)[:, None, None] * np.eye(rows)
+            dq = (J.swapaxes(1, 2) @ np.linalg.solve(JJt, e[active, :, None]))[:, :, 0]
+            trial = np.clip(q[active] + dq, self.limits[:, 0], self.limits[:, 1])
+            trial_frames = self.frames(trial)
+            trial_e = self._task_error(trial_frames[:, -1], positions[active],
+                                       None if axes is None else axes[active])
+            trial_cost = np.linalg.norm(trial_e, axis=1)
+            better = trial_cost < cost[active]
+            accept = active[better]
+            q[accept], frames[accept], e[accept], cost[accept] = (trial[better], trial_frames[better],
+                                                                 trial_e[better], trial_cost[better])
+            lam[active] = np.clip(np.where(better, lam[active] * 0.5, lam[active] * 4.0), 1e-6, 10.0)
+            active = active[np.abs(e[active]).max(axis=1) > tolerance]
+        return q, np.abs(e).max(axis=1)
+
+
+def mount_pose(position, normal):
+    """Base pose at position with the base z-axis along normal (arm standing off a hull surface)"""
+    z = np.asarray(normal, dtype=float) / np.linalg.norm(normal)
+    helper = np.array([0.0, 0.0, 1.0]) if abs(z[2]) < 0.9 else np.array([1.0, 0.0, 0.0])
+    x = np.cross(helper, z)
+    x /= np.linalg.norm(x)
+    pose = np.eye(4)
+    pose[:3, :3] = np.column_stack([x, np.cross(z, x), z])
+    pose[:3, 3] = position
+    return pose
+
+
+# ----------------------------
+# MAPAS DE ALCANCE
+# ----------------------------
+
+class ReachabilityMap:
+    """Voxel grid in the chain's base frame: reach counts and a bitmask of the MAP_DIRECTIONS tool-axis sectors
+    reached in every voxel (dexterity = fraction of sectors reached)"""
+
+    def __init__(self, origin, voxel, counts, sectors):
+        self.origin = np.asarray(origin, dtype=float)
+        self.voxel = float(voxel)
+        self.counts = counts
+        self.sectors = sectors
+        self.directions = sector_directions(MAP_DIRECTIONS)
+
+    @classmethod
+    def build(cls, chain, voxel=0.1, samples=MAP_SAMPLES, use_cache=True):
+        """Monte Carlo map of the chain: sample joint space, bin the tool positions and axes"""
+        key = f"{chain.key()}-{voxel:g}-{samples}-sectors{MAP_DIRECTIONS}"
+        cache = DiskLRUCache(REACH_CACHE_DIR) if use_cache else None
+        if cache is not None:
+            cached = cache.get(key, ".npz")
+            if cached is not None:
+                return cls.load_npz(cached)
+
+        reach = chain.reach
+        n = int(np.ceil(2 * reach / voxel)) + 1
+        origin = np.full(3, -reach - voxel / 2)
+        counts = np.zeros(n ** 3, dtype=np.int64)
+        sectors = np.zeros(n ** 3, dtype=np.uint32)
+        lattice = sector_directions(MAP_DIRECTIONS)
+        rng = np.random.default_rng(0)
+        for start in range(0, samples, CHUNK):
+            q = chain.random_configurations(min(CHUNK, samples - start), rng)
+            pose = chain.forward(q, base=False)
+            cell = np.clip(((pose[:, :3, 3] - origin) / voxel).astype(np.int64), 0, n - 1)
+            flat = (cell[:, 0] * n + cell[:, 1]) * n + cell[:, 2]
+            counts += np.bincount(flat, minlength=n ** 3)
+            bits = np.left_shift(np.uint32(1), (pose[:, :3, 2] @ lattice.T).argmax(axis=1).astype(np.uint32))
+            np.bitwise_or.at(sectors, flat, bits)
+        result = cls(origin, voxel, counts.reshape(n, n, n), sectors.reshape(n, n, n))
+
+        if cache is not None:
+            tmp = cache.path_for(key, ".build.npz")
+            result.save_npz(tmp)
+            cache.put(key, tmp, ".npz")
+            os.remove(tmp)
+        return result
+
+    def save_npz(self, path):
+        np.savez_compressed(path, origin=self.origin, voxel=self.voxel, counts=self.counts, sectors=self.sectors)
+
+    @classmethod
+    def load_npz(cls, path):
+        with np.load(path) as data:
+            return cls(data["origin"], float(data["voxel"]), data["counts"], data["sectors"])
+
+    @property
+    def dexterity(self):
+        """Fraction of tool-axis sectors reached per voxel"""
+        bits = np.unpackbits(self.sectors[..., None].view(np.uint8), axis=-1)
+        return bits.sum(axis=-1) / MAP_DIRECTIONS
+
+    def lookup(self, points, axes=None, base=None):
+        """Whether world points (..., 3) are reachable by the chain mounted at base, with the tool z-axis in the
+        sector of axes when given; also returns the dexterity there"""
+        points = np.asarray(points, dtype=float)
+        if base is not None:
+            inverse = np.linalg.inv(base)
+            points = points @ inverse[:3, :3].T + inverse[:3, 3]
+            axes = None if axes is None else np.asarray(axes, dtype=float) @ inverse[:3, :3].T
+        cell = np.floor((points - self.origin) / self.voxel).astype(np.int64)
+        inside = np.all((cell >= 0) & (cell < self.counts.shape[0]), axis=-1)
+        cell = np.where(inside[..., None], cell, 0)
+        sectors = np.where(inside, self.sectors[cell[..., 0], cell[..., 1], cell[..., 2]], 0)
+        reachable = sectors > 0
+        if axes is not None:
+            sector = (axes @ self.directions.T).argmax(axis=-1).astype(np.uint32)
+            reachable &= (np.right_shift(sectors, sector) & 1).astype(bool)
+        dexterity = np.unpackbits(sectors.astype(np.uint32)[..., None].view(np.uint8), axis=-1).sum(axis=-1)
+        return reachable, dexterity / MAP_DIRECTIONS
+
+
+def hull_points(assembly, prefix="structure/fuselage", spacing=0.1):
+    """Weld points on the outward-facing hull of the components under prefix, about one per spacing² of area,
+    with their face normals"""
+    faces = np.concatenate([assembly.component_faces(i) for i in assembly.select(prefix)])
+    area = assembly.face_areas[faces]
+    repeats = np.maximum(np.round(area / spacing ** 2).astype(np.int64), 0)
+    rng = np.random.default_rng(0)
+    keep = rng.random(len(faces)) < np.minimum(area / spacing ** 2, 1.0)
+    faces = np.concatenate([np.repeat(faces, repeats), faces[keep & (repeats == 0)]])
+    normals = assembly.face_normals[faces]
+    # Las caras interiores del fuselaje miran hacia el eje: solo se suelda por fuera
+    center = assembly.bounds.mean(axis=0)
+    radial = assembly.face_centers[faces] - center
+    radial[:, 2] = 0
+    outward = np.einsum("ij,ij->i", normals, radial) > 0
+    faces, normals = faces[outward], normals[outward]
+    triangles = assembly.vertices[assembly.faces[faces]]
+    u, v = rng.random((2, len(faces), 1))
+    flip = u + v > 1
+    u, v = np.where(flip, 1 - u, u), np.where(flip, 1 - v, v)
+    points = triangles[:, 0] + u * (triangles[:, 1] - triangles[:, 0]) + v * (triangles[:, 2] - triangles[:, 0])
+    return points, normals
+
+
+def hull_coverage(reach_map, bases, points, axes=None, min_dexterity=0.0):
+    """Candidate bases (P, B) for every point: reachable from the base with the requested tool axis"""
+    candidates = np.zeros((len(points), len(bases)), dtype=bool)
+    for b, base in enumerate(bases):
+        reachable, dexterity = reach_map.lookup(points, axes, base)
+        candidates[:, b] = reachable & (dexterity >= min_dexterity)
+    return candidates
+
+
+def to_base_frames(bases, owner, points, axes):
+    """Points and axes expressed in the frame of their owner base"""
+    rotation, origin = bases[owner, :3, :3], bases[owner, :3, 3]
+    return (np.einsum("pji,pj->pi", rotation, points - origin), np.einsum("pji,pj->pi", rotation, axes))
+
+
+if __name__ == "__main__":
+    # Uso: python arm_kinematics.py [posiciones_de_base_por_anillo]
+    per_ring = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    import Pannels_antennaSolarParker_render as ship
+
+    carbon = import_script(os.path.join(PYTHON_FILES, "CarbonCarbon.py"))
+    arm = carbon.robot.robotic_arms[0]
+    # Base de create_robotic_arm(): superficie del fuselaje en x = 1.6, a 0.7 de la longitud
+    chain = DHChain.from_robotic_arm(arm, mount_pose([1.6, 0, ship.FUSELAGE_LENGTH * 0.7], [1, 0, 0]), "welder")
+
+    # Cinemática directa e inversa por lotes
+    rng = np.random.default_rng(7)
+    q = chain.random_configurations(10000, rng)
+    start = time.perf_counter()
+    poses = chain.forward(q)
+    print(f"FK de 10000 configuraciones en {(time.perf_counter() - start) * 1000:.1f} ms")
+    start = time.perf_counter()
+    solved, error, ok = chain.inverse(poses[:, :3, 3], poses[:, :3, 2])
+    print(f"IK (posición + eje de herramienta) de 10000 objetivos en {time.perf_counter() - start:.2f} s: "
+          f"{ok.mean() * 100:.1f} % dentro de ±{arm.accuracy_mm} mm")
+
+    start = time.perf_counter()
+    reach_map = ReachabilityMap.build(chain)
+    print(f"Mapa de alcance {reach_map.counts.shape} de vóxeles de {reach_map.voxel} m en "
+          f"{time.perf_counter() - start:.2f} s, destreza media {reach_map.dexterity[reach_map.counts > 0].mean():.2f}")
+
+    # Alcance de todo el casco: bases en anillos a lo largo del fuselaje, normal de base hacia fuera
+    assembly = falcon_parker_assembly()
+    points, normals = hull_points(assembly)
+    radius = ship.FUSELAGE_RADIUS
+    bases = np.array([mount_pose([radius * np.cos(a), radius * np.sin(a), z], [np.cos(a), np.sin(a), 0])
+                      for z in np.arange(1.0, ship.FUSELAGE_LENGTH, 2.0)
+                      for a in np.linspace(0, 2 * np.pi, per_ring, endpoint=False)])
+    start = time.perf_counter()
+    targets, torch = points + 0.05 * normals, -normals          # antorcha perpendicular, a 5 cm del casco
+    candidates = hull_coverage(reach_map, bases, targets, torch, min_dexterity=0.1)
+    mapped = candidates.any(axis=1)
+    # Verificación con IK en el marco de cada base, todos los puntos en un lote; si falla se prueba la
+    # siguiente base candidata más cercana
+    distance = np.linalg.norm(targets[:, None] - bases[None, :, :3, 3], axis=2)
+    local = chain.at(None)
+    reached = np.zeros(len(points), dtype=bool)
+    for _ in range(3):
+        todo = np.flatnonzero(~reached & candidates.any(axis=1))
+        if len(todo) == 0:
+            break
+        owner = np.where(candidates[todo], distance[todo], np.inf).argmin(axis=1)
+        candidates[todo, owner] = False
+        _, _, reached[todo] = local.inverse(*to_base_frames(bases, owner, targets[todo], torch[todo]),
+                                            restarts=1)
+    elapsed = time.perf_counter() - start
+    print(f"Casco: {len(points)} puntos, {len(bases)} bases; mapa {mapped.mean() * 100:.1f} %, "
+          f"IK verificada {reached.sum() / len(points) * 100:.1f} % en {elapsed:.2f} s")
@@ -0,0 +1,167 @@
+import hashlib
+import importlib.util
+import os
+import sys
+
+import numpy as np
+import trimesh
+
+from render_cache import geometry_fingerprint
+
+
+# ----------------------------
+# ENSAMBLAJE CON IDENTIDAD DE COMPONENTES
+# ----------------------------
+
+class Assembly:
+    """Named components concatenated into flat arrays, keeping the owner of every face.
+
+    Names may use '/' to express the assembly tree (e.g. 'power/solar_panel_0').
+    """
+
+    def __init__(self, names, meshes):
+        if len(names) != len(meshes):
+            raise ValueError("names and meshes must have the same length")
+        self.names = list(names)
+        self.meshes = list(meshes)
+
+        vertex_counts = [len(m.vertices) for m in self.meshes]
+        face_counts = [len(m.faces) for m in self.meshes]
+        vertex_offsets = np.concatenate([[0], np.cumsum(vertex_counts)[:-1]]).astype(np.int64)
+
+        self.vertices = np.vstack([m.vertices for m in self.meshes]).astype(np.float64)
+        self.faces = np.vstack([m.faces + offset for m, offset in zip(self.meshes, vertex_offsets)]).astype(np.int64)
+        self.face_component = np.repeat(np.arange(len(self.meshes)), face_counts).astype(np.int32)
+        self.face_offsets = np.concatenate([[0], np.cumsum(face_counts)]).astype(np.int64)
+        self.face_colors = np.vstack([m.visual.face_colors for m in self.meshes]).astype(np.uint8)
+
+        triangles = self.vertices[self.faces]
+        cross = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+        norm = np.linalg.norm(cross, axis=1)
+        self.face_areas = 0.5 * norm
+        self.face_normals = cross / np.where(norm > 0, norm, 1.0)[:, None]
+        self.face_centers = triangles.mean(axis=1)
+        self._fingerprint = None
+
+    @classmethod
+    def from_meshes(cls, meshes, names=None):
+        meshes = list(meshes)
+        if names is None:
+            names = [f"component_{i}" for i in range(len(meshes))]
+        return cls(names, meshes)
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def bounds(self):
+        return np.array([self.vertices.min(axis=0), self.vertices.max(axis=0)])
+
+    def fingerprint(self):
+        """Geometry hash of the whole assembly, including where components start and end"""
+        if self._fingerprint is None:
+            mesh = trimesh.Trimesh(self.vertices, self.faces, face_colors=self.face_colors, process=False)
+            boundaries = ",".join(f"{name}:{offset}" for name, offset in zip(self.names, self.face_offsets))
+            digest = hashlib.blake2b(boundaries.encode(), digest_size=8).hexdigest()
+            self._fingerprint = f"{geometry_fingerprint(mesh)}-{digest}"
+        return self._fingerprint
+
+    def index(self, name):
+        return self.names.index(name)
+
+    def select(self, prefix):
+        """Indices of the components whose name starts with prefix (a subtree for 'group/')"""
+        return np.array([i for i, name in enumerate(self.names) if name.startswith(prefix)], dtype=np.int32)
+
+    def component_faces(self, index):
+        return np.arange(self.face_offsets[index], self.face_offsets[index + 1])
+
+    def to_mesh(self):
+        return trimesh.Trimesh(self.vertices, self.faces, face_colors=self.face_colors, process=False)
+
+
+# ----------------------------
+# NAVE FALCON PARKER
+# ----------------------------
+
+def _named(prefix, meshes):
+    meshes = meshes if isinstance(meshes, (list, tuple)) else [meshes]
+    if len(meshes) == 1:
+        return [(prefix, meshes[0])]
+    return [(f"{prefix}_{i}", mesh) for i, mesh in enumerate(meshes)]
+
+
+def falcon_parker_assembly():
+    """Parts list of create_falcon_parker_advanced_ship (Integration_Parts_space.py), one named entry per part,
+    built with the builders of Pannels_antennaSolarParker_render.py"""
+    import Pannels_antennaSolarParker_render as ship
+
+    length = ship.FUSELAGE_LENGTH
+    radius = ship.FUSELAGE_RADIUS
+    surface_z = np.linspace(3, length - 3, 6)
+    parts = [
+        *_named("structure/fuselage", ship.create_advanced_fuselage()),
+        *_named("structure/nose_cone", ship.create_nose_cone()),
+        *_named("structure/escape_tower", ship.create_escape_tower()),
+        *_named("propulsion/propulsion_base", ship.create_propulsion_base()),
+        *_named("thermal/thermal_shield", ship.create_thermal_shield()),
+        *_named("thermal/heat_shield_layer", ship.create_reinforced_heat_shield_layers()),
+        *_named("structure/spine", ship.create_spine_structure()),
+        *_named("modules/scientific_module", ship.create_scientific_module()),
+        *_named("propulsion/merlin_engine", ship.create_merlin_engine_array()),
+        *_named("power/solar_panel", ship.create_solar_panels()),
+        *_named("power/solar_frame", ship.create_solar_panel_frames()),
+        *_named("thermal/radiator_panel", ship.create_radiator_panels()),
+        *_named("structure/landing_leg", ship.create_landing_legs()),
+        *_named("sensors/sensor", ship.create_sensors()),
+        *_named("comms/antenna_mast", ship.create_antenna_array()),
+        *_named("mechanisms/robotic_arm", ship.create_robotic_arm()),
+        *_named("modules/dome", ship.create_dome()),
+        *_named("modules/payload_module", ship.create_payload_module()),
+        *_named("shielding/hex_layer_lower/panel", ship.create_hex_shield_layer(length + 1.2, radius=3.3)),
+        *_named("shielding/hex_layer_upper/panel", ship.create_hex_shield_layer(length + 1.35, radius=3.3)),
+        *_named("propulsion/ion_propulsion", ship.create_ion_propulsion_system()),
+        *_named("comms/parabolic_antenna", ship.create_parabolic_antenna()),
+        ("propulsion/warp_propulsor_0", ship.create_warp_propulsor_complex([radius + 2.5, 0, 6])),
+        ("propulsion/warp_propulsor_1", ship.create_warp_propulsor_complex([-radius - 2.5, 0, 6])),
+        *_named("structure/surface_panel_pos", [ship.create_surface_panel([0, radius + 0.25, z]) for z in surface_z]),
+        *_named("structure/surface_panel_neg", [ship.create_surface_panel([0, -radius - 0.25, z]) for z in surface_z]),
+        *_named("modules/side_module", ship.side_modules),
+        *_named("comms/extra_antenna", ship.create_extra_antennas()),
+    ]
+    names, meshes = zip(*parts)
+    return Assembly(names, meshes)
+
+
+# ----------------------------
+# CARGA DESDE FICHERO
+# ----------------------------
+
+def import_script(path):
+    """Import one of the repo scripts by path (its folder is put on sys.path while loading)"""
+    module_name = os.path.splitext(os.path.basename(path))[0]
+    module_spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(module_spec)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(path)))
+    try:
+        module_spec.loader.exec_module(module)
+    finally:
+        sys.path.pop(0)
+    return module
+
+
+def load_assembly(spec):
+    """Assembly from 'script.py:builder' (list or mesh) or from an STL split into bodies"""
+    if ".py:" in spec:
+        path, function_name = spec.rsplit(":", 1)
+        result = getattr(import_script(path), function_name)()
+        if isinstance(result, Assembly):
+            return result
+        if isinstance(result, trimesh.Trimesh):
+            result = [result]
+        return Assembly.from_meshes(result, names=[f"{function_name}/{i}" for i in range(len(result))])
+
+    mesh = trimesh.load(spec, force="mesh")
+    bodies = mesh.split(only_watertight=False)
+    base = os.path.splitext(os.path.basename(spec))[0]
+    return Assembly.from_meshes(bodies, names=[f"{base}/body_{i}" for i in range(len(bodies))])
@@ -0,0 +1,231 @@
+# attitude_tables.py
+# Tablas de área proyectada y centroide frente a la actitud, para resistencia y presión de radiación solar.
+# Se precalculan una vez (proyección ortográfica con oclusión sobre una rejilla elevación x acimut) y
+# durante la propagación solo se interpola.
+
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+from assembly import falcon_parker_assembly
+from ray_caster import RayCaster
+from render_cache import DiskLRUCache, cache_dir
+
+GRID_STEP_DEG = 5.0
+SAMPLES_ACROSS = 128         # rayos a lo largo del diámetro de la esfera envolvente
+RAYS_PER_CALL = 2_000_000
+SOLAR_PRESSURE = 4.56e-6     # N/m² a 1 UA
+ATTITUDE_CACHE_DIR = cache_dir("attitude_tables")
+
+# Columnas de la tabla
+AREA, CENTROID, NORMAL_SUM, NORMAL_COS_SUM = 0, slice(1, 4), slice(4, 7), slice(7, 10)
+
+
+def grid_direction(el_deg, az_deg):
+    el, az = np.broadcast_arrays(np.radians(el_deg), np.radians(az_deg))
+    return np.stack([np.cos(el) * np.cos(az), np.cos(el) * np.sin(az), np.sin(el)], axis=-1)
+
+
+# ----------------------------
+# PRECÁLCULO
+# ----------------------------
+
+def _view_rays(direction, center, radius, spacing, hull):
+    """Parallel rays towards -direction over the projected hull of the model, one per grid cell"""
+    helper = np.array([0.0, 0.0, 1.0]) if abs(direction[2]) < 0.9 else np.array([1.0, 0.0, 0.0])
+    right = np.cross(helper, direction)
+    right /= np.linalg.norm(right)
+    up = np.cross(direction, right)
+    rel = hull - center
+    u, v = rel @ right, rel @ up
+    us = np.arange(np.floor(u.min() / spacing), np.ceil(u.max() / spacing)) * spacing + spacing / 2
+    vs = np.arange(np.floor(v.min() / spacing), np.ceil(v.max() / spacing)) * spacing + spacing / 2
+    uu, vv = np.meshgrid(us, vs)
+    origins = center + direction * radius + uu.ravel()[:, None] * right + vv.ravel()[:, None] * up
+    return origins
+
+
+def build_attitude_table(assembly, step_deg=GRID_STEP_DEG, samples_across=SAMPLES_ACROSS, caster=None,
+                         processes=1, use_cache=True):
+    """(n_el, n_az, 10) table: area, centroid, Σ a·n and Σ a·cosθ·n of the visible surface per view direction.
+
+    The view direction points from the model to the source (sun, or the relative wind origin).
+    """
+    key = f"{assembly.fingerprint()}-step{step_deg:g}-n{samples_across}"
+    cache = DiskLRUCache(ATTITUDE_CACHE_DIR) if use_cache else None
+    if cache is not None:
+        cached = cache.get(key, ".npz")
+        if cached is not None:
+            return AttitudeTable.load_npz(cached)
+
+    caster = caster if caster is not None else RayCaster(assembly)
+    el = np.arange(-90.0, 90.0 + step_deg / 2, step_deg)
+    az = np.arange(0.0, 360.0, step_deg)
+    directions = grid_direction(el[:, None], az[None, :]).reshape(-1, 3)
+
+    center = assembly.bounds.mean(axis=0)
+    radius = np.linalg.norm(assembly.bounds[1] - assembly.bounds[0]) / 2 * 1.01
+    spacing = 2 * radius / samples_across
+    hull = assembly.to_mesh().convex_hull.vertices
+    table = np.zeros((len(directions), 10))
+
+    # Se agrupan vistas hasta llenar un lote de rayos
+    pending = []
+    def flush():
+        origins = np.vstack([o for _, o in pending])
+        view = np.repeat([i for i, _ in pending], [len(o) for _, o in pending])
+        dirs = -directions[view]
+        hits = caster.intersect(origins, dirs, t_max=2 * radius, processes=processes)
+        hit = hits.hit
+        view, points = view[hit], hits.points[hit]
+        normals = assembly.face_normals[hits.face[hit]]
+        cos = np.einsum("ij,ij->i", normals, directions[view])
+        normals[cos < 0] *= -1          # normales hacia la fuente (mallas abiertas)
+        cos = np.abs(cos)
+        a = spacing ** 2
+        n_views = len(directions)
+        count = np.bincount(view, minlength=n_views)
+        table[:, AREA] += count * a
+        for k in range(3):
+            table[:, CENTROID.start + k] += np.bincount(view, points[:, k], minlength=n_views)
+            table[:, NORMAL_SUM.start + k] += np.bincount(view, normals[:, k] * a, minlength=n_views)
+            table[:, NORMAL_COS_SUM.start + k] += np.bincount(view, normals[:, k] * cos * a, minlength=n_views)
+        pending.clear()
+
+    queued = 0
+    for i, d in enumerate(directions):
+        origins = _view_rays(d, center, radius, spacing, hull)
+        pending.append((i, origins))
+        queued += len(origins)
+        if queued >= RAYS_PER_CALL:
+            flush()
+            queued = 0
+    if pending:
+        flush()
+
+    covered = table[:, AREA] > 0
+    table[covered, CENTROID] /= (table[covered, AREA] / spacing ** 2)[:, None]
+    result = AttitudeTable(el, az, table.reshape(len(el), len(az), 10))
+    if cache is not None:
+        tmp = cache.path_for(key, ".build.npz")
+        result.save_npz(tmp)
+        cache.put(key, tmp, ".npz")
+        os.remove(tmp)
+    return result
+
+
+# ----------------------------
+# TABLA E INTERPOLACIÓN
+# ----------------------------
+
+class AttitudeTable:
+    """Bilinear interpolation in (elevation, azimuth) of the view direction in body axes"""
+
+    def __init__(self, el, az, table):
+        self.el = np.asarray(el, dtype=float)
+        self.az = np.asarray(az, dtype=float)
+        self.table = np.ascontiguousarray(table)
+        self.step = float(self.el[1] - self.el[0])
+        self._n_el, self._n_az = len(self.el), len(self.az)
+        self._flat = self.table.reshape(-1, self.table.shape[-1])
+
+    def save_npz(self, filename):
+        np.savez(filename, el=self.el, az=self.az, table=self.table)
+        return filename
+
+    @classmethod
+    def load_npz(cls, filename):
+        with np.load(filename) as data:
+            return cls(data["el"], data["az"], data["table"])
+
+    def query(self, direction):
+        """Row (area, centroid, Σa·n, Σa·cosθ·n) for one body-axis direction (~10 µs per call)"""
+        x, y, z = direction
+        norm = math.sqrt(x * x + y * y + z * z)
+        fe = (math.degrees(math.asin(max(-1.0, min(1.0, z / norm)))) + 90.0) / self.step
+        fa = (math.degrees(math.atan2(y, x)) % 360.0) / self.step
+        i = min(int(fe), self._n_el - 2)
+        j = int(fa) % self._n_az
+        te, ta = fe - i, fa - int(fa)
+        j1 = (j + 1) % self._n_az
+        n = self._n_az
+        # Una sola lectura de las cuatro esquinas sobre la tabla aplanada
+        corners = self._flat[[i * n + j, i * n + j1, (i + 1) * n + j, (i + 1) * n + j1]]
+        return np.dot(((1 - te) * (1 - ta), (1 - te) * ta, te * (1 - ta), te * ta), corners)
+
+    def query_many(self, directions):
+        """Vectorized query, (n, 3) directions -> (n, 10) rows"""
+        d = np.asarray(directions, dtype=float)
+        d = d / np.linalg.norm(d, axis=1, keepdims=True)
+        fe = (np.degrees(np.arcsin(np.clip(d[:, 2], -1, 1))) + 90.0) / self.step
+        fa = (np.degrees(np.arctan2(d[:, 1], d[:, 0])) % 360.0) / self.step
+        i = np.minimum(fe.astype(np.int64), self._n_el - 2)
+        j = fa.astype(np.int64) % self._n_az
+        te, ta = (fe - i)[:, None], (fa - np.floor(fa))[:, None]
+        j1 = (j + 1) % self._n_az
+        t = self.table
+        return ((t[i, j] * (1 - ta) + t[i, j1] * ta) * (1 - te)
+                + (t[i + 1, j] * (1 - ta) + t[i + 1, j1] * ta) * te)
+
+    def projected_area(self, direction):
+        return self.query(direction)[AREA]
+
+
+def rotate_to_body(quaternion, vector):
+    """Inertial vector to body axes with a scalar-first unit quaternion (body->inertial)"""
+    w, x, y, z = quaternion
+    vx, vy, vz = vector
+    # v_body = q* v q
+    tx = 2 * (y * vz - z * vy)
+    ty = 2 * (z * vx - x * vz)
+    tz = 2 * (x * vy - y * vx)
+    return (vx - w * tx + (y * tz - z * ty), vy - w * ty + (z * tx - x * tz), vz - w * tz + (x * ty - y * tx))
+
+
+def drag_force(table, velocity_body, density, cd=2.2):
+    """Aerodynamic drag (N) in body axes; velocity is the body velocity relative to the atmosphere"""
+    vx, vy, vz = velocity_body
+    speed = math.sqrt(vx * vx + vy * vy + vz * vz)
+    area = table.query(velocity_body)[AREA]
+    scale = -0.5 * density * speed * cd * area
+    return np.array([scale * vx, scale * vy, scale * vz])
+
+
+def srp_force(table, sun_body, pressure=SOLAR_PRESSURE, specular=0.1, diffuse=0.3):
+    """Solar radiation pressure force (N) in body axes from the visible-surface sums of the table"""
+    row = table.query(sun_body)
+    s = np.asarray(sun_body, dtype=float)
+    s = s / np.linalg.norm(s)
+    return -pressure * ((1 - specular) * row[AREA] * s + 2 * specular * row[NORMAL_COS_SUM]
+                        + 2 * diffuse / 3 * row[NORMAL_SUM])
+
+
+if __name__ == "__main__":
+    # Uso: python attitude_tables.py [paso_grados] [rayos_por_diámetro]
+    step = float(sys.argv[1]) if len(sys.argv) > 1 else GRID_STEP_DEG
+    samples = int(sys.argv[2]) if len(sys.argv) > 2 else SAMPLES_ACROSS
+    ship = falcon_parker_assembly()
+
+    start = time.perf_counter()
+    attitude = build_attitude_table(ship, step, samples)
+    print(f"Tabla {attitude.table.shape[0]}x{attitude.table.shape[1]} en {time.perf_counter() - start:.2f} s")
+
+    rng = np.random.default_rng(0)
+    queries = rng.normal(size=(100_000, 3))
+    start = time.perf_counter()
+    for d in queries[:20_000]:
+        attitude.query(d)
+    scalar_us = (time.perf_counter() - start) / 20_000 * 1e6
+    start = time.perf_counter()
+    attitude.query_many(queries)
+    batch_us = (time.perf_counter() - start) / len(queries) * 1e6
+    print(f"Consulta: {scalar_us:.1f} µs (escalar), {batch_us:.3f} µs (vectorizada)")
+
+    for label, d in [("morro (+z)", (0, 0, 1)), ("lateral (+x)", (1, 0, 0)), ("lateral (+y)", (0, 1, 0))]:
+        row = attitude.query(d)
+        print(f"  {label:<14} área {row[AREA]:6.2f} m²  centroide ({row[1]:.2f}, {row[2]:.2f}, {row[3]:.2f})")
+    print(f"  Resistencia a 7.6 km/s, rho=1e-12: {drag_force(attitude, (0, 0, 7600.0), 1e-12)} N")
+    print(f"  SRP con el sol en +y: {srp_force(attitude, (0, 1, 0))} N")
@@ -0,0 +1,605 @@
+# convex_decomposition.py
+# Descomposición convexa aproximada de cada componente (nacelas warp, brazos robóticos, STL de la librería) en un
+# número acotado de envolventes convexas, guardada en caché por huella de geometría. Las consultas de distancia
+# GJK/EPA entre envolventes sirven a los análisis de holguras, atraque y debris sin bajar a nivel de triángulo.
+
+import heapq
+import os
+import sys
+import time
+
+import numpy as np
+import trimesh
+from scipy.spatial import ConvexHull, QhullError
+
+from assembly import Assembly, falcon_parker_assembly, import_script
+from render_cache import DiskLRUCache, cache_dir, geometry_fingerprint
+
+try:
+    import numba
+except ImportError:  # sin numba los mismos núcleos corren en Python puro
+    numba = None
+
+MAX_HULLS = 16
+CONCAVITY = 0.02             # profundidad máxima bajo la envolvente, fracción de la diagonal de la pieza
+SPLIT_FRACTIONS = np.array([4, 3, 5, 2, 6, 1, 7]) / 8   # cortes candidatos por eje, del centro hacia fuera
+GJK_ITERATIONS = 64
+GJK_TOLERANCE = 1e-6         # tolerancia relativa de la distancia
+EPA_ITERATIONS = 64
+EPA_TOLERANCE = 1e-6         # m
+EPA_VERTICES = EPA_ITERATIONS + 4
+EPA_FACES = 4 * EPA_VERTICES
+# fastmath sin nnan/ninf: los núcleos usan inf como cota inicial
+FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+STATION_SCRIPT = os.path.join(REPO_ROOT, "SpaceCraft_04", "special", "python", "Estacion_2_nave.py")
+LIBRARY_DIR = os.path.join(REPO_ROOT, "Solar_parker", "STL_files")
+CONVEX_CACHE_DIR = cache_dir("convex_hulls")
+
+_TETRA_FACES = np.array([[0, 1, 2, 3], [0, 1, 3, 2], [0, 2, 3, 1], [1, 2, 3, 0]])   # cara y vértice opuesto
+
+
+def _jit(parallel=False):
+    if numba is None:
+        return lambda function: function
+    return numba.njit(parallel=parallel, fastmath=FASTMATH, cache=True)
+
+
+_range = range if numba is None else numba.prange
+
+
+# ----------------------------
+# DESCOMPOSICIÓN
+# ----------------------------
+
+def _hull(points):
+    """Convex hull of points, joggled so flat pieces still have one: (vertex indices, plane equations, volume)"""
+    try:
+        hull = ConvexHull(points, qhull_options="QJ")
+    except (QhullError, ValueError):   # menos de 4 puntos o todos coincidentes
+        return np.arange(len(points)), np.zeros((0, 4)), 0.0
+    return hull.vertices, hull.equations, hull.volume
+
+
+def _concavity(vertices, faces, piece):
+    """Hull of a piece (face indices) and the deepest surface sample (vertices and face centroids) below it"""
+    points = vertices[np.unique(faces[piece])]
+    indices, equations, _ = _hull(points)
+    if len(equations) == 0:
+        return points[indices], 0.0
+    samples = np.vstack([points, vertices[faces[piece]].mean(axis=1)])
+    depth = -(samples @ equations[:, :3].T + equations[:, 3]).max(axis=1)
+    return points[indices], float(max(depth.max(), 0.0))
+
+
+def _split(vertices, faces, piece):
+    """Split a piece by the plane, across its principal axes, that minimises the volume of the two child hulls.
+    Faces go to the side of their centroid, so the child hulls still cover the whole surface"""
+    centroids = vertices[faces[piece]].mean(axis=1)
+    centered = centroids - centroids.mean(axis=0)
+    _, axes = np.linalg.eigh(centered.T @ centered)
+    best, best_side = np.inf, None
+    for axis in axes.T:
+        projection = centered @ axis
+        low, high = projection.min(), projection.max()
+        for fraction in SPLIT_FRACTIONS:
+            side = projection <= low + fraction * (high - low)
+            if side.all() or not side.any():
+                continue
+            cost = sum(_hull(vertices[np.unique(faces[piece[s]])])[2] for s in (side, ~side))
+            if cost < best:
+                best, best_side = cost, side
+    if best_side is None:   # todas las caras en el mismo punto
+        half = len(piece) // 2
+        return piece[:half], piece[half:]
+    return piece[best_side], piece[~best_side]
+
+
+class ConvexDecomposition:
+    """Convex hulls of one mesh: vertices (V, 3) of all hulls, offsets (H + 1) into them and the concavity (m) left
+    in each; every face of the mesh lies inside one of the hulls"""
+
+    def __init__(self, vertices, offsets, concavity):
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.concavity = np.asarray(concavity, dtype=np.float64)
+        # Caja de cada envolvente (centro, semiejes) y esfera con el mismo centro hasta el vértice más lejano
+        hulls = [self.vertices[a:b] for a, b in zip(self.offsets[:-1], self.offsets[1:])]
+        self.centers = np.array([(h.min(axis=0) + h.max(axis=0)) / 2 for h in hulls]).reshape(-1, 3)
+        self.half = np.array([(h.max(axis=0) - h.min(axis=0)) / 2 for h in hulls]).reshape(-1, 3)
+        self.radii = np.array([np.linalg.norm(h - c, axis=1).max() for h, c in zip(hulls, self.centers)])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @classmethod
+    def build(cls, mesh, max_hulls=MAX_HULLS, concavity=CONCAVITY):
+        """Greedy top-down decomposition: the most concave piece is split until every piece is within
+        concavity * diagonal of its hull or there are max_hulls pieces"""
+        vertices = np.asarray(mesh.vertices, dtype=np.float64)
+        faces = np.asarray(mesh.faces, dtype=np.int64)
+        limit = concavity * np.linalg.norm(np.ptp(vertices, axis=0))
+        hull, depth = _concavity(vertices, faces, np.arange(len(faces)))
+        heap = [(-depth, 0, np.arange(len(faces)), hull)]
+        count = 1
+        while len(heap) < max_hulls and -heap[0][0] > limit:
+            _, _, piece, _ = heapq.heappop(heap)
+            for child in _split(vertices, faces, piece):
+                hull, depth = _concavity(vertices, faces, child)
+                heapq.heappush(heap, (-depth, count, child, hull))
+                count += 1
+        pieces = sorted(heap, key=lambda item: item[1])
+        sizes = [len(hull) for _, _, _, hull in pieces]
+        return cls(np.vstack([hull for _, _, _, hull in pieces]), np.concatenate([[0], np.cumsum(sizes)]),
+                   [-depth for depth, _, _, _ in pieces])
+
+    def arrays(self):
+        return {"vertices": self.vertices, "offsets": self.offsets, "concavity": self.concavity}
+
+    def to_meshes(self):
+        """One trimesh convex hull per piece, for plots and checks"""
+        return [trimesh.Trimesh(self.vertices[a:b]).convex_hull for a, b in zip(self.offsets[:-1], self.offsets[1:])]
+
+
+def convex_decomposition(mesh, max_hulls=MAX_HULLS, concavity=CONCAVITY, use_cache=True):
+    """ConvexDecomposition of a mesh, cached by its geometry fingerprint and the decomposition settings"""
+    key = f"{geometry_fingerprint(mesh)}-hulls{max_hulls}-concavity{concavity:g}-splits{len(SPLIT_FRACTIONS)}"
+    cache = DiskLRUCache(CONVEX_CACHE_DIR) if use_cache else None
+    if cache is not None:
+        cached = cache.get(key, ".npz")
+        if cached is not None:
+            with np.load(cached) as data:
+                return ConvexDecomposition(data["vertices"], data["offsets"], data["concavity"])
+
+    decomposition = ConvexDecomposition.build(mesh, max_hulls, concavity)
+    if cache is not None:
+        tmp = cache.path_for(key, ".build.npz")
+        np.savez(tmp, **decomposition.arrays())
+        cache.put(key, tmp, ".npz")
+        os.remove(tmp)
+    return decomposition
+
+
+# ----------------------------
+# GJK / EPA
+# ----------------------------
+
+@_jit()
+def _support(vertices, start, end, rotation, translation, direction):
+    """Vertex of a posed hull farthest along a world direction"""
+    local = rotation.T @ direction
+    best, index = -np.inf, start
+    for i in range(start, end):
+        s = vertices[i, 0] * local[0] + vertices[i, 1] * local[1] + vertices[i, 2] * local[2]
+        if s > best:
+            best, index = s, i
+    return rotation @ vertices[index] + translation
+
+
+@_jit()
+def _closest_segment(a, b):
+    """Parameter of the point of segment ab closest to the origin"""
+    ab = b - a
+    length = ab @ ab
+    return min(max(-(a @ ab) / length, 0.0), 1.0) if length > 1e-30 else 0.0
+
+
+@_jit()
+def _closest_triangle(a, b, c):
+    """Barycentric weights of the point of triangle abc closest to the origin (Ericson 5.1.5)"""
+    ab, ac = b - a, c - a
+    d1, d2 = -(ab @ a), -(ac @ a)
+    if d1 <= 0.0 and d2 <= 0.0:
+        return 1.0, 0.0, 0.0
+    d3, d4 = -(ab @ b), -(ac @ b)
+    if d3 >= 0.0 and d4 <= d3:
+        return 0.0, 1.0, 0.0
+    vc = d1 * d4 - d3 * d2
+    if vc <= 0.0 and d1 >= 0.0 and d3 <= 0.0:
+        v = d1 / max(d1 - d3, 1e-30)   # d1 - d3 = |ab|²; aristas nulas con puntos de soporte repetidos
+        return 1.0 - v, v, 0.0
+    d5, d6 = -(ab @ c), -(ac @ c)
+    if d6 >= 0.0 and d5 <= d6:
+        return 0.0, 0.0, 1.0
+    vb = d5 * d2 - d1 * d6
+    if vb <= 0.0 and d2 >= 0.0 and d6 <= 0.0:
+        w = d2 / max(d2 - d6, 1e-30)
+        return 1.0 - w, 0.0, w
+    va = d3 * d6 - d5 * d4
+    if va <= 0.0 and d4 - d3 >= 0.0 and d5 - d6 >= 0.0:
+        w = (d4 - d3) / max((d4 - d3) + (d5 - d6), 1e-30)
+        return 0.0, 1.0 - w, w
+    denominator = va + vb + vc
+    if denominator <= 1e-30:   # triángulo degenerado: la mejor de las aristas
+        t1, t2 = _closest_segment(a, b), _closest_segment(b, c)
+        q1, q2 = a + (b - a) * t1, b + (c - b) * t2
+        if q1 @ q1 <= q2 @ q2:
+            return 1.0 - t1, t1, 0.0
+        return 0.0, 1.0 - t2, t2
+    v, w = vb / denominator, vc / denominator
+    return 1.0 - v - w, v, w
+
+
+@_jit()
+def _closest_simplex(points, n):
+    """Barycentric weights (4,) of the point of the simplex points[:n] closest to the origin, and whether a
+    tetrahedron contains the origin"""
+    weights = np.zeros(4)
+    if n == 1:
+        weights[0] = 1.0
+    elif n == 2:
+        t = _closest_segment(points[0], points[1])
+        weights[0], weights[1] = 1.0 - t, t
+    elif n == 3:
+        weights[0], weights[1], weights[2] = _closest_triangle(points[0], points[1], points[2])
+    else:
+        volume = (points[1] - points[0]) @ np.cross(points[2] - points[0], points[3] - points[0])
+        best, inside = np.inf, True
+        for f in range(4):
+            i, j, k, o = _TETRA_FACES[f, 0], _TETRA_FACES[f, 1], _TETRA_FACES[f, 2], _TETRA_FACES[f, 3]
+            normal = np.cross(points[j] - points[i], points[k] - points[i])
+            # El origen del mismo lado que el vértice opuesto: esta cara no es la más cercana
+            if abs(volume) > 1e-15 and -(normal @ points[i]) * (normal @ (points[o] - points[i])) >= 0.0:
+                continue
+            inside = False
+            u, v, w = _closest_triangle(points[i], points[j], points[k])
+            q = u * points[i] + v * points[j] + w * points[k]
+            if q @ q < best:
+                best = q @ q
+                weights[:] = 0.0
+                weights[i], weights[j], weights[k] = u, v, w
+        if inside:
+            return weights, True
+    return weights, False
+
+
+@_jit()
+def _add_face(points, faces, normals, offsets, alive, n_faces, interior, i, j, k):
+    """Append face ijk to the EPA polytope, oriented away from an interior point (the origin may lie on the
+    boundary, so its side cannot orient the face); offsets holds the distance of the plane to the origin"""
+    normal = np.cross(points[j] - points[i], points[k] - points[i])
+    norm = np.sqrt(normal @ normal)
+    if norm <= 1e-30:
+        alive[n_faces] = False
+        return n_faces + 1
+    normal /= norm
+    if normal @ (points[i] - interior) < 0.0:
+        normal, j, k = -normal, k, j
+    offset = normal @ points[i]
+    faces[n_faces, 0], faces[n_faces, 1], faces[n_faces, 2] = i, j, k
+    normals[n_faces], offsets[n_faces], alive[n_faces] = normal, offset, True
+    return n_faces + 1
+
+
+@_jit()
+def _epa(va, sa, ea, vb, sb, eb, rotation, translation, simplex):
+    """Penetration depth from the GJK tetrahedron that contains the origin (expanding polytope algorithm)"""
+    eye, zero = np.eye(3), np.zeros(3)
+    points = np.empty((EPA_VERTICES, 3))
+    points[:4] = simplex
+    faces = np.empty((EPA_FACES, 3), dtype=np.int64)
+    normals = np.empty((EPA_FACES, 3))
+    offsets = np.empty(EPA_FACES)
+    alive = np.zeros(EPA_FACES, dtype=np.bool_)
+    edges = np.empty((3 * EPA_FACES, 2), dtype=np.int64)
+    n_points, n_faces = 4, 0
+    interior = (simplex[0] + simplex[1] + simplex[2] + simplex[3]) / 4
+    for f in range(4):
+        n_faces = _add_face(points, faces, normals, offsets, alive, n_faces, interior,
+                            _TETRA_FACES[f, 0], _TETRA_FACES[f, 1], _TETRA_FACES[f, 2])
+    depth = 0.0
+    for _ in range(EPA_ITERATIONS):
+        depth, face = np.inf, -1
+        for f in range(n_faces):
+            if alive[f] and offsets[f] < depth:
+                depth, face = offsets[f], f
+        if face < 0:
+            return 0.0
+        normal = normals[face]
+        point = _support(va, sa, ea, eye, zero, normal) - _support(vb, sb, eb, rotation, translation, -normal)
+        if point @ normal - depth <= EPA_TOLERANCE or n_points == EPA_VERTICES:
+            return depth
+        points[n_points] = point
+        n_points += 1
+        # Se quitan las caras visibles desde el punto nuevo; las aristas que solo aparecen una vez son el horizonte
+        n_edges = 0
+        for f in range(n_faces):
+            if alive[f] and normals[f] @ (point - points[faces[f, 0]]) > 0.0:
+                alive[f] = False
+                for e in range(3):
+                    p, q = faces[f, e], faces[f, (e + 1) % 3]
+                    found = -1
+                    for g in range(n_edges):
+                        if edges[g, 0] == q and edges[g, 1] == p:
+                            found = g
+                            break
+                    if found >= 0:
+                        n_edges -= 1
+                        edges[found] = edges[n_edges]
+                    else:
+                        edges[n_edges, 0], edges[n_edges, 1] = p, q
+                        n_edges += 1
+        if n_faces + n_edges > EPA_FACES:
+            return depth
+        for g in range(n_edges):
+            n_faces = _add_face(points, faces, normals, offsets, alive, n_faces, interior, edges[g, 0],
+                                edges[g, 1], n_points - 1)
+    return depth
+
+
+@_jit()
+def _blow_up(va, sa, ea, vb, sb, eb, rotation, translation, simplex, n):
+    """Complete a GJK simplex that touches the origin to a tetrahedron for EPA, with support points off its
+    affine hull. Returns False when the Minkowski difference is flat (contact without depth)"""
+    eye, zero = np.eye(3), np.zeros(3)
+    candidates = np.empty((6, 3))
+    while n < 4:
+        if n == 1:
+            candidates[:3], candidates[3:] = eye, -eye
+            count = 6
+        elif n == 2:
+            u = simplex[1] - simplex[0]
+            d = np.cross(u, eye[np.argmin(np.abs(u))])
+            e = np.cross(u, d)
+            candidates[0], candidates[1], candidates[2], candidates[3] = d, -d, e, -e
+            count = 4
+        else:
+            normal = np.cross(simplex[1] - simplex[0], simplex[2] - simplex[0])
+            candidates[0], candidates[1] = normal, -normal
+            count = 2
+        added = False
+        for c in range(count):
+            d = candidates[c]
+            point = _support(va, sa, ea, eye, zero, d) - _support(vb, sb, eb, rotation, translation, -d)
+            offset = point - simplex[0]
+            if n == 1:
+                off_hull = offset @ offset > 1e-18
+            elif n == 2:
+                u = simplex[1] - simplex[0]
+                cross = np.cross(offset, u)
+                off_hull = cross @ cross > 1e-18 * (u @ u)
+            else:
+                off_hull = abs(d @ offset) > 1e-9 * np.sqrt(d @ d)
+            if off_hull:
+                simplex[n] = point
+                n += 1
+                added = True
+                break
+        if not added:
+            return False
+    return True
+
+
+@_jit()
+def _gjk_epa(va, sa, ea, vb, sb, eb, rotation, translation):
+    """Signed distance between hull a (vertices va[sa:ea], world) and hull b posed by rotation/translation:
+    the separation (GJK), or minus the penetration depth (EPA) when they overlap"""
+    eye, zero = np.eye(3), np.zeros(3)
+    simplex = np.empty((4, 3))
+    n = 0
+    v = va[sa] - (rotation @ vb[sb] + translation)
+    for _ in range(GJK_ITERATIONS):
+        vv = v @ v
+        if vv <= 1e-24:   # el origen está sobre el símplice: contacto o penetración
+            if n == 0:
+                simplex[0] = v
+                n = 1
+            if _blow_up(va, sa, ea, vb, sb, eb, rotation, translation, simplex, n):
+                return -_epa(va, sa, ea, vb, sb, eb, rotation, translation, simplex)
+            return 0.0
+        point = _support(va, sa, ea, eye, zero, -v) - _support(vb, sb, eb, rotation, translation, v)
+        # Sin avance en la dirección -v: v ya es el punto de la diferencia de Minkowski más cercano al origen
+        if vv - v @ point <= GJK_TOLERANCE * vv:
+            return np.sqrt(vv)
+        simplex[n] = point
+        n += 1
+        weights, inside = _closest_simplex(simplex, n)
+        if inside:
+            return -_epa(va, sa, ea, vb, sb, eb, rotation, translation, simplex)
+        v = np.zeros(3)
+        m = 0
+        for i in range(n):
+            if weights[i] > 0.0:
+                v += weights[i] * simplex[i]
+                simplex[m] = simplex[i]
+                m += 1
+        n = m
+    return np.sqrt(v @ v)
+
+
+@_jit()
+def _set_distance(va, oa, ca, ea, ra, vb, ob, cb, eb, rb, rotation, translation, stop):
+    """Signed distance between two hull sets (b posed) and the closest hull pair. Each pair gets a lower bound of
+    its signed distance: the gap between the boxes (b's box rotated into a's axes, |R| half extents) when they
+    are apart, otherwise the gap between the spheres, which also bounds the penetration depth. Only pairs whose
+    bound is below the best so far run GJK; the search ends at the first pair closer than stop"""
+    ha, hb = len(oa) - 1, len(ob) - 1
+    gaps = np.empty((ha, hb))
+    spread = np.abs(rotation)
+    first, smallest = 0, np.inf
+    for j in range(hb):
+        center = rotation @ cb[j] + translation
+        half = spread @ eb[j]
+        for i in range(ha):
+            d = ca[i] - center
+            box = 0.0
+            for k in range(3):
+                e = max(abs(d[k]) - ea[i, k] - half[k], 0.0)
+                box += e * e
+            gaps[i, j] = np.sqrt(box) if box > 0.0 else np.sqrt(d @ d) - ra[i] - rb[j]
+            if gaps[i, j] < smallest:
+                first, smallest = i * hb + j, gaps[i, j]
+    i, j = first // hb, first % hb
+    best = _gjk_epa(va, oa[i], oa[i + 1], vb, ob[j], ob[j + 1], rotation, translation)
+    best_a, best_b = i, j
+    if best <= stop:
+        return best, best_a, best_b
+    for i in range(ha):
+        for j in range(hb):
+            if gaps[i, j] >= best or (i == best_a and j == best_b):
+                continue
+            d = _gjk_epa(va, oa[i], oa[i + 1], vb, ob[j], ob[j + 1], rotation, translation)
+            if d < best:
+                best, best_a, best_b = d, i, j
+                if best <= stop:
+                    return best, best_a, best_b
+    return best, best_a, best_b
+
+
+@_jit(parallel=True)
+def _pose_distances(va, oa, ca, ea, ra, vb, ob, cb, eb, rb, rotations, translations, stop):
+    n = len(rotations)
+    distance = np.empty(n)
+    pair = np.empty((n, 2), dtype=np.int64)
+    for p in _range(n):
+        distance[p], pair[p, 0], pair[p, 1] = _set_distance(va, oa, ca, ea, ra, vb, ob, cb, eb, rb, rotations[p],
+                                                            translations[p], stop)
+    return distance, pair
+
+
+@_jit(parallel=True)
+def _point_distances(va, oa, ca, ea, ra, points, stop):
+    n = len(points)
+    distance = np.empty(n)
+    hull = np.empty(n, dtype=np.int64)
+    offsets, half, radius, eye, zero = np.array([0, 1]), np.zeros((1, 3)), np.zeros(1), np.eye(3), np.zeros(3)
+    for p in _range(n):
+        point = points[p:p + 1]
+        distance[p], hull[p], _ = _set_distance(va, oa, ca, ea, ra, point, offsets, point, half, radius, eye, zero,
+                                                stop)
+    return distance, hull
+
+
+# ----------------------------
+# API
+# ----------------------------
+
+class ConvexAssembly:
+    """Convex decompositions of every component of an Assembly, packed for the GJK/EPA kernels"""
+
+    def __init__(self, assembly, max_hulls=MAX_HULLS, concavity=CONCAVITY, use_cache=True):
+        self.assembly = assembly
+        self.parts = [convex_decomposition(m, max_hulls, concavity, use_cache) for m in assembly.meshes]
+        counts = [len(p.vertices) for p in self.parts]
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        self.vertices = np.vstack([p.vertices for p in self.parts])
+        self.offsets = np.concatenate([[0]] + [p.offsets[1:] + s for p, s in zip(self.parts, starts)])
+        self.centers = np.vstack([p.centers for p in self.parts])
+        self.half = np.vstack([p.half for p in self.parts])
+        self.radii = np.concatenate([p.radii for p in self.parts])
+        self.component = np.repeat(np.arange(len(self.parts)), [len(p) for p in self.parts]).astype(np.int32)
+
+    def __len__(self):
+        return len(self.radii)
+
+    @property
+    def arrays(self):
+        return self.vertices, self.offsets, self.centers, self.half, self.radii
+
+    def distance(self, other, poses, stop=-np.inf):
+        """Signed distance (negative = penetration depth) between this assembly and other ConvexAssembly placed at
+        each pose (N, 4, 4) in this frame, with the closest components (self, other). Conservative: the hulls
+        contain the surfaces, so a positive distance certifies clearance. The search for a pose stops at the
+        first pair closer than stop (docking checks only need to know there is contact)"""
+        poses = np.asarray(poses, dtype=float).reshape(-1, 4, 4)
+        rotations = np.ascontiguousarray(poses[:, :3, :3])
+        translations = np.ascontiguousarray(poses[:, :3, 3])
+        distance, pair = _pose_distances(*self.arrays, *other.arrays, rotations, translations, stop)
+        return distance, self.component[pair[:, 0]], other.component[pair[:, 1]]
+
+    def point_distance(self, points, radius=0.0, stop=-np.inf):
+        """Signed distance from points (N, 3) (debris particles of the given radius) to the assembly and the
+        closest component"""
+        points = np.ascontiguousarray(np.asarray(points, dtype=float).reshape(-1, 3))
+        distance, hull = _point_distances(*self.arrays, points, stop + radius)
+        return distance - radius, self.component[hull]
+
+
+def library_meshes(folder=LIBRARY_DIR):
+    """Non-empty STL parts of the library, by file name"""
+    meshes = {}
+    for name in sorted(os.listdir(folder)):
+        if name.lower().endswith(".stl"):
+            mesh = trimesh.load(os.path.join(folder, name), force="mesh")
+            if len(mesh.faces) > 0:
+                meshes[os.path.splitext(name)[0]] = mesh
+    return meshes
+
+
+if __name__ == "__main__":
+    # Uso: python convex_decomposition.py [partículas de debris]
+    particles = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    station = import_script(STATION_SCRIPT)
+    parts = {"warp_nacelle": station.create_warp_nacelle(), "robotic_arm": station.create_robotic_arm(),
+             **library_meshes()}
+
+    print(f"{'Pieza':<36} {'caras':>6} {'envolventes':>11} {'concavidad/diagonal':>20} {'primera / caché':>20}")
+    for name, mesh in parts.items():
+        start = time.perf_counter()
+        convex_decomposition(mesh)
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        decomposition = convex_decomposition(mesh)
+        cached = time.perf_counter() - start
+        diagonal = np.linalg.norm(np.ptp(mesh.vertices, axis=0))
+        print(f"  {name:<34} {len(mesh.faces):6d} {len(decomposition):11d} "
+              f"{decomposition.concavity.max() / diagonal:20.3f} {first * 1000:11.1f} / {cached * 1000:.1f} ms")
+
+    # Brazo junto a la nacela en poses aleatorias: libres certificadas por cajas, por una sola envolvente y por la
+    # descomposición; la distancia entre triángulos de docking_sweep da la holgura real de las libres
+    from docking_sweep import DockingSweep
+
+    arm_mesh = parts["robotic_arm"].copy()
+    arm_mesh.apply_translation(-arm_mesh.bounds.mean(axis=0))   # el brazo viene ya colocado en el fuselaje
+    nacelle = Assembly(["warp_nacelle"], [parts["warp_nacelle"]])
+    arm = Assembly(["robotic_arm"], [arm_mesh])
+    convex_nacelle, convex_arm = ConvexAssembly(nacelle), ConvexAssembly(arm)
+    single_nacelle, single_arm = ConvexAssembly(nacelle, max_hulls=1), ConvexAssembly(arm, max_hulls=1)
+    rng = np.random.default_rng(0)
+    n_poses = 500
+    poses = np.tile(np.eye(4), (n_poses, 1, 1))
+    poses[:, :3, :3] = [trimesh.transformations.random_rotation_matrix(rng.random(3))[:3, :3] for _ in poses]
+    surface, _ = trimesh.sample.sample_surface(parts["warp_nacelle"], n_poses, seed=0)
+    direction = rng.normal(size=(n_poses, 3))
+    direction /= np.linalg.norm(direction, axis=1, keepdims=True)
+    poses[:, :3, 3] = surface + direction * rng.uniform(0.0, 2.0, (n_poses, 1))
+
+    convex_nacelle.distance(convex_arm, poses[:2])                 # compilación de numba
+    start = time.perf_counter()
+    convex, _, _ = convex_nacelle.distance(convex_arm, poses)
+    convex_time = (time.perf_counter() - start) / n_poses
+    single, _, _ = single_nacelle.distance(single_arm, poses)
+    exact_sweep = DockingSweep(nacelle, arm)
+    exact_sweep.distance(poses[0])
+    start = time.perf_counter()
+    exact = np.array([exact_sweep.distance(pose) for pose in poses])
+    exact_time = (time.perf_counter() - start) / n_poses
+    corners = np.array(np.meshgrid(*arm.bounds.T)).reshape(3, -1).T
+    moved = corners @ poses[:, :3, :3].swapaxes(1, 2) + poses[:, None, :3, 3]
+    lo, hi = nacelle.bounds
+    boxes = ((moved.min(axis=1) > hi) | (moved.max(axis=1) < lo)).any(axis=1)
+    print(f"Brazo junto a la nacela, {n_poses} poses: GJK {convex_time * 1e6:.0f} us, triángulos "
+          f"{exact_time * 1e6:.0f} us por consulta")
+    print(f"  libres certificadas: cajas {boxes.sum()}, una envolvente {(single > 0).sum()}, "
+          f"{len(convex_nacelle)} + {len(convex_arm)} envolventes {(convex > 0).sum()}")
+    print(f"  todas las libres por envolventes lo son en triángulos: {bool((exact[convex > 0] > 0).all())}; "
+          f"holgura conservadora media {np.mean(exact[convex > 0] - convex[convex > 0]) * 1000:.1f} mm")
+
+    # Debris alrededor de la nave Falcon Parker
+    ship = falcon_parker_assembly()
+    start = time.perf_counter()
+    convex_ship = ConvexAssembly(ship)
+    print(f"Falcon Parker: {len(ship)} componentes, {len(convex_ship)} envolventes en "
+          f"{time.perf_counter() - start:.1f} s")
+    lo, hi = ship.bounds
+    points = rng.uniform(lo - 2.0, hi + 2.0, (particles, 3))
+    convex_ship.point_distance(points[:2], radius=0.01)
+    start = time.perf_counter()
+    distance, component = convex_ship.point_distance(points, radius=0.01)
+    elapsed = time.perf_counter() - start
+    near = distance < 0.5
+    print(f"  {particles} partículas en {elapsed:.2f} s; a menos de 0.5 m: {near.sum()}, dentro de alguna "
+          f"envolvente: {(distance < 0).sum()}")
+    names, counts = np.unique(component[near], return_counts=True)
+    for index, count in sorted(zip(names, counts), key=lambda item: -item[1])[:5]:
+        print(f"    {ship.names[index]:<32} {count}")
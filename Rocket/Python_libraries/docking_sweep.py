@@ -0,0 +1,502 @@
+# docking_sweep.py
+# Barrido de colisión continua para aproximación y atraque: dos ensamblajes (objetivo fijo y perseguidor) y
+# una trayectoria relativa de poses por corredor. Avance conservador sobre BVH (cajas del objetivo frente a
+# cajas giradas del perseguidor, distancia exacta triángulo-triángulo en las hojas): instante del primer contacto,
+# separación mínima y componentes en contacto, con miles de corredores evaluados en paralelo.
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from assembly import Assembly, falcon_parker_assembly, import_script
+from ray_caster import BVH, LEAF_SIZE, SAH_BINS, build_bvh
+from render_cache import DiskLRUCache, cache_dir
+
+try:
+    import numba
+except ImportError:  # sin numba los mismos núcleos corren en Python puro, repartidos entre procesos
+    numba = None
+
+CONTACT_TOLERANCE = 0.01     # m
+MAX_EDGE = 0.5               # m; los triángulos largos se parten para que las hojas del BVH sean compactas
+RELATIVE_TOLERANCE = 0.25    # durante el avance la distancia puede ser hasta un 25 % mayor que la real
+REFINE_TOLERANCE = 0.01      # m; tolerancia absoluta de la separación mínima final
+REFINE_STEPS = 2             # iteraciones de sección áurea; cada consulta exacta cerca del puerto cuesta ~50 ms
+MAX_STEPS = 20000
+# fastmath sin nnan/ninf: los núcleos usan inf como cota inicial y NaN para "sin contacto"
+FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+STATION_SCRIPT = os.path.join(REPO_ROOT, "SpaceCraft_04", "special", "python", "Estacion_2_nave.py")
+DISTANCE_BVH_CACHE_DIR = cache_dir("distance_bvh")
+
+
+def _jit(parallel=False):
+    if numba is None:
+        return lambda function: function
+    return numba.njit(parallel=parallel, fastmath=FASTMATH, cache=True)
+
+
+_range = range if numba is None else numba.prange
+
+
+# ----------------------------
+# DISTANCIAS ELEMENTALES
+# ----------------------------
+
+@_jit()
+def _point_triangle(p, a, b, c):
+    """Squared distance from p to triangle abc (Ericson, Real-Time Collision Detection 5.1.5)"""
+    ab, ac, ap = b - a, c - a, p - a
+    d1, d2 = ab @ ap, ac @ ap
+    if d1 <= 0.0 and d2 <= 0.0:
+        q = a
+    else:
+        bp = p - b
+        d3, d4 = ab @ bp, ac @ bp
+        cp = p - c
+        d5, d6 = ab @ cp, ac @ cp
+        vc, vb, va = d1 * d4 - d3 * d2, d5 * d2 - d1 * d6, d3 * d6 - d5 * d4
+        if d3 >= 0.0 and d4 <= d3:
+            q = b
+        elif d6 >= 0.0 and d5 <= d6:
+            q = c
+        elif vc <= 0.0 and d1 >= 0.0 and d3 <= 0.0:
+            q = a + ab * (d1 / (d1 - d3))
+        elif vb <= 0.0 and d2 >= 0.0 and d6 <= 0.0:
+            q = a + ac * (d2 / (d2 - d6))
+        elif va <= 0.0 and d4 - d3 >= 0.0 and d5 - d6 >= 0.0:
+            q = b + (c - b) * ((d4 - d3) / ((d4 - d3) + (d5 - d6)))
+        else:
+            denominator = 1.0 / (va + vb + vc)
+            q = a + ab * (vb * denominator) + ac * (vc * denominator)
+    d = p - q
+    return d @ d
+
+
+@_jit()
+def _segment_segment(p1, q1, p2, q2):
+    """Squared distance between segments p1q1 and p2q2 (Ericson 5.1.9)"""
+    d1, d2, r = q1 - p1, q2 - p2, p1 - p2
+    a, e, f = d1 @ d1, d2 @ d2, d2 @ r
+    if a <= 1e-12 and e <= 1e-12:
+        return r @ r
+    if a <= 1e-12:
+        s, t = 0.0, min(max(f / e, 0.0), 1.0)
+    else:
+        c = d1 @ r
+        if e <= 1e-12:
+            s, t = min(max(-c / a, 0.0), 1.0), 0.0
+        else:
+            b = d1 @ d2
+            denominator = a * e - b * b
+            s = min(max((b * f - c * e) / denominator, 0.0), 1.0) if denominator > 1e-12 else 0.0
+            t = (b * s + f) / e
+            if t < 0.0:
+                s, t = min(max(-c / a, 0.0), 1.0), 0.0
+            elif t > 1.0:
+                s, t = min(max((b - c) / a, 0.0), 1.0), 1.0
+    d = (p1 + d1 * s) - (p2 + d2 * t)
+    return d @ d
+
+
+@_jit()
+def _triangle_triangle(t1, t2):
+    """Squared distance between two disjoint triangles (3, 3): vertex-face and edge-edge minima"""
+    best = np.inf
+    for i in range(3):
+        best = min(best, _point_triangle(t1[i], t2[0], t2[1], t2[2]))
+        best = min(best, _point_triangle(t2[i], t1[0], t1[1], t1[2]))
+    for i in range(3):
+        for j in range(3):
+            best = min(best, _segment_segment(t1[i], t1[(i + 1) % 3], t2[j], t2[(j + 1) % 3]))
+    return best
+
+
+@_jit()
+def _box_box(lo, hi, center, half):
+    """Distance between an AABB and the AABB (center, half extents)"""
+    d = 0.0
+    for k in range(3):
+        e = max(lo[k] - center[k] - half[k], 0.0, center[k] - half[k] - hi[k])
+        d += e * e
+    return np.sqrt(d)
+
+
+# ----------------------------
+# DISTANCIA ENTRE BVH
+# ----------------------------
+
+@_jit()
+def _bvh_distance(a_min, a_max, a_left, a_start, a_count, a_tri, a_depth,
+                  b_center, b_half, b_left, b_start, b_count, b_tri, b_depth, rotation, translation, relative,
+                  absolute, stop):
+    """Distance between target triangles (world) and chaser triangles (local frame, posed by rotation/translation)
+    within a tolerance: returns d with true <= d <= (1 + relative) true + absolute, and the triangle pair.
+    The search ends as soon as a pair closer than stop is found (contact, the exact minimum is not needed).
+
+    Chaser nodes are their local boxes rotated into world axes (|R| h half extents); the nearer child is
+    visited first so pruning starts early.
+    """
+    # Cada descenso baja un nivel en uno de los dos árboles y deja como mucho un hermano pendiente
+    stack_a = np.empty(a_depth + b_depth, dtype=np.int64)
+    stack_b = np.empty(a_depth + b_depth, dtype=np.int64)
+    stack_a[0], stack_b[0], top = 0, 0, 1
+    best, best_a, best_b = np.inf, -1, -1
+    moved = np.empty((3, 3))
+    spread = np.abs(rotation)
+    scale = 1.0 + relative
+    while top > 0:
+        top -= 1
+        na, nb = stack_a[top], stack_b[top]
+        center = rotation @ b_center[nb] + translation
+        if _box_box(a_min[na], a_max[na], center, spread @ b_half[nb]) * scale + absolute >= best:
+            continue
+        leaf_a, leaf_b = a_count[na] > 0, b_count[nb] > 0
+        if leaf_a and leaf_b:
+            for j in range(b_start[nb], b_start[nb] + b_count[nb]):
+                for v in range(3):
+                    moved[v] = rotation @ b_tri[j, v] + translation
+                for i in range(a_start[na], a_start[na] + a_count[na]):
+                    d = _triangle_triangle(a_tri[i], moved)
+                    if d < best * best:
+                        best, best_a, best_b = np.sqrt(d), i, j
+            if best <= stop:
+                break
+            continue
+        # Se desciende por el volumen más grande; el hijo más cercano queda en la cima de la pila
+        size_a = ((a_max[na] - a_min[na]) ** 2).sum()
+        if leaf_b or (not leaf_a and size_a >= 4 * (b_half[nb] ** 2).sum()):
+            first, second = a_left[na], a_left[na] + 1
+            half = spread @ b_half[nb]
+            if (_box_box(a_min[first], a_max[first], center, half)
+                    < _box_box(a_min[second], a_max[second], center, half)):
+                first, second = second, first
+            stack_a[top], stack_b[top] = first, nb
+            stack_a[top + 1], stack_b[top + 1] = second, nb
+        else:
+            first, second = b_left[nb], b_left[nb] + 1
+            d_first = _box_box(a_min[na], a_max[na], rotation @ b_center[first] + translation,
+                               spread @ b_half[first])
+            d_second = _box_box(a_min[na], a_max[na], rotation @ b_center[second] + translation,
+                                spread @ b_half[second])
+            if d_first < d_second:
+                first, second = second, first
+            stack_a[top], stack_b[top] = na, first
+            stack_a[top + 1], stack_b[top + 1] = na, second
+        top += 2
+    return best, best_a, best_b
+
+
+@_jit()
+def _axis_rotation(axis, angle):
+    c, s = np.cos(angle), np.sin(angle)
+    x, y, z = axis[0], axis[1], axis[2]
+    k = np.array([[0.0, -z, y], [z, 0.0, -x], [-y, x, 0.0]])
+    return np.eye(3) + s * k + (1 - c) * (k @ k)
+
+
+@_jit()
+def _pose(times, positions, rotations, axes, angles, c, t):
+    """Chaser rotation and translation of corridor c at time t"""
+    k = 0
+    while k < len(times) - 2 and t > times[k + 1]:
+        k += 1
+    s = min(max((t - times[k]) / (times[k + 1] - times[k]), 0.0), 1.0)
+    rotation = rotations[c, k] @ _axis_rotation(axes[c, k], angles[c, k] * s)
+    return rotation, positions[c, k] + (positions[c, k + 1] - positions[c, k]) * s
+
+
+@_jit(parallel=True)
+def _sweep(a_min, a_max, a_left, a_start, a_count, a_tri, a_depth, b_center, b_half, b_left, b_start, b_count,
+           b_tri, b_depth, times, positions, rotations, axes, angles, speeds, tolerance, relative, refine,
+           refine_steps, max_steps):
+    """Conservative advancement along every corridor (keyframes at shared times, linear translation and
+    constant-axis rotation in between); speeds bounds how fast any chaser point moves in each segment.
+    Each step advances by the certified lower bound d / (1 + relative) of the separation. For clear corridors
+    the closest sample and its neighbours are measured to within refine (m) and refine_steps golden-section
+    iterations search the minimum separation between the neighbours"""
+    n = positions.shape[0]
+    contact = np.full(n, np.nan)
+    separation = np.full(n, np.inf)
+    steps = np.zeros(n, dtype=np.int64)
+    pair = np.full((n, 2), -1, dtype=np.int64)
+    for c in _range(n):
+        k, t, previous = 0, times[0], times[0]
+        low, closest, high, bracket_open = times[0], times[0], times[0], False
+        for step in range(max_steps):
+            rotation, translation = _pose(times, positions, rotations, axes, angles, c, t)
+            d, i, j = _bvh_distance(a_min, a_max, a_left, a_start, a_count, a_tri, a_depth, b_center, b_half,
+                                    b_left, b_start, b_count, b_tri, b_depth, rotation, translation, relative, 0.0,
+                                    tolerance)
+            steps[c] = step + 1
+            if bracket_open:
+                high, bracket_open = t, False
+            if d < separation[c]:
+                separation[c], low, closest, high, bracket_open = d, previous, t, t, True
+            if d <= tolerance:
+                contact[c] = t
+                pair[c, 0], pair[c, 1] = i, j
+                break
+            if k == len(times) - 2 and t >= times[-1]:
+                break
+            previous = t
+            advance = (d / (1.0 + relative) - 0.5 * tolerance) / speeds[c, k] if speeds[c, k] > 0 else np.inf
+            if t + advance >= times[k + 1]:
+                t = times[k + 1]
+                if k < len(times) - 2:
+                    k += 1
+            else:
+                t += advance
+        if np.isnan(contact[c]):
+            ratio = (np.sqrt(5.0) - 1.0) / 2.0
+            best = np.inf
+            # Muestra más cercana y sus vecinas con la tolerancia fina: el mínimo suele estar en la pose final
+            for t1 in (low, closest, high):
+                rotation, translation = _pose(times, positions, rotations, axes, angles, c, t1)
+                best = min(best, _bvh_distance(a_min, a_max, a_left, a_start, a_count, a_tri, a_depth, b_center,
+                                               b_half, b_left, b_start, b_count, b_tri, b_depth, rotation,
+                                               translation, 0.0, refine, 0.0)[0])
+            for _ in range(refine_steps):
+                t1, t2 = high - ratio * (high - low), low + ratio * (high - low)
+                rotation, translation = _pose(times, positions, rotations, axes, angles, c, t1)
+                d1 = _bvh_distance(a_min, a_max, a_left, a_start, a_count, a_tri, a_depth, b_center, b_half,
+                                   b_left, b_start, b_count, b_tri, b_depth, rotation, translation, 0.0, refine,
+                                   0.0)[0]
+                rotation, translation = _pose(times, positions, rotations, axes, angles, c, t2)
+                d2 = _bvh_distance(a_min, a_max, a_left, a_start, a_count, a_tri, a_depth, b_center, b_half,
+                                   b_left, b_start, b_count, b_tri, b_depth, rotation, translation, 0.0, refine,
+                                   0.0)[0]
+                best = min(best, d1, d2)
+                if d1 < d2:
+                    high = t2
+                else:
+                    low = t1
+            separation[c] = min(separation[c], best)
+    return contact, separation, steps, pair
+
+
+# ----------------------------
+# BVH PARA DISTANCIAS
+# ----------------------------
+
+def split_long_triangles(triangles, max_edge=MAX_EDGE):
+    """Bisect the longest edge of every triangle longer than max_edge until none is (same surface, same
+    winding). Returns (triangles, index of the source triangle of each piece)"""
+    source = np.arange(len(triangles))
+    while True:
+        edges = np.linalg.norm(np.roll(triangles, -1, axis=1) - triangles, axis=2)     # (F, 3): v0v1, v1v2, v2v0
+        longest = edges.argmax(axis=1)
+        split = edges[np.arange(len(triangles)), longest] > max_edge
+        if not split.any():
+            return triangles, source
+        t = triangles[split]
+        k = longest[split]
+        rows = np.arange(len(t))
+        a, b, c = t[rows, k], t[rows, (k + 1) % 3], t[rows, (k + 2) % 3]
+        m = (a + b) / 2
+        pieces = np.concatenate([np.stack([a, m, c], axis=1), np.stack([m, b, c], axis=1)])
+        triangles = np.concatenate([triangles[~split], pieces])
+        source = np.concatenate([source[~split], np.tile(source[split], 2)])
+
+
+def distance_bvh(assembly, max_edge=MAX_EDGE, use_cache=True):
+    """SAH BVH over the assembly triangles split to max_edge: (BVH, triangles in leaf order, face of each)"""
+    key = f"{assembly.fingerprint()}-split{max_edge:g}-sah{SAH_BINS}-leaf{LEAF_SIZE}"
+    cache = DiskLRUCache(DISTANCE_BVH_CACHE_DIR) if use_cache else None
+    if cache is not None:
+        cached = cache.get(key, ".npz")
+        if cached is not None:
+            with np.load(cached) as data:
+                bvh = BVH(**{name: data[name] for name in ("bounds_min", "bounds_max", "left", "start", "count",
+                                                           "order")})
+                return bvh, data["triangles"], data["face"]
+
+    triangles, source = split_long_triangles(assembly.vertices[assembly.faces], max_edge)
+    bvh = build_bvh(triangles)
+    triangles, face = np.ascontiguousarray(triangles[bvh.order]), source[bvh.order]
+    if cache is not None:
+        tmp = cache.path_for(key, ".build.npz")
+        np.savez(tmp, triangles=triangles, face=face, **bvh.arrays())
+        cache.put(key, tmp, ".npz")
+        os.remove(tmp)
+    return bvh, triangles, face
+
+
+# ----------------------------
+# API
+# ----------------------------
+
+class SweepResult:
+    """Per corridor: time of first contact (NaN = clear), minimum separation (m, refined around the closest
+    advancement sample), CA steps, contact components"""
+
+    def __init__(self, contact, separation, steps, target_component, chaser_component):
+        self.contact = contact
+        self.separation = separation
+        self.steps = steps
+        self.target_component = target_component
+        self.chaser_component = chaser_component
+
+    @property
+    def clear(self):
+        return np.isnan(self.contact)
+
+
+def _rotation_log(rotation):
+    """Axis and angle of a rotation matrix (..., 3, 3)"""
+    angle = np.arccos(np.clip((np.trace(rotation, axis1=-2, axis2=-1) - 1) / 2, -1.0, 1.0))
+    axis = np.stack([rotation[..., 2, 1] - rotation[..., 1, 2], rotation[..., 0, 2] - rotation[..., 2, 0],
+                     rotation[..., 1, 0] - rotation[..., 0, 1]], axis=-1)
+    norm = np.linalg.norm(axis, axis=-1, keepdims=True)
+    # Cerca de π el vector antisimétrico se anula: eje = columna dominante de R + I
+    near_pi = (norm[..., 0] < 1e-6) & (angle > np.pi / 2)
+    if near_pi.any():
+        sym = rotation[near_pi] + np.eye(3)
+        column = np.take_along_axis(sym, np.linalg.norm(sym, axis=-2).argmax(axis=-1)[:, None, None]
+                                    .repeat(3, axis=1), axis=-1)[..., 0]
+        axis[near_pi] = column
+        norm[near_pi] = np.linalg.norm(column, axis=-1, keepdims=True)
+    axis = np.where(norm > 1e-12, axis / np.where(norm > 1e-12, norm, 1.0), [1.0, 0.0, 0.0])
+    return axis, angle
+
+
+def _pool_sweep(args):
+    return _sweep(*args)
+
+
+class DockingSweep:
+    """Continuous collision check of a chaser Assembly moving relative to a fixed target Assembly"""
+
+    def __init__(self, target, chaser, exclude_target=(), exclude_chaser=(), max_edge=MAX_EDGE, use_cache=True):
+        self.target = self._subset(target, exclude_target)
+        self.chaser = self._subset(chaser, exclude_chaser)
+        a, a_tri, self._a_face = distance_bvh(self.target, max_edge, use_cache)
+        b, b_tri, self._b_face = distance_bvh(self.chaser, max_edge, use_cache)
+        self.a = (a.bounds_min, a.bounds_max, a.left, a.start, a.count, a_tri, a.depth)
+        self.b = ((b.bounds_min + b.bounds_max) / 2, (b.bounds_max - b.bounds_min) / 2, b.left, b.start, b.count,
+                  b_tri, b.depth)
+        self.chaser_radius = float(np.linalg.norm(self.chaser.vertices, axis=1).max())
+
+    @staticmethod
+    def _subset(assembly, exclude):
+        """Drop the components under any of the exclude prefixes (e.g. the docking ports that must touch)"""
+        keep = [i for i, name in enumerate(assembly.names) if not any(name.startswith(p) for p in exclude)]
+        if len(keep) == len(assembly):
+            return assembly
+        return Assembly([assembly.names[i] for i in keep], [assembly.meshes[i] for i in keep])
+
+    def distance(self, pose, relative=0.0, absolute=0.0):
+        """Separation for a single chaser pose (4x4)"""
+        return _bvh_distance(*self.a, *self.b, np.ascontiguousarray(pose[:3, :3]),
+                             np.ascontiguousarray(pose[:3, 3]), relative, absolute, 0.0)[0]
+
+    def run(self, poses, times=None, tolerance=CONTACT_TOLERANCE, relative=RELATIVE_TOLERANCE,
+            refine=REFINE_TOLERANCE, refine_steps=REFINE_STEPS, processes=1):
+        """Sweep corridors of chaser poses (C, K, 4, 4) in the target frame at times (K,) (default 0..1).
+
+        relative must be below 1 so every step past the contact tolerance advances (d / (1 + relative) stays
+        above tolerance / 2). processes only applies without numba; the compiled sweep already spreads the
+        corridors over threads.
+        """
+        if not 0 <= relative < 1:
+            raise ValueError(f"relative tolerance must be in [0, 1), got {relative}")
+        poses = np.asarray(poses, dtype=float)
+        n, keys = poses.shape[:2]
+        times = np.linspace(0.0, 1.0, keys) if times is None else np.asarray(times, dtype=float)
+        rotations = np.ascontiguousarray(poses[..., :3, :3])
+        positions = np.ascontiguousarray(poses[..., :3, 3])
+        axes, angles = _rotation_log(rotations[:, :-1].swapaxes(-1, -2) @ rotations[:, 1:])
+        # Cota de velocidad: traslación del segmento + giro por el radio del perseguidor
+        speeds = ((np.linalg.norm(np.diff(positions, axis=1), axis=-1) + angles * self.chaser_radius)
+                  / np.diff(times))
+        arrays = (np.ascontiguousarray(axes), np.ascontiguousarray(angles), np.ascontiguousarray(speeds))
+
+        if numba is not None or processes == 1:
+            contact, separation, steps, pair = _sweep(*self.a, *self.b, times, positions, rotations, *arrays,
+                                                      tolerance, relative, refine, refine_steps, MAX_STEPS)
+        else:
+            chunks = np.array_split(np.arange(n), processes)
+            jobs = [(*self.a, *self.b, times, positions[c], rotations[c], *(x[c] for x in arrays), tolerance,
+                     relative, refine, refine_steps, MAX_STEPS) for c in chunks]
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                results = list(pool.map(_pool_sweep, jobs))
+            contact, separation, steps, pair = (np.concatenate(r) for r in zip(*results))
+
+        hit = pair[:, 0] >= 0
+        target = np.where(hit, self.target.face_component[self._a_face[np.maximum(pair[:, 0], 0)]], -1)
+        chaser = np.where(hit, self.chaser.face_component[self._b_face[np.maximum(pair[:, 1], 0)]], -1)
+        return SweepResult(contact, separation, steps, target, chaser)
+
+
+def approach_corridors(start, end, rotation, n, lateral, misalignment, waypoints=8, rng=None):
+    """Straight approaches from start to end (chaser origin positions) with random lateral offsets (m) and
+    attitude errors (rad) growing linearly towards the end; rotation is the nominal attitude.
+    Returns (n, waypoints, 4, 4) poses"""
+    rng = np.random.default_rng(0) if rng is None else rng
+    start, end = np.asarray(start, dtype=float), np.asarray(end, dtype=float)
+    s = np.linspace(0.0, 1.0, waypoints)
+    axis = (end - start) / np.linalg.norm(end - start)
+    helper = np.array([0.0, 0.0, 1.0]) if abs(axis[2]) < 0.9 else np.array([1.0, 0.0, 0.0])
+    u = np.cross(axis, helper)
+    u /= np.linalg.norm(u)
+    v = np.cross(axis, u)
+    offset = rng.uniform(-lateral, lateral, (n, 2))
+    error = rng.uniform(-misalignment, misalignment, (n, 3))
+    poses = np.tile(np.eye(4), (n, waypoints, 1, 1))
+    poses[..., :3, 3] = (start + s[:, None] * (end - start))[None] + s[None, :, None] * (
+        offset[:, None, :1] * u + offset[:, None, 1:] * v)
+    for k, fraction in enumerate(s):
+        angle = np.linalg.norm(error, axis=1) * fraction
+        direction = error / np.maximum(np.linalg.norm(error, axis=1, keepdims=True), 1e-12)
+        K = np.zeros((n, 3, 3))
+        K[:, 0, 1], K[:, 0, 2], K[:, 1, 2] = -direction[:, 2], direction[:, 1], -direction[:, 0]
+        K -= K.swapaxes(1, 2)
+        R = np.eye(3) + np.sin(angle)[:, None, None] * K + (1 - np.cos(angle))[:, None, None] * K @ K
+        poses[:, k, :3, :3] = R @ rotation
+    return poses
+
+
+if __name__ == "__main__":
+    # Uso: python docking_sweep.py [corredores]
+    corridors = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    import Pannels_antennaSolarParker_render as ship
+
+    station = import_script(STATION_SCRIPT)
+    # Objetivo: la nave Falcon Parker con el nodo de atraque, los laboratorios y la cúpula de main()
+    ship_parts = falcon_parker_assembly()
+    station_parts = {"station/docking_node": ship.create_docking_node(),
+                     "station/lab_module_0": ship.create_lab_module([3.5, 0, ship.FUSELAGE_LENGTH * 0.6]),
+                     "station/lab_module_1": ship.create_lab_module([-3.5, 0, ship.FUSELAGE_LENGTH * 0.6]),
+                     "station/cupola": ship.create_cupola_module()}
+    target = Assembly(ship_parts.names + list(station_parts), ship_parts.meshes + list(station_parts.values()))
+    module = station.create_falcon_parker_module_v2([0, 0, 0])
+    chaser = Assembly(["chaser/falcon_parker_module_v2"], [module])
+
+    # Atraque en el puerto +y del nodo (los puertos ±x dan a los laboratorios): el extremo +y del módulo
+    # mira hacia -y (giro de 180° en z)
+    rotation = np.diag([-1.0, -1.0, 1.0])
+    port = np.array([0.0, 1.8, ship.FUSELAGE_LENGTH * 0.6])
+    standoff = 0.5
+    end = port + [0.0, module.bounds[1, 1] + standoff, 0.0]
+    poses = approach_corridors(end + [0.0, 60.0, 0.0], end, rotation, corridors, lateral=3.0,
+                               misalignment=np.radians(10.0))
+
+    sweep = DockingSweep(target, chaser)
+    start = time.perf_counter()
+    sweep.run(poses[:2])                                 # compilación de numba
+    compile_time = time.perf_counter() - start
+    start = time.perf_counter()
+    result = sweep.run(poses)
+    elapsed = time.perf_counter() - start
+    print(f"{corridors} corredores ({len(sweep.a[5])} x {len(sweep.b[5])} triángulos partidos) en {elapsed:.2f} s "
+          f"(+{compile_time:.1f} s de compilación), {result.steps.mean():.0f} pasos de avance por corredor")
+    print(f"  libres: {result.clear.sum()}, con contacto: {(~result.clear).sum()}; separación mínima de los "
+          f"libres {np.min(result.separation[result.clear], initial=np.inf):.3f} m")
+    if (~result.clear).any():
+        first = np.nanargmin(result.contact)
+        print(f"  primer contacto más temprano: t = {result.contact[first]:.3f} del corredor {first} "
+              f"({target.names[result.target_component[first]]} / "
+              f"{chaser.names[result.chaser_component[first]]})")
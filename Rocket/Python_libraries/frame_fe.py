@@ -0,0 +1,409 @@
+# frame_fe.py
+# Elementos finitos de pórtico 3D (viga Euler-Bernoulli, 6 GDL por nodo) con matrices dispersas.
+# El modelo de ejes se extrae de las mallas de los constructores (create_launch_tower, create_structural_arm,
+# create_cross_tubes, create_spine_structure...) o se da directamente con nodos y elementos.
+# Rigidez elemental vectorizada (E, 12, 12), ensamblaje COO -> CSR y solución directa (SuperLU) o CG.
+
+import os
+import sys
+import time
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+
+from assembly import import_script
+
+G0 = 9.80665
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+# Módulo de Young (Pa), coeficiente de Poisson, densidad (kg/m³)
+FRAME_MATERIALS = {
+    "aluminium": (69.0e9, 0.33, 2700.0),
+    "aluminium_2219": (73.1e9, 0.33, 2840.0),
+    "titanium": (114.0e9, 0.34, 4430.0),
+    "steel": (200.0e9, 0.29, 7850.0),
+    "carbon_composite": (70.0e9, 0.30, 1600.0),
+}
+
+# Envolvente cuasi-estática de carga útil de la Falcon 9 (Falcon User's Guide, 4.3.1 Loads, citado en
+# SpaceCraft_04/special/python/MERLINTEMPERATURECLEAN.txt): (axial g, lateral g), axial positivo = compresión
+FALCON9_LOAD_FACTORS = {
+    "max_axial": (6.0, 0.5),
+    "max_lateral": (3.5, 2.0),
+    "max_tension": (-2.0, 0.5),
+}
+
+# Columnas de la tabla de secciones: A, Iy, Iz, J, cy, cz (fibra extrema en y y z locales)
+A, IY, IZ, J, CY, CZ = range(6)
+
+
+# ----------------------------
+# SECCIONES
+# ----------------------------
+
+def circular_section(radius, thickness=None):
+    """Solid circle, or tube of wall thickness"""
+    ri = 0.0 if thickness is None else max(radius - thickness, 0.0)
+    area = np.pi * (radius ** 2 - ri ** 2)
+    inertia = np.pi / 4 * (radius ** 4 - ri ** 4)
+    return np.array([area, inertia, inertia, 2 * inertia, radius, radius])
+
+
+def rectangular_section(width, height):
+    """Solid rectangle, width along local y and height along local z"""
+    a, b = max(width, height), min(width, height)
+    torsion = a * b ** 3 * (1 / 3 - 0.21 * b / a * (1 - (b / a) ** 4 / 12))
+    return np.array([width * height, width * height ** 3 / 12, height * width ** 3 / 12, torsion,
+                     width / 2, height / 2])
+
+
+# ----------------------------
+# MODELO
+# ----------------------------
+
+class FrameModel:
+    """Nodes (N, 3), two-node elements (E, 2) with a section row and a material (E, ν, ρ) each.
+
+    orientation is a vector in the local x-y plane of every element (defaults to global z, or global y for
+    vertical elements); node_mass adds lumped masses (kg) such as payloads or tip equipment.
+    """
+
+    def __init__(self, nodes, elements, sections, material="aluminium", orientation=None, node_mass=None):
+        self.nodes = np.asarray(nodes, dtype=float)
+        self.elements = np.asarray(elements, dtype=np.int64).reshape(-1, 2)
+        n_el = len(self.elements)
+        self.sections = np.broadcast_to(np.asarray(sections, dtype=float), (n_el, 6)).copy()
+        if isinstance(material, str):
+            material = FRAME_MATERIALS[material]
+        self.material = np.broadcast_to(np.asarray(material, dtype=float), (n_el, 3)).copy()
+        self.orientation = None if orientation is None else np.broadcast_to(orientation, (n_el, 3)).astype(float)
+        self.node_mass = np.zeros(len(self.nodes)) if node_mass is None else np.asarray(node_mass, dtype=float)
+        self.fixed = np.zeros((len(self.nodes), 6), dtype=bool)
+
+    @property
+    def n_dof(self):
+        return 6 * len(self.nodes)
+
+    def fix(self, nodes, dofs=slice(None)):
+        self.fixed[np.atleast_1d(nodes), dofs] = True
+        return self
+
+    def fix_below(self, value, axis=2, dofs=slice(None)):
+        """Clamp every node with coordinate <= value along axis (base of towers and spines)"""
+        return self.fix(np.nonzero(self.nodes[:, axis] <= value)[0], dofs)
+
+    @classmethod
+    def from_meshes(cls, meshes, material="aluminium", element_length=0.5, min_slenderness=3.0,
+                    connect_tolerance=0.05):
+        """Centerline frame of the slender bodies of one or several meshes.
+
+        Every body longer than min_slenderness times its width becomes a beam along its principal axis
+        (circular or rectangular section from its cross-section area). Beam ends closer than the sum of
+        both half-widths plus connect_tolerance to another beam are joined to its nearest node.
+        """
+        meshes = meshes if isinstance(meshes, (list, tuple)) else [meshes]
+        beams = [beam for mesh in meshes for body in mesh.split(only_watertight=False)
+                 if (beam := beam_from_mesh(body, min_slenderness)) is not None]
+        if not beams:
+            raise ValueError("no slender bodies found")
+
+        nodes, elements, sections, orientation, owner, ends = [], [], [], [], [], []
+        for b, (p0, p1, section, up) in enumerate(beams):
+            n = max(1, int(np.ceil(np.linalg.norm(p1 - p0) / element_length)))
+            start = sum(len(x) for x in nodes)
+            nodes.append(p0 + np.linspace(0, 1, n + 1)[:, None] * (p1 - p0))
+            elements.append(start + np.column_stack([np.arange(n), np.arange(1, n + 1)]))
+            sections.append(np.repeat(section[None], n, axis=0))
+            orientation.append(np.repeat(up[None], n, axis=0))
+            owner.append(np.full(n + 1, b))
+            ends.append((start, start + n))
+        nodes, owner = np.vstack(nodes), np.concatenate(owner)
+        elements, sections, orientation = np.vstack(elements), np.vstack(sections), np.vstack(orientation)
+
+        # Nodos coincidentes de vigas distintas se funden
+        merged = np.arange(len(nodes))
+        for i, j in sorted(cKDTree(nodes).query_pairs(1e-6)):
+            merged[max(i, j)] = merged[min(i, j)]
+        merged = merged[merged]
+
+        # Extremos libres que tocan otra viga: elemento de unión al nodo más cercano
+        tree = cKDTree(nodes)
+        half_width = np.array([max(s[CY], s[CZ]) for _, _, s, _ in beams])
+        links = []
+        for b, (first, last) in enumerate(ends):
+            for end in (first, last):
+                if (owner[merged == merged[end]] != b).any():
+                    continue          # ya fundido con otra viga
+                radius = half_width[b] + half_width.max() + connect_tolerance
+                candidates = [k for k in tree.query_ball_point(nodes[end], radius)
+                              if owner[k] != b and merged[k] != merged[end]]
+                if not candidates:
+                    continue
+                k = min(candidates, key=lambda k: np.linalg.norm(nodes[k] - nodes[end]))
+                if np.linalg.norm(nodes[k] - nodes[end]) <= half_width[b] + half_width[owner[k]] + connect_tolerance:
+                    links.append((end, k, b))
+        if links:
+            link = np.array(links)
+            elements = np.vstack([elements, link[:, :2]])
+            sections = np.vstack([sections, [beams[b][2] for b in link[:, 2]]])
+            orientation = np.vstack([orientation, [beams[b][3] for b in link[:, 2]]])
+
+        # Se renumeran los nodos que quedan tras la fusión
+        used, elements = np.unique(merged[elements], return_inverse=True)
+        return cls(nodes[used], elements.reshape(-1, 2), sections, material, orientation)
+
+    def lengths(self):
+        return np.linalg.norm(self.nodes[self.elements[:, 1]] - self.nodes[self.elements[:, 0]], axis=1)
+
+    def rotations(self):
+        """(E, 3, 3) rows = local x, y, z axes of every element"""
+        x = self.nodes[self.elements[:, 1]] - self.nodes[self.elements[:, 0]]
+        x /= np.linalg.norm(x, axis=1, keepdims=True)
+        if self.orientation is None:
+            ref = np.where(np.abs(x[:, 2:3]) > 0.99, [0.0, 1.0, 0.0], [0.0, 0.0, 1.0])
+        else:
+            ref = self.orientation.copy()
+            parallel = np.abs(np.einsum("ij,ij->i", ref, x)) > 0.99 * np.linalg.norm(ref, axis=1)
+            ref[parallel] = np.where(np.abs(x[parallel, 2:3]) > 0.99, [0.0, 1.0, 0.0], [0.0, 0.0, 1.0])
+        y = ref - np.einsum("ij,ij->i", ref, x)[:, None] * x
+        y /= np.linalg.norm(y, axis=1, keepdims=True)
+        return np.stack([x, y, np.cross(x, y)], axis=1)
+
+    def element_dofs(self):
+        return (self.elements[:, [0] * 6 + [1] * 6] * 6 + np.tile(np.arange(6), 2)).astype(np.int64)
+
+    def local_stiffness(self):
+        """(E, 12, 12) Euler-Bernoulli beam stiffness in local axes"""
+        L = self.lengths()
+        E, nu = self.material[:, 0], self.material[:, 1]
+        G = E / (2 * (1 + nu))
+        s = self.sections
+        k = np.zeros((len(L), 12, 12))
+        ea, gj = E * s[:, A] / L, G * s[:, J] / L
+        for (i, j), v in {(0, 0): ea, (0, 6): -ea, (6, 6): ea, (3, 3): gj, (3, 9): -gj, (9, 9): gj}.items():
+            k[:, i, j] = v
+        # Flexión en el plano x-y (v, θz) y en el plano x-z (w, θy)
+        for (v1, t1, v2, t2), inertia, sign in (((1, 5, 7, 11), s[:, IZ], 1.0), ((2, 4, 8, 10), s[:, IY], -1.0)):
+            ei = E * inertia
+            terms = {(v1, v1): 12 * ei / L ** 3, (v1, t1): sign * 6 * ei / L ** 2, (v1, v2): -12 * ei / L ** 3,
+                     (v1, t2): sign * 6 * ei / L ** 2, (t1, t1): 4 * ei / L, (t1, v2): -sign * 6 * ei / L ** 2,
+                     (t1, t2): 2 * ei / L, (v2, v2): 12 * ei / L ** 3, (v2, t2): -sign * 6 * ei / L ** 2,
+                     (t2, t2): 4 * ei / L}
+            for (i, j), v in terms.items():
+                k[:, i, j] = v
+        upper = np.triu(k, 1)
+        return k + upper.transpose(0, 2, 1)
+
+    def transforms(self):
+        """(E, 12, 12) block-diagonal rotation global -> local"""
+        R = self.rotations()
+        T = np.zeros((len(R), 12, 12))
+        for b in range(4):
+            T[:, 3 * b:3 * b + 3, 3 * b:3 * b + 3] = R
+        return T
+
+    def assemble(self, element_matrices):
+        """Sum (E, 12, 12) global element matrices into a CSR matrix (duplicates add up in COO -> CSR)"""
+        dofs = self.element_dofs()
+        rows = np.repeat(dofs, 12, axis=1).ravel()
+        cols = np.tile(dofs, (1, 12)).ravel()
+        return sp.coo_matrix((element_matrices.ravel(), (rows, cols)), shape=(self.n_dof, self.n_dof)).tocsr()
+
+    def stiffness_matrix(self):
+        T = self.transforms()
+        return self.assemble(np.matmul(T.transpose(0, 2, 1), np.matmul(self.local_stiffness(), T)))
+
+    def element_masses(self):
+        return self.material[:, 2] * self.sections[:, A] * self.lengths()
+
+    def nodal_masses(self):
+        """Lumped translational mass per node: half of every attached element plus node_mass"""
+        half = self.element_masses() / 2
+        return (np.bincount(self.elements[:, 0], half, minlength=len(self.nodes))
+                + np.bincount(self.elements[:, 1], half, minlength=len(self.nodes)) + self.node_mass)
+
+    def inertial_loads(self, load_factor_g):
+        """(N, 6) nodal forces of a body force of load_factor_g (vector, in g) acting on every mass"""
+        loads = np.zeros((len(self.nodes), 6))
+        loads[:, :3] = self.nodal_masses()[:, None] * G0 * np.asarray(load_factor_g, dtype=float)
+        return loads
+
+    def floating_nodes(self):
+        """Nodes of connected parts without any fixed degree of freedom (they would make K singular)"""
+        graph = sp.coo_matrix((np.ones(len(self.elements)), (self.elements[:, 0], self.elements[:, 1])),
+                              shape=(len(self.nodes), len(self.nodes)))
+        _, label = connected_components(graph, directed=False)
+        supported = np.zeros(label.max() + 1, dtype=bool)
+        supported[label[self.fixed.any(axis=1)]] = True
+        return np.nonzero(~supported[label])[0]
+
+    def solve(self, loads, solver="direct", stiffness=None, rtol=1e-8):
+        """Static solution for (N, 6) nodal loads or a list of them (one factorization for all cases)"""
+        K = self.stiffness_matrix() if stiffness is None else stiffness
+        cases = [loads] if np.ndim(loads) == 2 else list(loads)
+        floating = self.floating_nodes()
+        fixed = self.fixed.copy()
+        fixed[floating] = True
+        free = np.nonzero(~fixed.ravel())[0]
+        K_ff = K[free][:, free]
+        rhs = np.column_stack([np.asarray(f, dtype=float).ravel()[free] for f in cases])
+
+        if solver == "direct":
+            solution = spla.splu(K_ff.tocsc()).solve(rhs)
+        elif solver == "cg":
+            jacobi = sp.diags(1.0 / K_ff.diagonal())
+            solution = np.column_stack([spla.cg(K_ff, rhs[:, c], rtol=rtol, maxiter=20 * len(free), M=jacobi)[0]
+                                        for c in range(rhs.shape[1])])
+        else:
+            raise ValueError(f"unknown solver {solver!r}")
+
+        results = []
+        for c in range(rhs.shape[1]):
+            u = np.zeros(self.n_dof)
+            u[free] = solution[:, c]
+            results.append(FrameResult(self, u.reshape(-1, 6), floating))
+        return results[0] if np.ndim(loads) == 2 else results
+
+
+def beam_from_mesh(mesh, min_slenderness=3.0):
+    """(p0, p1, section, orientation) of a slender body along its principal axis, None if it is not slender"""
+    points = mesh.vertices
+    center = points.mean(axis=0)
+    _, axes = np.linalg.eigh(np.cov((points - center).T))
+    projected = (points - center) @ axes
+    lo, hi = projected.min(axis=0), projected.max(axis=0)
+    extent = hi - lo
+    if extent[2] < min_slenderness * max(extent[0], extent[1], 1e-9):
+        return None
+    mid = center + axes[:, :2] @ ((lo[:2] + hi[:2]) / 2)
+    p0, p1 = mid + axes[:, 2] * lo[2], mid + axes[:, 2] * hi[2]
+    width, height = extent[1], extent[0]
+    fill = abs(mesh.volume) / extent[2] / (width * height) if mesh.is_watertight else 1.0
+    if fill < 0.9:
+        section = circular_section((width + height) / 4)
+    else:
+        section = rectangular_section(width, height)
+    return p0, p1, section, axes[:, 1]
+
+
+# ----------------------------
+# RESULTADOS
+# ----------------------------
+
+class FrameResult:
+    """Nodal displacements (N, 6) and element end forces in local axes (E, 12)"""
+
+    def __init__(self, model, displacements, floating=()):
+        self.model = model
+        self.displacements = displacements
+        self.floating = np.asarray(floating)
+        u = displacements.reshape(-1)[model.element_dofs()]
+        local = np.einsum("eij,ej->ei", model.transforms(), u)
+        self.forces = np.einsum("eij,ej->ei", model.local_stiffness(), local)
+
+    def max_displacement(self):
+        return float(np.linalg.norm(self.displacements[:, :3], axis=1).max())
+
+    def stresses(self):
+        """(E,) largest normal stress (Pa) at either end: |N|/A + |My| cz/Iy + |Mz| cy/Iz"""
+        s = self.model.sections
+        f = self.forces
+        ends = [(f[:, 0], f[:, 4], f[:, 5]), (f[:, 6], f[:, 10], f[:, 11])]
+        return np.max([np.abs(n) / s[:, A] + np.abs(my) * s[:, CZ] / s[:, IY] + np.abs(mz) * s[:, CY] / s[:, IZ]
+                       for n, my, mz in ends], axis=0)
+
+    def axial_forces(self):
+        """Axial force per element (N), tension positive"""
+        return self.forces[:, 6]
+
+
+def launch_load_cases(factors=None, axis=2):
+    """(name, body-force vector in g) for every load case and lateral direction; axial along -axis"""
+    factors = FALCON9_LOAD_FACTORS if factors is None else factors
+    lateral_axes = [a for a in range(3) if a != axis]
+    cases = []
+    for name, (axial, lateral) in factors.items():
+        for k, sign in ((0, 1), (0, -1), (1, 1), (1, -1)):
+            vector = np.zeros(3)
+            vector[axis] = -axial
+            vector[lateral_axes[k]] = sign * lateral
+            cases.append((f"{name} {'+-'[sign < 0]}{'xyz'[lateral_axes[k]]}", vector))
+    return cases
+
+
+# ----------------------------
+# MODELOS DE PRUEBA
+# ----------------------------
+
+def lattice_tower(bays, cells=10, width=10.0, bay_height=1.0, section=None, material="aluminium"):
+    """Lattice tower: (cells+1)² legs, plan grid at every level and one diagonal per vertical face"""
+    section = circular_section(0.05, 0.005) if section is None else section
+    n = cells + 1
+    xy = np.stack(np.meshgrid(np.linspace(-width / 2, width / 2, n), np.linspace(-width / 2, width / 2, n),
+                              indexing="ij"), axis=-1).reshape(-1, 2)
+    levels = np.arange(bays + 1) * bay_height
+    nodes = np.column_stack([np.tile(xy, (len(levels), 1)), np.repeat(levels, len(xy))])
+    grid = np.arange(n * n).reshape(n, n)
+    plan = np.vstack([np.column_stack([grid[:-1].ravel(), grid[1:].ravel()]),
+                      np.column_stack([grid[:, :-1].ravel(), grid[:, 1:].ravel()])])
+    per_level = len(xy)
+    elements = []
+    for level in range(bays + 1):
+        base = level * per_level
+        elements.append(plan + base)
+        if level < bays:
+            top = base + per_level
+            elements.append(np.column_stack([np.arange(per_level) + base, np.arange(per_level) + top]))
+            elements.append(np.column_stack([plan[:, 0] + base, plan[:, 1] + top]))
+    model = FrameModel(nodes, np.vstack(elements), section, material)
+    return model.fix_below(0.0)
+
+
+if __name__ == "__main__":
+    # Uso: python frame_fe.py [elementos_objetivo] [direct|cg] [celdas]
+    target = int(float(sys.argv[1])) if len(sys.argv) > 1 else 100_000
+    solver = sys.argv[2] if len(sys.argv) > 2 else "direct"
+    cells = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+
+    # Torre de celosía sintética: (celdas+1)² montantes, ~target elementos
+    per_bay = (cells + 1) ** 2 + 4 * cells * (cells + 1)
+    tower = lattice_tower(max(1, target // per_bay), cells, width=4.0, bay_height=0.1)
+    start = time.perf_counter()
+    K = tower.stiffness_matrix()
+    assembled = time.perf_counter() - start
+    tip = np.nonzero(tower.nodes[:, 2] == tower.nodes[:, 2].max())[0]
+    loads = np.zeros((len(tower.nodes), 6))
+    loads[tip, 0] = 10e3 / len(tip)
+    start = time.perf_counter()
+    result = tower.solve(loads, solver=solver, stiffness=K)
+    solved = time.perf_counter() - start
+    height = tower.nodes[:, 2].max()
+    legs = tower.fixed.any(axis=1)
+    inertia = (np.sum(tower.nodes[legs, 0] ** 2) * tower.sections[0, A])
+    print(f"Torre de celosía: {len(tower.elements)} elementos, {tower.n_dof} GDL, nnz {K.nnz}; "
+          f"ensamblaje {assembled:.2f} s, solución ({solver}) {solved:.2f} s")
+    print(f"  10 kN lateral en la punta ({height:.0f} m): {result.displacements[tip, 0].mean():.3f} m "
+          f"(viga equivalente PL³/3EI: {10e3 * height ** 3 / (3 * tower.material[0, 0] * inertia):.3f} m)")
+
+    cases = launch_load_cases()
+    # Modelos de ejes extraídos de los constructores del repositorio, empotrados en su base
+    python_files = os.path.join(REPO_ROOT, "SpaceShip", "Files", "python_files")
+    alien = import_script(os.path.join(python_files, "AlienSpaceCraft.py"))
+    alien_ship = import_script(os.path.join(python_files, "AlienSpaceShip2.py"))
+    station = import_script(os.path.join(REPO_ROOT, "SpaceCraft_04", "special", "python", "Estacion_espacial_one.py"))
+    ship = import_script(os.path.join(REPO_ROOT, "Rocket", "Python_libraries", "Pannels_antennaSolarParker_render.py"))
+    builders = [("create_launch_tower", alien.create_launch_tower()),
+                ("create_structural_arm", station.create_structural_arm()),
+                ("create_cross_tubes", alien_ship.create_cross_tubes()),
+                ("create_spine_structure", ship.create_spine_structure())]
+    for name, meshes in builders:
+        model = FrameModel.from_meshes(meshes, element_length=0.25)
+        model.fix_below(model.nodes[:, 2].min() + 1e-6)
+        results = model.solve([model.inertial_loads(v) for _, v in cases])
+        worst = max(results, key=lambda r: r.stresses().max())
+        print(f"  {name:<24} {len(model.elements):4d} elementos, {len(worst.floating):3d} nodos sin apoyo, "
+              f"desplazamiento máx {worst.max_displacement() * 1000:8.3f} mm, tensión máx "
+              f"{worst.stresses().max() / 1e6:7.2f} MPa")
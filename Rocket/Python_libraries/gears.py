@@ -0,0 +1,277 @@
+# gears.py
+# Engranajes de evolvente rectos y helicoidales generados directamente como arrays de vértices y caras
+# (módulo, número de dientes, ángulo de presión, ángulo de hélice), relación de contacto y rigidez de
+# engrane variable en el ciclo (ISO 6336 + longitud de líneas de contacto), y trenes de engranajes para
+# MecanismosMecanicoEngranaje.stl de Solar_parker/STL_files, que está vacío.
+# Geometría según "Basic Gear Terminology and Calculation" (KHK) en Solar_parker/STL_files.
+
+import sys
+import time
+
+import numpy as np
+import trimesh
+
+from assembly import Assembly
+
+ADDENDUM = 1.0          # en módulos
+DEDENDUM = 1.25
+FLANK_POINTS = 10
+TIP_POINTS = 4
+ROOT_POINTS = 6
+TWIST_STEP = np.radians(3.0)   # giro máximo entre capas de un engranaje helicoidal
+EDGE_STIFFNESS_RATIO = 0.6     # rigidez de un par en los extremos del segmento de engrane / en el centro
+STIFFNESS_CM, STIFFNESS_CR, STIFFNESS_CB = 0.8, 1.0, 1.0
+GEAR_COLOR = [184, 115, 51, 255]   # Cobre
+
+
+def involute(alpha):
+    return np.tan(alpha) - alpha
+
+
+def inverse_involute(value, iterations=8):
+    """Pressure angle whose involute function equals value (Newton from Cheng's start)"""
+    alpha = np.cbrt(3 * value) - 0.2 * value
+    for _ in range(iterations):
+        alpha = alpha - (involute(alpha) - value) / np.tan(alpha) ** 2
+    return alpha
+
+
+# ----------------------------
+# ENGRANAJE
+# ----------------------------
+
+class Gear:
+    """Involute spur (helix_angle 0) or helical gear; lengths in m, angles in degrees, hand +1 right / -1 left"""
+
+    def __init__(self, module, teeth, width, pressure_angle=20.0, helix_angle=0.0, profile_shift=0.0,
+                 bore=None, hand=1):
+        self.module = float(module)
+        self.teeth = int(teeth)
+        self.width = float(width)
+        self.pressure_angle = np.radians(pressure_angle)
+        self.helix_angle = np.radians(helix_angle)
+        self.profile_shift = float(profile_shift)
+        self.hand = hand
+        self.bore = 0.25 * self.root_radius if bore is None else float(bore)
+
+    @property
+    def transverse_module(self):
+        return self.module / np.cos(self.helix_angle)
+
+    @property
+    def transverse_pressure_angle(self):
+        return np.arctan(np.tan(self.pressure_angle) / np.cos(self.helix_angle))
+
+    @property
+    def pitch_radius(self):
+        return self.teeth * self.transverse_module / 2
+
+    @property
+    def base_radius(self):
+        return self.pitch_radius * np.cos(self.transverse_pressure_angle)
+
+    @property
+    def tip_radius(self):
+        return self.pitch_radius + (ADDENDUM + self.profile_shift) * self.module
+
+    @property
+    def root_radius(self):
+        return self.pitch_radius - (DEDENDUM - self.profile_shift) * self.module
+
+    @property
+    def virtual_teeth(self):
+        """Equivalent spur tooth count z / cos³β used by ISO 6336"""
+        return self.teeth / np.cos(self.helix_angle) ** 3
+
+    def half_tooth_angle(self, radius):
+        """Half the angular tooth thickness at radius (transverse section)"""
+        s = self.transverse_module * (np.pi / 2 + 2 * self.profile_shift * np.tan(self.pressure_angle))
+        alpha = np.arccos(np.clip(self.base_radius / radius, -1.0, 1.0))
+        return s / (2 * self.pitch_radius) + involute(self.transverse_pressure_angle) - involute(alpha)
+
+    def profile(self):
+        """Polar outline (radius, angle) of the transverse section, angle increasing, one tooth centred on +x.
+        Below the base circle the flank continues radially down to the root (no trochoid fillet)"""
+        start = max(self.base_radius, self.root_radius)
+        r = np.linspace(start, self.tip_radius, FLANK_POINTS)
+        psi = self.half_tooth_angle(r)
+        tip = np.linspace(-psi[-1], psi[-1], TIP_POINTS + 2)[1:-1]
+        pitch = 2 * np.pi / self.teeth
+        root_angle = psi[0]
+        gap = np.linspace(root_angle, pitch - root_angle, ROOT_POINTS + 2)[1:-1]
+        radial = [self.root_radius] if self.root_radius < start else []
+        radius = np.concatenate([radial, r, np.full(TIP_POINTS, self.tip_radius), r[::-1], radial,
+                                 np.full(ROOT_POINTS, self.root_radius)])
+        angle = np.concatenate([-root_angle * np.ones(len(radial)), -psi, tip, psi[::-1],
+                                root_angle * np.ones(len(radial)), gap])
+        radius = np.tile(radius, self.teeth)
+        angle = (angle[None, :] + pitch * np.arange(self.teeth)[:, None]).ravel()
+        return radius, angle
+
+    def layers(self):
+        twist = self.width * np.tan(self.helix_angle) / self.pitch_radius
+        return max(2, int(np.ceil(abs(twist) / TWIST_STEP)) + 1)
+
+    def arrays(self, rotation=0.0, center=(0.0, 0.0, 0.0)):
+        """(vertices (V, 3), faces (F, 3)) of the closed gear body with its bore, axis along z"""
+        radius, angle = self.profile()
+        n, layers = len(radius), self.layers()
+        z = np.linspace(0.0, self.width, layers)
+        twist = self.hand * z * np.tan(self.helix_angle) / self.pitch_radius
+        theta = angle[None, :] + twist[:, None] + rotation                  # (L, n)
+        outer = np.stack([radius * np.cos(theta), radius * np.sin(theta), np.broadcast_to(z[:, None], theta.shape)],
+                         axis=-1).reshape(-1, 3)
+        cap_theta = theta[[0, -1]]
+        inner = np.stack([self.bore * np.cos(cap_theta), self.bore * np.sin(cap_theta),
+                          np.broadcast_to(z[[0, -1], None], cap_theta.shape)], axis=-1).reshape(-1, 3)
+        vertices = np.vstack([outer, inner]) + np.asarray(center, dtype=float)
+
+        i = np.arange(n)
+        j = (i + 1) % n
+
+        def strip(a, b):
+            """Quads a[i] a[j] b[j] b[i] split in two triangles"""
+            return np.concatenate([np.column_stack([a[i], a[j], b[j]]), np.column_stack([a[i], b[j], b[i]])])
+
+        rings = np.arange(layers * n).reshape(layers, n)
+        bottom, top = layers * n + i, layers * n + n + i
+        faces = [strip(rings[l], rings[l + 1]) for l in range(layers - 1)]
+        faces += [strip(bottom, rings[0]), strip(rings[-1], top), strip(top, bottom)]
+        return vertices, np.concatenate(faces)
+
+    def mesh(self, rotation=0.0, center=(0.0, 0.0, 0.0)):
+        vertices, faces = self.arrays(rotation, center)
+        mesh = trimesh.Trimesh(vertices, faces, process=False)
+        mesh.visual.face_colors = GEAR_COLOR
+        return mesh
+
+
+# ----------------------------
+# PAR DE ENGRANAJES
+# ----------------------------
+
+class GearPair:
+    """External mesh of two gears with the same normal module, pressure and helix angle (opposite hands)"""
+
+    def __init__(self, driver, driven):
+        self.driver = driver
+        self.driven = driven
+        shift = driver.profile_shift + driven.profile_shift
+        alpha = driver.transverse_pressure_angle
+        self.working_pressure_angle = inverse_involute(
+            2 * np.tan(driver.pressure_angle) * shift / (driver.teeth + driven.teeth) + involute(alpha))
+        self.center_distance = (driver.pitch_radius + driven.pitch_radius) * np.cos(alpha) / \
+            np.cos(self.working_pressure_angle)
+
+    @property
+    def base_pitch(self):
+        """Transverse base pitch (m)"""
+        return np.pi * self.driver.transverse_module * np.cos(self.driver.transverse_pressure_angle)
+
+    @property
+    def path_of_contact(self):
+        g = self.driver, self.driven
+        return (sum(np.sqrt(x.tip_radius ** 2 - x.base_radius ** 2) for x in g)
+                - self.center_distance * np.sin(self.working_pressure_angle))
+
+    @property
+    def contact_ratio(self):
+        """Transverse contact ratio εα"""
+        return self.path_of_contact / self.base_pitch
+
+    @property
+    def overlap_ratio(self):
+        """Face overlap ratio εβ = b sinβ / (π m)"""
+        width = min(self.driver.width, self.driven.width)
+        return width * np.sin(self.driver.helix_angle) / (np.pi * self.driver.module)
+
+    @property
+    def total_contact_ratio(self):
+        return self.contact_ratio + self.overlap_ratio
+
+    def single_stiffness(self):
+        """Single-pair stiffness c' per unit face width (N/m²), ISO 6336-1 method B"""
+        z1, z2 = self.driver.virtual_teeth, self.driven.virtual_teeth
+        x1, x2 = self.driver.profile_shift, self.driven.profile_shift
+        q = (0.04723 + 0.15551 / z1 + 0.25791 / z2 - 0.00635 * x1 - 0.11654 * x1 / z1 - 0.00193 * x2
+             - 0.24188 * x2 / z2 + 0.00529 * x1 ** 2 + 0.00182 * x2 ** 2)
+        c = STIFFNESS_CM * STIFFNESS_CR * STIFFNESS_CB * np.cos(self.driver.helix_angle) / q
+        return c * 1e9     # N/(mm·µm) -> N/m²
+
+    def mean_stiffness(self):
+        """ISO 6336 mean mesh stiffness cγ b = c' (0.75 εα + 0.25) b (N/m)"""
+        width = min(self.driver.width, self.driven.width)
+        return self.single_stiffness() * (0.75 * self.contact_ratio + 0.25) * width
+
+    def mesh_stiffness(self, samples=256, slices=64):
+        """Time-varying mesh stiffness over one mesh cycle: (cycle fraction (S,), stiffness N/m (S,)).
+
+        Every face-width slice of every tooth pair in contact adds c' times its length of contact line,
+        weighted by a parabola along the path of contact (EDGE_STIFFNESS_RATIO at its ends); helical contact
+        lines are staggered along the path by b tanβb.
+        """
+        width = min(self.driver.width, self.driven.width)
+        base_helix = np.arctan(np.tan(self.driver.helix_angle) * np.cos(self.driver.transverse_pressure_angle))
+        cycle = np.arange(samples) / samples
+        w = (np.arange(slices) + 0.5) / slices * width
+        length = self.path_of_contact
+        reach = int(np.ceil(self.total_contact_ratio)) + 1
+        pairs = np.arange(-reach, reach + 1)
+        s = ((cycle[:, None, None] + pairs[None, :, None]) * self.base_pitch
+             + w[None, None, :] * np.tan(base_helix))                        # (S, J, W)
+        u = s / length
+        shape = 1 - (1 - EDGE_STIFFNESS_RATIO) * (2 * u - 1) ** 2
+        in_contact = (u >= 0) & (u <= 1)
+        line = width / slices / np.cos(base_helix)
+        stiffness = self.single_stiffness() * line * np.where(in_contact, shape, 0.0).sum(axis=(1, 2))
+        return cycle, stiffness
+
+
+def gear_train(teeth, module, width, pressure_angle=20.0, helix_angle=0.0):
+    """Gears in a row along x, each meshing with the next, phased so the teeth interleave.
+    Returns (gears, pairs, poses (rotation, centre) per gear)"""
+    gears = [Gear(module, z, width, pressure_angle, helix_angle, hand=1 if k % 2 == 0 else -1)
+             for k, z in enumerate(teeth)]
+    pairs = [GearPair(a, b) for a, b in zip(gears[:-1], gears[1:])]
+    poses = [(0.0, np.zeros(3))]
+    for pair, gear in zip(pairs, gears[1:]):
+        rotation, center = poses[-1]
+        previous = pair.driver
+        # Los dientes del engranaje anterior en +x caen en los huecos del siguiente en -x
+        pitch_arc = np.pi * previous.transverse_module
+        theta = np.pi - (previous.pitch_radius * rotation + pitch_arc / 2) / gear.pitch_radius
+        poses.append((theta, center + [pair.center_distance, 0.0, 0.0]))
+    return gears, pairs, poses
+
+
+if __name__ == "__main__":
+    # Uso: python gears.py [salida.stl]
+    output = sys.argv[1] if len(sys.argv) > 1 else "MecanismosMecanicoEngranaje.stl"
+
+    for helix in (0.0, 20.0):
+        pair = GearPair(Gear(0.002, 20, 0.02, helix_angle=helix), Gear(0.002, 40, 0.02, helix_angle=helix, hand=-1))
+        cycle, k = pair.mesh_stiffness()
+        print(f"β = {helix:4.1f}°: a = {pair.center_distance * 1000:.2f} mm, εα = {pair.contact_ratio:.3f}, "
+              f"εβ = {pair.overlap_ratio:.3f}, rigidez {k.min() / 1e6:.0f}-{k.max() / 1e6:.0f} N/µm "
+              f"(media {k.mean() / 1e6:.0f}, ISO cγ {pair.mean_stiffness() / 1e6:.0f})")
+
+    # Lote de engranajes para las piezas de mecanismos
+    rng = np.random.default_rng(0)
+    batch = [Gear(m, z, 10 * m, helix_angle=b) for m, z, b in
+             zip(rng.choice([0.0005, 0.001, 0.002], 200), rng.integers(12, 80, 200), rng.choice([0.0, 15.0, 25.0], 200))]
+    start = time.perf_counter()
+    arrays = [gear.arrays() for gear in batch]
+    elapsed = time.perf_counter() - start
+    faces = sum(len(f) for _, f in arrays)
+    print(f"{len(batch)} engranajes ({faces} caras) en {elapsed * 1000:.0f} ms: "
+          f"{elapsed / len(batch) * 1000:.2f} ms por engranaje")
+
+    # Tren de tres etapas para MecanismosMecanicoEngranaje.stl
+    gears, pairs, poses = gear_train([18, 36, 24, 48], 0.0015, 0.01, helix_angle=15.0)
+    train = Assembly.from_meshes([g.mesh(rotation, center) for g, (rotation, center) in zip(gears, poses)],
+                                 [f"mechanisms/gear_{k}" for k in range(len(gears))])
+    ratio = np.prod([p.driven.teeth / p.driver.teeth for p in pairs])
+    print(f"Tren {[g.teeth for g in gears]}: relación {ratio:.1f}, εγ por etapa "
+          f"{[round(float(p.total_contact_ratio), 2) for p in pairs]}, estanco {all(m.is_watertight for m in train.meshes)}")
+    train.to_mesh().export(output)
+    print(f"Guardado {output}")
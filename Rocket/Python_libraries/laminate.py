@@ -0,0 +1,347 @@
+# laminate.py
+# Teoría clásica de laminados (CLT) vectorizada: matrices ABD de miles de apilados a la vez a partir de la
+# tabla de fibras de carbono de Composites_simulation.py, e índices de fallo Tsai-Wu y Hashin para todos
+# los casos de carga. Pensado para barridos de optimización (capa de kevlar de create_advanced_fuselage).
+
+import itertools
+import sys
+import time
+
+import numpy as np
+
+# Fabricante, tipo, resistencia a tracción (GPa), módulo (GPa), deformación (%), densidad (g/cm³)
+# (misma tabla que Composites_simulation.py, más la aramida del revestimiento de kevlar)
+FIBERS = {
+    "T-50": ("Amoco", "PAN", 2.90, 300, 1.61, 1.81),
+    "T-40": ("Amoco", "PAN", 5.65, 290, 1.88, 1.81),
+    "Celion GY-70": ("BASF", "PAN", 8.4, 186, 0.30, 1.90),
+    "34-700": ("Grafil", "PAN", 4.5, 234, 1.9, 1.80),
+    "IM6": ("Hercules", "PAN", 5.1, 303, 1.7, 1.74),
+    "M40J": ("Toray", "PAN", 4.41, 377, 1.2, 1.79),
+    "M60J": ("Toray", "PAN", 3.90, 588, 0.9, 1.93),
+    "P-120": ("Amoco", "Pitch", 2.37, 827, 0.30, 2.18),
+    "G-E120": ("DuPont", "Pitch", 3.10, 827, 0.48, 2.14),
+    "NT-60": ("Mitsubishi", "Pitch", 3.0, 595, 0.7, 2.10),
+    "Kevlar 49": ("DuPont", "Aramid", 3.6, 131, 2.8, 1.44),
+}
+
+# Propiedades de la fibra que la tabla no da, por tipo: E2 (GPa), G12 (GPa), ν12, Xc/Xt de la lámina
+FIBER_TYPE = {
+    "PAN": (15.0, 20.0, 0.20, 0.60),
+    "Pitch": (5.5, 10.0, 0.20, 0.30),
+    "Aramid": (5.5, 2.9, 0.36, 0.20),
+}
+
+# Matriz epoxi: E (GPa), ν, densidad (g/cm³); resistencias de lámina dominadas por la matriz (MPa)
+EPOXY = (3.5, 0.35, 1.20)
+MATRIX_STRENGTH = {"Yt": 50.0, "Yc": 200.0, "S": 70.0}
+FIBER_VOLUME = 0.60
+PLY_THICKNESS = 0.125e-3     # m
+
+# Columnas de la tabla de láminas
+E1, E2, G12, NU12, XT, XC, YT, YC, S12, RHO = range(10)
+EVAL_BUDGET = 1 << 24        # evaluaciones de lámina (apilado x caso x lámina x cara) por bloque
+
+
+# ----------------------------
+# LÁMINAS (MICROMECÁNICA)
+# ----------------------------
+
+def _halpin_tsai(fiber, matrix, vf, xi):
+    eta = (fiber / matrix - 1) / (fiber / matrix + xi)
+    return matrix * (1 + xi * eta * vf) / (1 - eta * vf)
+
+
+def ply_properties(fiber, vf=FIBER_VOLUME, matrix=EPOXY, strength=None):
+    """Row (E1, E2, G12 in Pa, ν12, Xt, Xc, Yt, Yc, S in Pa, density kg/m³) of a unidirectional ply.
+
+    Rule of mixtures along the fibre, Halpin-Tsai across it; fibre-direction strengths from the table
+    tensile strength, matrix-dominated strengths from MATRIX_STRENGTH.
+    """
+    _, kind, tensile, modulus, _, density = FIBERS[fiber]
+    e2f, g12f, nu12f, compression = FIBER_TYPE[kind]
+    em, num, rhom = matrix
+    gm = em / (2 * (1 + num))
+    strength = MATRIX_STRENGTH if strength is None else strength
+    xt = vf * tensile * 1e3
+    return np.array([
+        (vf * modulus + (1 - vf) * em) * 1e9,
+        _halpin_tsai(e2f, em, vf, 2.0) * 1e9,
+        _halpin_tsai(g12f, gm, vf, 1.0) * 1e9,
+        vf * nu12f + (1 - vf) * num,
+        xt * 1e6, compression * xt * 1e6,
+        strength["Yt"] * 1e6, strength["Yc"] * 1e6, strength["S"] * 1e6,
+        (vf * density + (1 - vf) * rhom) * 1e3,
+    ])
+
+
+def ply_table(fibers=None, vf=FIBER_VOLUME):
+    """(names, (M, 10) table) for a list of fibres (all of FIBERS by default)"""
+    names = list(FIBERS) if fibers is None else list(fibers)
+    return names, np.array([ply_properties(f, vf) for f in names])
+
+
+def reduced_stiffness(table):
+    """(M, 3, 3) plane-stress stiffness Q of every ply material"""
+    e1, e2, g12, nu12 = table[:, E1], table[:, E2], table[:, G12], table[:, NU12]
+    nu21 = nu12 * e2 / e1
+    d = 1 - nu12 * nu21
+    Q = np.zeros((len(table), 3, 3))
+    Q[:, 0, 0] = e1 / d
+    Q[:, 1, 1] = e2 / d
+    Q[:, 0, 1] = Q[:, 1, 0] = nu12 * e2 / d
+    Q[:, 2, 2] = g12
+    return Q
+
+
+def rotated_stiffness(Q, theta):
+    """Q̄(θ) for every ply from the stiffness invariants; Q (…, 3, 3), theta in radians broadcastable"""
+    q11, q22, q12, q66 = Q[..., 0, 0], Q[..., 1, 1], Q[..., 0, 1], Q[..., 2, 2]
+    u1 = (3 * q11 + 3 * q22 + 2 * q12 + 4 * q66) / 8
+    u2 = (q11 - q22) / 2
+    u3 = (q11 + q22 - 2 * q12 - 4 * q66) / 8
+    u4 = (q11 + q22 + 6 * q12 - 4 * q66) / 8
+    u5 = (q11 + q22 - 2 * q12 + 4 * q66) / 8
+    c2, s2, c4, s4 = np.cos(2 * theta), np.sin(2 * theta), np.cos(4 * theta), np.sin(4 * theta)
+    Qb = np.empty(np.broadcast_shapes(q11.shape, theta.shape) + (3, 3))
+    Qb[..., 0, 0] = u1 + u2 * c2 + u3 * c4
+    Qb[..., 1, 1] = u1 - u2 * c2 + u3 * c4
+    Qb[..., 0, 1] = Qb[..., 1, 0] = u4 - u3 * c4
+    Qb[..., 2, 2] = u5 - u3 * c4
+    Qb[..., 0, 2] = Qb[..., 2, 0] = u2 * s2 / 2 + u3 * s4
+    Qb[..., 1, 2] = Qb[..., 2, 1] = u2 * s2 / 2 - u3 * s4
+    return Qb
+
+
+# ----------------------------
+# LAMINADOS
+# ----------------------------
+
+class Layups:
+    """L stacks of up to P plies, bottom to top: angles (deg), material index and thickness (m).
+
+    Shorter stacks are padded with zero-thickness plies, so thousands of layups of different length
+    are handled as one array.
+    """
+
+    def __init__(self, angles, materials=0, thickness=PLY_THICKNESS):
+        self.angles = np.atleast_2d(np.asarray(angles, dtype=float))
+        shape = self.angles.shape
+        self.materials = np.broadcast_to(np.asarray(materials, dtype=np.int64), shape).copy()
+        self.thickness = np.broadcast_to(np.asarray(thickness, dtype=float), shape).copy()
+        self.thickness[np.isnan(self.angles)] = 0.0
+        self.angles = np.nan_to_num(self.angles)
+
+    @classmethod
+    def from_lists(cls, stacks, materials=0, thickness=PLY_THICKNESS):
+        """Ragged list of angle lists -> padded Layups (NaN marks the padding)"""
+        width = max(len(s) for s in stacks)
+        angles = np.full((len(stacks), width), np.nan)
+        for i, s in enumerate(stacks):
+            angles[i, :len(s)] = s
+        return cls(angles, materials, thickness)
+
+    def __len__(self):
+        return len(self.angles)
+
+    def __getitem__(self, index):
+        angles = self.angles[index].copy()
+        angles[self.thickness[index] == 0] = np.nan
+        return Layups(angles, self.materials[index], self.thickness[index])
+
+    def interfaces(self):
+        """(L, P + 1) z of the ply interfaces, measured from the mid-plane"""
+        z = np.concatenate([np.zeros((len(self), 1)), np.cumsum(self.thickness, axis=1)], axis=1)
+        return z - z[:, -1:] / 2
+
+    def areal_mass(self, table):
+        """kg/m² per layup"""
+        return (self.thickness * table[self.materials, RHO]).sum(axis=1)
+
+    def abd(self, table):
+        """(L, 6, 6) [[A, B], [B, D]] and the (L, P, 3, 3) rotated ply stiffness"""
+        Qb = rotated_stiffness(reduced_stiffness(table)[self.materials], np.radians(self.angles))
+        z = self.interfaces()
+        h1, h2, h3 = np.diff(z, axis=1), np.diff(z ** 2, axis=1) / 2, np.diff(z ** 3, axis=1) / 3
+        A = np.einsum("lp,lpij->lij", h1, Qb)
+        B = np.einsum("lp,lpij->lij", h2, Qb)
+        D = np.einsum("lp,lpij->lij", h3, Qb)
+        return np.block([[A, B], [B, D]]), Qb
+
+
+def _stress_operators(layups, table):
+    """(L, P, 2, 3, 6) matrices mapping [ε0, κ] to material-axis stresses at the bottom and top of each ply"""
+    t = np.radians(layups.angles)
+    c, s = np.cos(t), np.sin(t)
+    T = np.stack([np.stack([c * c, s * s, c * s], -1),
+                  np.stack([s * s, c * c, -c * s], -1),
+                  np.stack([-2 * c * s, 2 * c * s, c * c - s * s], -1)], -2)        # deformaciones a ejes 1-2
+    QT = reduced_stiffness(table)[layups.materials] @ T                               # (L, P, 3, 3)
+    z = layups.interfaces()
+    surfaces = np.stack([z[:, :-1], z[:, 1:]], axis=-1)                               # (L, P, 2)
+    return np.concatenate([np.broadcast_to(QT[:, :, None], QT.shape[:2] + (2, 3, 3)),
+                           QT[:, :, None] * surfaces[..., None, None]], axis=-1)
+
+
+def _stresses(layups, table, loads):
+    """(L, P, 2, 3, C) material-axis stresses, one batched matmul for all plies and load cases"""
+    abd, _ = layups.abd(table)
+    strains = np.linalg.inv(abd) @ np.asarray(loads, dtype=float).T                  # (L, 6, C)
+    G = _stress_operators(layups, table)
+    L, P = G.shape[:2]
+    return (G.reshape(L, P * 6, 6) @ strains).reshape(L, P, 2, 3, -1)
+
+
+def ply_stresses(layups, table, loads):
+    """Material-axis stresses (L, C, P, 2, 3) at the bottom and top of every ply for loads (C, 6)
+    [Nx, Ny, Nxy (N/m), Mx, My, Mxy (N)]"""
+    return _stresses(layups, table, np.atleast_2d(loads)).transpose(0, 4, 1, 2, 3)
+
+
+# ----------------------------
+# CRITERIOS DE FALLO
+# ----------------------------
+
+def tsai_wu(stress, strength, axis=-1):
+    """Failure index 1/R of Tsai-Wu, R being the load multiplier that reaches the envelope.
+
+    stress has the (σ1, σ2, τ12) components along axis; strength the (Xt, Xc, Yt, Yc, S) along the same axis.
+    """
+    xt, xc, yt, yc, s = (np.take(strength, k, axis) for k in range(5))
+    f1, f2 = 1 / xt - 1 / xc, 1 / yt - 1 / yc
+    f11, f22, f66 = 1 / (xt * xc), 1 / (yt * yc), 1 / s ** 2
+    f12 = -0.5 * np.sqrt(f11 * f22)
+    s1, s2, s6 = (np.take(stress, k, axis) for k in range(3))
+    a = f11 * s1 ** 2 + f22 * s2 ** 2 + f66 * s6 ** 2 + 2 * f12 * s1 * s2
+    b = f1 * s1 + f2 * s2
+    # a R² + b R = 1 -> 1/R = (b + sqrt(b² + 4a)) / 2
+    return (b + np.sqrt(b * b + 4 * a)) / 2
+
+
+HASHIN_MODES = ("fibra_traccion", "fibra_compresion", "matriz_traccion", "matriz_compresion")
+
+
+def hashin(stress, strength, axis=-1):
+    """(index, mode) of the 2D Hashin criteria; index >= 1 means failure"""
+    xt, xc, yt, yc, s = (np.take(strength, k, axis) for k in range(5))
+    s1, s2, s6 = (np.take(stress, k, axis) for k in range(3))
+    shear = (s6 / s) ** 2
+    fiber = np.where(s1 >= 0, (s1 / xt) ** 2 + shear, (s1 / xc) ** 2)
+    matrix = np.where(s2 >= 0, (s2 / yt) ** 2 + shear,
+                      (s2 / (2 * s)) ** 2 + ((yc / (2 * s)) ** 2 - 1) * s2 / yc + shear)
+    mode = np.where(fiber >= matrix, np.where(s1 >= 0, 0, 1), np.where(s2 >= 0, 2, 3))
+    return np.maximum(fiber, matrix), mode
+
+
+class FailureResult:
+    """Worst ply per (layup, load case): Tsai-Wu and Hashin indices, critical ply and Hashin mode"""
+
+    def __init__(self, tsai_wu, tsai_wu_ply, hashin, hashin_ply, hashin_mode):
+        self.tsai_wu = tsai_wu
+        self.tsai_wu_ply = tsai_wu_ply
+        self.hashin = hashin
+        self.hashin_ply = hashin_ply
+        self.hashin_mode = hashin_mode
+
+    def worst(self):
+        """Worst index over load cases per layup (both criteria)"""
+        return np.maximum(self.tsai_wu.max(axis=1), self.hashin.max(axis=1))
+
+    def margin(self):
+        """Margin of safety per layup from the worst Tsai-Wu strength ratio: R - 1"""
+        return 1 / self.tsai_wu.max(axis=1) - 1
+
+
+def evaluate_failure(layups, table, loads, budget=EVAL_BUDGET):
+    """Tsai-Wu and Hashin for every layup x load case, in blocks of layups that fit the budget"""
+    loads = np.atleast_2d(loads)
+    n_cases, n_plies = len(loads), layups.angles.shape[1]
+    block = max(1, budget // (n_cases * n_plies * 2))
+    out = {k: [] for k in ("tw", "twp", "h", "hp", "hm")}
+    for lo in range(0, len(layups), block):
+        part = layups[lo:lo + block]
+        stress = _stresses(part, table, loads)                             # (l, P, 2, 3, C)
+        strength = table[part.materials][..., XT:S12 + 1][:, :, None, :, None]
+        empty = (part.thickness == 0)[:, :, None, None]
+        tw = np.where(empty, 0.0, tsai_wu(stress, strength, axis=3)).max(axis=2)   # peor cara: (l, P, C)
+        h, mode = hashin(stress, strength, axis=3)
+        h = np.where(empty, 0.0, h)
+        face = h.argmax(axis=2)[:, :, None]
+        h, mode = np.take_along_axis(h, face, 2)[:, :, 0], np.take_along_axis(mode, face, 2)[:, :, 0]
+        ply = h.argmax(axis=1)[:, None]
+        out["tw"].append(tw.max(axis=1))
+        out["twp"].append(tw.argmax(axis=1))
+        out["h"].append(np.take_along_axis(h, ply, 1)[:, 0])
+        out["hp"].append(ply[:, 0])
+        out["hm"].append(np.take_along_axis(mode, ply, 1)[:, 0])
+    return FailureResult(*(np.concatenate(out[k]) for k in ("tw", "twp", "h", "hp", "hm")))
+
+
+# ----------------------------
+# BARRIDO DE APILADOS SIMÉTRICOS
+# ----------------------------
+
+def symmetric_layups(angle_set, half_plies, materials=0, thickness=PLY_THICKNESS):
+    """Every symmetric stack [half | reversed half] with 1..half_plies plies per half from angle_set"""
+    stacks = []
+    for n in range(1, half_plies + 1):
+        for half in itertools.product(angle_set, repeat=n):
+            stacks.append(list(half) + list(half[::-1]))
+    return Layups.from_lists(stacks, materials, thickness)
+
+
+def cylinder_line_loads(mass, radius, load_factors, bending_arm=0.0, pressure=0.0):
+    """(C, 6) membrane loads on a cylindrical skin carrying mass under (axial g, lateral g) factors:
+    axial compression spread over the circumference, the peak bending line load at bending_arm and the
+    hoop/axial loads of an internal pressure (Pa)"""
+    g0 = 9.80665
+    loads = []
+    for axial, lateral in load_factors:
+        nx = -axial * mass * g0 / (2 * np.pi * radius) + pressure * radius / 2
+        bending = lateral * mass * g0 * bending_arm / (np.pi * radius ** 2)
+        shear = lateral * mass * g0 / (np.pi * radius)
+        loads.append([nx - bending, pressure * radius, shear, 0.0, 0.0, 0.0])
+    return np.array(loads)
+
+
+if __name__ == "__main__":
+    # Uso: python laminate.py [láminas_por_mitad] [fibra]
+    half_plies = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    fiber = sys.argv[2] if len(sys.argv) > 2 else "Kevlar 49"
+
+    names, table = ply_table()
+    print("Láminas unidireccionales (Vf = 0.60, epoxi):")
+    for name, row in zip(names, table):
+        print(f"  {name:<13} E1 {row[E1] / 1e9:6.1f} GPa  E2 {row[E2] / 1e9:5.1f} GPa  G12 {row[G12] / 1e9:4.1f} GPa  "
+              f"Xt {row[XT] / 1e6:6.0f} MPa  ρ {row[RHO]:6.0f} kg/m³")
+
+    # Revestimiento de kevlar de create_advanced_fuselage (radio FUSELAGE_RADIUS + 0.4) en la sección media,
+    # cargado con la masa que tiene encima (mitad de la total de mass_properties.py) bajo la envolvente Falcon 9,
+    # con y sin la presión de cabina
+    import Pannels_antennaSolarParker_render as ship
+    from frame_fe import FALCON9_LOAD_FACTORS
+    radius, mass_above, arm = ship.FUSELAGE_RADIUS + 0.4, 13_500.0, ship.FUSELAGE_LENGTH / 4
+    factors = list(FALCON9_LOAD_FACTORS.values())
+    loads = np.vstack([cylinder_line_loads(mass_above, radius, factors, arm),
+                       cylinder_line_loads(mass_above, radius, factors, arm, pressure=101.3e3)])
+    loads = np.vstack([loads, loads * [1, 1, -1, 1, 1, 1]])
+    layups = symmetric_layups([0, 15, 30, 45, 60, 75, 90, -15, -30, -45, -60, -75], half_plies,
+                              materials=names.index(fiber), thickness=0.25e-3)
+    start = time.perf_counter()
+    result = evaluate_failure(layups, table, loads)
+    elapsed = time.perf_counter() - start
+    evaluations = len(layups) * len(loads) * layups.angles.shape[1] * 2
+    print(f"{len(layups)} apilados x {len(loads)} casos: {evaluations / 1e6:.1f} M evaluaciones de lámina "
+          f"en {elapsed:.2f} s ({evaluations / elapsed / 1e6:.1f} M/s)")
+
+    mass_per_area = layups.areal_mass(table)
+    feasible = np.nonzero(result.worst() < 1.0)[0]
+    if len(feasible):
+        best = feasible[np.argmin(mass_per_area[feasible])]
+        stack = layups.angles[best][layups.thickness[best] > 0]
+        case = result.hashin[best].argmax()
+        print(f"Apilado más ligero sin fallo: [{'/'.join(f'{a:g}' for a in stack)}] "
+              f"{mass_per_area[best]:.2f} kg/m², margen Tsai-Wu {result.margin()[best]:+.2f}, "
+              f"Hashin crítico {result.hashin[best, case]:.2f} ({HASHIN_MODES[result.hashin_mode[best, case]]})")
+    else:
+        print("Ningún apilado soporta todos los casos; aumentar láminas_por_mitad")
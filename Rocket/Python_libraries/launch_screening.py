@@ -0,0 +1,214 @@
+# launch_screening.py
+# Cribado de cargas de lanzamiento por componente: factores cuasiestáticos de Falcon 9 (sección 4.3.1
+# de MERLINTEMPERATURECLEAN.txt) más vibración aleatoria con la ecuación de Miles en cada modo de montaje.
+# Las propiedades másicas salen de MassModel; los márgenes de seguridad de todo el ensamblaje y de todas
+# las variantes de diseño se calculan en una sola pasada vectorizada.
+
+import sys
+import time
+
+import numpy as np
+
+from assembly import falcon_parker_assembly
+from frame_fe import FALCON9_LOAD_FACTORS, G0
+from mass_properties import MassModel
+from shell_sizing import MATERIAL_STRENGTH
+
+# Límite elástico y de rotura (Pa) de los materiales de shielding.MATERIAL_DENSITY; agua y vacío no son estructurales
+SCREENING_STRENGTH = {
+    **MATERIAL_STRENGTH,
+    "hdpe": (26e6, 32e6),
+    "boron": (1.0e9, 1.5e9),
+    "tantalum": (170e6, 285e6),
+    "tungsten": (750e6, 980e6),
+}
+
+FS_YIELD, FS_ULTIMATE = 1.25, 1.4     # NASA-STD-5001, estructuras metálicas sin ensayo de calificación
+AMPLIFICATION_Q = 10.0
+SIGMA_LEVEL = 3.0
+
+# GEVS (GSFC-STD-7000) nivel de calificación de componentes: (Hz, g²/Hz), 14.1 Grms
+QUALIFICATION_PSD = np.array([[20.0, 0.026], [50.0, 0.16], [800.0, 0.16], [2000.0, 0.026]])
+ACCEPTANCE_PSD = QUALIFICATION_PSD * [1.0, 0.5]   # -3 dB
+
+# prefijo de componente -> frecuencias de montaje (axial, lateral) en Hz, la primera coincidencia gana;
+# None = estructura primaria, que solo ve los factores cuasiestáticos
+MOUNT_FREQUENCIES = {
+    "structure/": None,
+    "modules/payload_module": (45.0, 20.0),
+    "modules/scientific_module": (60.0, 30.0),
+    "modules/": (60.0, 35.0),
+    "power/": (40.0, 15.0),        # paneles plegados
+    "mechanisms/": (50.0, 20.0),
+    "comms/": (80.0, 40.0),
+    "sensors/": (150.0, 100.0),
+    "propulsion/": (80.0, 40.0),
+    "": (100.0, 50.0),
+}
+
+
+# ----------------------------
+# VIBRACIÓN ALEATORIA
+# ----------------------------
+
+def psd_at(psd, frequency):
+    """Log-log interpolation of a (Hz, g²/Hz) breakpoint table, edge values held outside it"""
+    logf = np.log(psd[:, 0])
+    return np.exp(np.interp(np.log(frequency), logf, np.log(psd[:, 1])))
+
+
+def psd_grms(psd, samples=4096):
+    """Overall Grms of a breakpoint table"""
+    f = np.geomspace(psd[0, 0], psd[-1, 0], samples)
+    return float(np.sqrt(np.trapezoid(psd_at(psd, f), f)))
+
+
+def miles_grms(frequency, psd, q=AMPLIFICATION_Q):
+    """Miles' equation: SDOF response sqrt(π/2 f Q PSD(f)) in g rms"""
+    return np.sqrt(np.pi / 2 * frequency * q * psd_at(psd, frequency))
+
+
+def load_cases(factors=None, frequencies=None, psd=QUALIFICATION_PSD, q=AMPLIFICATION_Q, sigma=SIGMA_LEVEL):
+    """Limit load factors (..., K, 2) = quasi-static (axial, lateral) plus the sigma-level Miles response of
+    each mount mode, added in the direction of the quasi-static load; frequencies is (..., 2), NaN = no mount"""
+    factors = FALCON9_LOAD_FACTORS if factors is None else factors
+    static = np.array(list(factors.values()), dtype=float)                    # (K, 2)
+    if frequencies is None:
+        return static
+    random = np.nan_to_num(sigma * miles_grms(np.asarray(frequencies, dtype=float), psd, q))   # (..., 2)
+    return static + np.where(static < 0, -1.0, 1.0) * random[..., None, :]
+
+
+# ----------------------------
+# MÁRGENES
+# ----------------------------
+
+def interface_sections(assembly, tags):
+    """Equivalent interface of every component at its lowest z (launch axis): a ring of the wall thickness for
+    shells, a solid disc otherwise. Returns (base z, radius, area, second moment of area)"""
+    bounds = np.array([m.bounds for m in assembly.meshes])
+    extent = bounds[:, 1] - bounds[:, 0]
+    radius = np.maximum((extent[:, 0] + extent[:, 1]) / 4, 1e-3)
+    wall = np.array([np.nan if t is None else min(t, r) for (_, t), r in zip(tags, radius)])
+    shell = ~np.isnan(wall)
+    area = np.where(shell, 2 * np.pi * radius * np.nan_to_num(wall), np.pi * radius ** 2)
+    inertia = np.where(shell, np.pi * radius ** 3 * np.nan_to_num(wall), np.pi * radius ** 4 / 4)
+    return bounds[:, 0, 2], radius, area, inertia
+
+
+def margins(mass, arm, radius, area, inertia, strength, factors):
+    """Yield and ultimate margins of safety (..., C, K) of every component for every load case.
+
+    mass, arm (centre-of-mass height over the interface), radius, area, inertia: (..., C);
+    strength: (C, 2) yield/ultimate; factors: (..., C, K, 2) or (K, 2) limit load factors (axial, lateral).
+    """
+    weight = (mass * G0)[..., None]
+    axial = weight * factors[..., 0]
+    lateral = weight * np.abs(factors[..., 1])
+    sigma = np.abs(axial) / area[..., None] + lateral * arm[..., None] * radius[..., None] / inertia[..., None]
+    tau = 2 * lateral / area[..., None]
+    stress = np.sqrt(sigma ** 2 + 3 * tau ** 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        yield_margin = strength[:, 0, None] / (FS_YIELD * stress) - 1
+        ultimate_margin = strength[:, 1, None] / (FS_ULTIMATE * stress) - 1
+    return yield_margin, ultimate_margin
+
+
+class ScreeningResult:
+    """Margin-of-safety table: margins (..., C, K) for the case names; non-structural components are NaN"""
+
+    def __init__(self, names, cases, factors, yield_margin, ultimate_margin):
+        self.names = list(names)
+        self.cases = list(cases)
+        self.factors = factors
+        self.yield_margin = yield_margin
+        self.ultimate_margin = ultimate_margin
+
+    @property
+    def margin(self):
+        """Governing margin (yield or ultimate) per component and case"""
+        return np.fmin(self.yield_margin, self.ultimate_margin)
+
+    def minimum(self):
+        """Lowest margin over the load cases per component"""
+        return np.nanmin(np.where(np.isnan(self.margin), np.inf, self.margin), axis=-1)
+
+    def failures(self):
+        """Names of the components with a negative margin (single design)"""
+        return [name for name, m in zip(self.names, self.minimum()) if m < 0]
+
+    def table(self, prefix=""):
+        """(name, governing case, load factors (axial, lateral), minimum margin) per component, lowest first"""
+        margin = np.where(np.isnan(self.margin), np.inf, self.margin)
+        worst = margin.argmin(axis=-1)
+        factors = np.broadcast_to(self.factors, margin.shape + (2,))
+        rows = [(name, self.cases[k], factors[i, k], margin[i, k])
+                for i, (name, k) in enumerate(zip(self.names, worst)) if name.startswith(prefix)]
+        return sorted(rows, key=lambda row: row[3])
+
+
+class LaunchScreening:
+    """Quasi-static plus random-vibration screening of every component of a MassModel"""
+
+    def __init__(self, model, factors=None, frequencies=None, psd=QUALIFICATION_PSD, q=AMPLIFICATION_Q):
+        self.model = model
+        self.factors = FALCON9_LOAD_FACTORS if factors is None else factors
+        names = model.assembly.names
+        frequencies = MOUNT_FREQUENCIES if frequencies is None else frequencies
+        mounts = [next(f for prefix, f in frequencies.items() if name.startswith(prefix)) for name in names]
+        self.frequencies = np.array([(np.nan, np.nan) if f is None else f for f in mounts], dtype=float)
+        self.psd = psd
+        self.q = q
+
+    def inputs(self):
+        """Per-component arrays of the current MassModel state"""
+        model = self.model
+        base, radius, area, inertia = interface_sections(model.assembly, model.tags)
+        mass = np.array([p.mass for p in model.components])
+        arm = np.maximum(np.array([p.center[2] for p in model.components]) - base, 0.0)
+        strength = np.array([SCREENING_STRENGTH.get(getattr(m, "name", m), (np.nan, np.nan))
+                             if not hasattr(m, "yield_strength") else (m.yield_strength, m.ultimate_strength)
+                             for m, _ in model.tags], dtype=float)
+        return mass, arm, radius, area, inertia, strength
+
+    def run(self, mass_scale=None, frequency_scale=None):
+        """Screen the assembly; mass_scale and frequency_scale (..., C) screen a batch of design variants at once"""
+        mass, arm, radius, area, inertia, strength = self.inputs()
+        if mass_scale is not None:
+            mass = mass * mass_scale
+        frequencies = self.frequencies if frequency_scale is None else \
+            self.frequencies * np.asarray(frequency_scale)[..., None]
+        factors = load_cases(self.factors, frequencies, self.psd, self.q)
+        yield_margin, ultimate_margin = margins(mass, arm, radius, area, inertia, strength, factors)
+        return ScreeningResult(self.model.assembly.names, self.factors, factors, yield_margin, ultimate_margin)
+
+
+if __name__ == "__main__":
+    # Uso: python launch_screening.py [variantes]
+    variants = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    model = MassModel(falcon_parker_assembly())
+    screening = LaunchScreening(model)
+    print(f"PSD de calificación GEVS: {psd_grms(QUALIFICATION_PSD):.1f} Grms, Q = {AMPLIFICATION_Q:.0f}")
+
+    start = time.perf_counter()
+    result = screening.run()
+    print(f"{len(result.names)} componentes x {len(result.cases)} casos en "
+          f"{(time.perf_counter() - start) * 1000:.2f} ms")
+    for prefix in ("modules/payload_module", "modules/scientific_module"):
+        for name, case, (axial, lateral), margin in result.table(prefix):
+            print(f"  {name:<28} {case:<12} n = ({axial:5.1f}, {lateral:5.1f}) g  MS = {margin:8.2f}")
+    print("Peores márgenes:")
+    for name, case, (axial, lateral), margin in result.table()[:5]:
+        print(f"  {name:<28} {case:<12} n = ({axial:5.1f}, {lateral:5.1f}) g  MS = {margin:8.2f}")
+
+    # Variantes de diseño: masas y rigideces de montaje perturbadas, todas en una pasada
+    rng = np.random.default_rng(0)
+    components = len(result.names)
+    mass_scale = rng.uniform(0.8, 1.5, (variants, components))
+    frequency_scale = rng.uniform(0.7, 1.3, (variants, components))
+    start = time.perf_counter()
+    batch = screening.run(mass_scale, frequency_scale)
+    elapsed = time.perf_counter() - start
+    failing = (batch.minimum() < 0).any(axis=-1)
+    print(f"{variants} variantes en {elapsed * 1000:.0f} ms ({variants * components / elapsed / 1e6:.1f} M "
+          f"componentes/s); {failing.sum()} con algún margen negativo")
@@ -0,0 +1,185 @@
+# lidar_sim.py
+# Simulador de barrido LIDAR contra cualquier malla o ensamblaje (p. ej. la estación de atraque).
+# Las direcciones del haz se calculan una vez por sensor; cada trama es un lote de rayos sobre el BVH.
+
+import os
+import sys
+import time
+
+import numpy as np
+
+from assembly import load_assembly
+from ray_caster import RayCaster
+
+STATION_SPEC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "SpaceCraft_04", "special",
+                            "python", "Estacion.py:create_star_trek_station_v2")
+
+
+# ----------------------------
+# SENSOR
+# ----------------------------
+
+class LidarSpec:
+    """Scan pattern and noise model. Sensor axes: x forward, y left, z up.
+
+    precision_mm is the 1-sigma range noise, as in Sensor(type="LIDAR", precision_mm=0.1, range_m=100)
+    of CarbonCarbon.py.
+    """
+
+    def __init__(self, h_fov=60.0, v_fov=30.0, h_res=0.12, v_res=0.12, range_m=100.0, min_range_m=0.3,
+                 precision_mm=0.1, angular_noise_deg=0.0, dropout=0.0):
+        self.h_fov = h_fov
+        self.v_fov = v_fov
+        self.h_res = h_res
+        self.v_res = v_res
+        self.range_m = range_m
+        self.min_range_m = min_range_m
+        self.precision_mm = precision_mm
+        self.angular_noise_deg = angular_noise_deg
+        self.dropout = dropout  # probabilidad de perder un retorno
+        self._beams = None
+
+    @classmethod
+    def from_sensor(cls, sensor, **kwargs):
+        """Spec from a CarbonCarbon.Sensor (or anything with precision_mm / range_m)"""
+        if sensor.precision_mm is not None:
+            kwargs.setdefault("precision_mm", sensor.precision_mm)
+        if sensor.range_m is not None:
+            kwargs.setdefault("range_m", sensor.range_m)
+        return cls(**kwargs)
+
+    @property
+    def shape(self):
+        return (int(round(self.v_fov / self.v_res)) + 1, int(round(self.h_fov / self.h_res)) + 1)
+
+    def beams(self):
+        """(rows * cols, 3) unit directions in sensor axes, row-major from top-left"""
+        if self._beams is None:
+            rows, cols = self.shape
+            az = np.radians(np.linspace(self.h_fov / 2, -self.h_fov / 2, cols))
+            el = np.radians(np.linspace(self.v_fov / 2, -self.v_fov / 2, rows))
+            el, az = np.meshgrid(el, az, indexing="ij")
+            self._beams = np.column_stack([(np.cos(el) * np.cos(az)).ravel(), (np.cos(el) * np.sin(az)).ravel(),
+                                           np.sin(el).ravel()])
+        return self._beams
+
+
+def look_at(position, target, up=(0, 0, 1)):
+    """Pose (position, 3x3 rotation sensor->world) with the sensor x axis pointing at target"""
+    position = np.asarray(position, dtype=float)
+    forward = np.asarray(target, dtype=float) - position
+    forward /= np.linalg.norm(forward)
+    up = np.asarray(up, dtype=float)
+    if abs(forward @ up) > 0.99:
+        up = np.array([0.0, 1.0, 0.0]) if abs(forward[1]) < 0.9 else np.array([1.0, 0.0, 0.0])
+    left = np.cross(up, forward)
+    left /= np.linalg.norm(left)
+    return position, np.column_stack([forward, left, np.cross(forward, left)])
+
+
+def approach_trajectory(start, target, n_frames, stop_distance=5.0):
+    """Straight-line approach poses looking at the target, ending stop_distance from it"""
+    start = np.asarray(start, dtype=float)
+    target = np.asarray(target, dtype=float)
+    direction = (target - start) / np.linalg.norm(target - start)
+    end = target - direction * stop_distance
+    return [look_at(start + (end - start) * f, target) for f in np.linspace(0, 1, n_frames)]
+
+
+# ----------------------------
+# TRAMAS
+# ----------------------------
+
+class LidarFrame:
+    """One scan: valid returns only, in sensor axes (points_world gives them in model axes)"""
+
+    def __init__(self, index, pose, points, ranges, intensity, component, beam, shape):
+        self.index = index
+        self.pose = pose
+        self.points = points          # (N, 3) float32, ejes del sensor
+        self.ranges = ranges          # (N,) m, con ruido
+        self.intensity = intensity    # (N,) coseno de incidencia
+        self.component = component    # (N,) componente impactado
+        self.beam = beam              # (N,) índice del haz en la rejilla
+        self.shape = shape
+
+    def __len__(self):
+        return len(self.points)
+
+    @property
+    def points_world(self):
+        position, rotation = self.pose
+        return self.points.astype(np.float64) @ rotation.T + position
+
+    def range_image(self):
+        """(rows, cols) range image, nan where there was no return"""
+        image = np.full(self.shape[0] * self.shape[1], np.nan, dtype=np.float32)
+        image[self.beam] = self.ranges
+        return image.reshape(self.shape)
+
+    def save(self, filename):
+        np.savez(filename, points=self.points, ranges=self.ranges, intensity=self.intensity,
+                 component=self.component, beam=self.beam, position=self.pose[0], rotation=self.pose[1])
+        return filename
+
+
+class LidarSimulator:
+    """Ray-cast scans of a fixed model; the BVH is built (or loaded from cache) once"""
+
+    def __init__(self, model, spec=None, caster=None, seed=0):
+        self.spec = spec if spec is not None else LidarSpec()
+        self.caster = caster if caster is not None else RayCaster(model)
+        self.rng = np.random.default_rng(seed)
+
+    def scan(self, pose, index=0, processes=1):
+        spec = self.spec
+        position, rotation = pose
+        beams = spec.beams()
+        if spec.angular_noise_deg > 0:
+            beams = beams + self.rng.normal(scale=np.radians(spec.angular_noise_deg), size=beams.shape)
+            beams /= np.linalg.norm(beams, axis=1, keepdims=True)
+        directions = beams @ rotation.T
+
+        hits = self.caster.intersect(position, directions, t_max=spec.range_m, processes=processes)
+        valid = hits.hit & (hits.t >= spec.min_range_m)
+        if spec.dropout > 0:
+            valid &= self.rng.random(len(valid)) >= spec.dropout
+        beam = np.nonzero(valid)[0]
+
+        ranges = hits.t[beam] + self.rng.normal(scale=spec.precision_mm / 1000.0, size=len(beam))
+        normals = self.caster.assembly.face_normals[hits.face[beam]]
+        intensity = np.abs(np.einsum("ij,ij->i", normals, directions[beam]))
+        points = (beams[beam] * ranges[:, None]).astype(np.float32)
+        return LidarFrame(index, pose, points, ranges.astype(np.float32), intensity.astype(np.float32),
+                          hits.component[beam].astype(np.int32), beam, spec.shape)
+
+    def stream(self, poses, processes=1):
+        """Generator of frames, one per pose, so long trajectories never sit in memory at once"""
+        for index, pose in enumerate(poses):
+            yield self.scan(pose, index, processes)
+
+
+if __name__ == "__main__":
+    # Uso: python lidar_sim.py [modelo.stl | script.py:funcion] [n_tramas]
+    spec_arg = sys.argv[1] if len(sys.argv) > 1 else STATION_SPEC
+    n_frames = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    model = load_assembly(spec_arg)
+    center = model.bounds.mean(axis=0)
+    size = np.linalg.norm(model.bounds[1] - model.bounds[0])
+    poses = approach_trajectory(center + np.array([size, 0.3 * size, 0.2 * size]), center, n_frames,
+                                stop_distance=0.6 * size)
+
+    simulator = LidarSimulator(model, LidarSpec(range_m=3 * size))
+    rows, cols = simulator.spec.shape
+    print(f"Modelo: {len(model)} componentes, {len(model.faces)} caras; rejilla {rows}x{cols} = {rows * cols} haces")
+
+    start = time.perf_counter()
+    total = 0
+    for frame in simulator.stream(poses):
+        total += len(frame)
+    elapsed = time.perf_counter() - start
+    print(f"{n_frames} tramas en {elapsed:.2f} s ({n_frames / elapsed:.1f} tramas/s, "
+          f"{rows * cols * n_frames / elapsed / 1e6:.2f} Mrayos/s), {total / n_frames:.0f} puntos por trama")
+    frame.save("lidar_frame_last.npz")
+    print("Última trama guardada en lidar_frame_last.npz")
@@ -0,0 +1,217 @@
+# mass_properties.py
+# Propiedades másicas del ensamblaje a partir de la geometría: volumen, masa, centro de masas y tensor de
+# inercia por componente (integrales de tetraedros con signo para sólidos, de triángulos para cáscaras) y
+# suma por el árbol "/" con el teorema de Steiner.
+# Los momentos geométricos se calculan una vez; cambiar el material de un componente solo recalcula ese componente.
+
+import os
+import sys
+import time
+
+import numpy as np
+
+from assembly import falcon_parker_assembly, import_script
+from render_cache import DiskLRUCache, cache_dir
+from shielding import DEFAULT_TAGS, MATERIAL_DENSITY
+
+MASS_CACHE_DIR = cache_dir("mass_properties")
+PYTHON_FILES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "SpaceShip", "Files",
+                            "python_files")
+
+# Columnas de los momentos geométricos: V, ∫x, ∫y, ∫z, ∫xx, ∫yy, ∫zz, ∫xy, ∫yz, ∫zx
+_PAIRS = ((0, 0), (1, 1), (2, 2), (0, 1), (1, 2), (2, 0))
+
+
+# ----------------------------
+# INTEGRALES GEOMÉTRICAS
+# ----------------------------
+
+def _second_moments(v, s, scale):
+    """Σ_k v_k,i v_k,j + S_i S_j for the 6 (i, j) pairs, times scale"""
+    return np.column_stack([(np.einsum("fk,fk->f", v[:, :, i], v[:, :, j]) + s[:, i] * s[:, j]) * scale
+                            for i, j in _PAIRS])
+
+
+def component_moments(assembly, use_cache=True):
+    """Unit-density moments per component, about each component's bounding-box centre.
+
+    Returns (reference points (C, 3), solid moments (C, 10), shell moments (C, 10)): the solid columns
+    integrate over the enclosed volume (signed tetrahedra to the reference point), the shell columns over
+    the surface area.
+    """
+    key = assembly.fingerprint()
+    cache = DiskLRUCache(MASS_CACHE_DIR) if use_cache else None
+    if cache is not None:
+        cached = cache.get(key, ".npz")
+        if cached is not None:
+            with np.load(cached) as data:
+                return data["reference"], data["solid"], data["shell"]
+
+    n = len(assembly)
+    reference = np.array([m.bounds.mean(axis=0) for m in assembly.meshes])
+    v = assembly.vertices[assembly.faces] - reference[assembly.face_component][:, None, :]   # (F, 3, 3)
+    s = v.sum(axis=1)
+
+    # Tetraedro (referencia, a, b, c): V = det/6, ∫x = V S/4, ∫x_i x_j = V/20 (Σ v_i v_j + S_i S_j)
+    volume = np.einsum("fi,fi->f", v[:, 0], np.cross(v[:, 1], v[:, 2])) / 6.0
+    solid_face = np.column_stack([volume, s * (volume / 4)[:, None], _second_moments(v, s, volume / 20)])
+    # Triángulo: A, ∫x = A S/3, ∫x_i x_j = A/12 (Σ v_i v_j + S_i S_j)
+    area = assembly.face_areas
+    shell_face = np.column_stack([area, s * (area / 3)[:, None], _second_moments(v, s, area / 12)])
+
+    solid = np.column_stack([np.bincount(assembly.face_component, solid_face[:, c], minlength=n) for c in range(10)])
+    shell = np.column_stack([np.bincount(assembly.face_component, shell_face[:, c], minlength=n) for c in range(10)])
+    # Mallas con las normales hacia dentro dan volumen negativo: se invierte el componente entero
+    solid[solid[:, 0] < 0] *= -1
+
+    if cache is not None:
+        tmp = cache.path_for(key, ".build.npz")
+        np.savez(tmp, reference=reference, solid=solid, shell=shell)
+        cache.put(key, tmp, ".npz")
+        os.remove(tmp)
+    return reference, solid, shell
+
+
+# ----------------------------
+# PROPIEDADES MÁSICAS
+# ----------------------------
+
+class MassProperties:
+    """Mass (kg), volume of material (m³), centre of mass (m) and inertia tensor about the centre of mass (kg·m²)"""
+
+    def __init__(self, mass=0.0, center=(0.0, 0.0, 0.0), inertia=None, volume=0.0):
+        self.mass = float(mass)
+        self.center = np.asarray(center, dtype=float)
+        self.inertia = np.zeros((3, 3)) if inertia is None else np.asarray(inertia, dtype=float)
+        self.volume = float(volume)
+
+    @classmethod
+    def from_moments(cls, reference, moments, density, thickness=None):
+        """Scale unit-density moments by density (solid) or density * thickness (shell)"""
+        factor = density if thickness is None else density * thickness
+        volume, first = moments[0], moments[1:4]
+        if volume <= 0:
+            return cls(center=reference)
+        offset = first / volume
+        xx, yy, zz, xy, yz, zx = moments[4:]
+        second = np.array([[xx, xy, zx], [xy, yy, yz], [zx, yz, zz]]) - volume * np.outer(offset, offset)
+        inertia = (np.trace(second) * np.eye(3) - second) * factor
+        material_volume = volume if thickness is None else volume * thickness
+        return cls(volume * factor, reference + offset, inertia, material_volume)
+
+    def __add__(self, other):
+        """Combine two bodies with the parallel-axis theorem"""
+        mass = self.mass + other.mass
+        if mass == 0:
+            return MassProperties()
+        center = (self.mass * self.center + other.mass * other.center) / mass
+        inertia = np.zeros((3, 3))
+        for part in (self, other):
+            d = part.center - center
+            inertia += part.inertia + part.mass * (d @ d * np.eye(3) - np.outer(d, d))
+        return MassProperties(mass, center, inertia, self.volume + other.volume)
+
+    def principal_moments(self):
+        """Principal moments of inertia (ascending) and their axes as columns"""
+        return np.linalg.eigh(self.inertia)
+
+    def inertia_about(self, point):
+        d = self.center - np.asarray(point, dtype=float)
+        return self.inertia + self.mass * (d @ d * np.eye(3) - np.outer(d, d))
+
+
+def material_density(material, densities=None):
+    """kg/m³ for a material name of the table (g/cm³) or any object with a .density in kg/m³
+    (CompositeMaterial of composite_material.py)"""
+    if hasattr(material, "density"):
+        return float(material.density)
+    densities = MATERIAL_DENSITY if densities is None else densities
+    return densities[material] * 1000.0
+
+
+class MassModel:
+    """Per-component mass properties of an Assembly for a material/thickness assignment.
+
+    tags maps name prefix -> (material, wall thickness in m or None for a solid), first match wins,
+    the same convention as shielding.py.
+    """
+
+    def __init__(self, assembly, tags=None, densities=None, use_cache=True):
+        self.assembly = assembly
+        self.densities = MATERIAL_DENSITY if densities is None else densities
+        self.reference, self._solid, self._shell = component_moments(assembly, use_cache)
+        tags = DEFAULT_TAGS if tags is None else tags
+        self.tags = [next((tag for prefix, tag in tags.items() if name.startswith(prefix)), ("void", None))
+                     for name in assembly.names]
+        self.components = [self._component(i) for i in range(len(assembly))]
+        self.recomputed = len(assembly)
+
+    def _component(self, index):
+        material, thickness = self.tags[index]
+        moments = self._solid[index] if thickness is None else self._shell[index]
+        return MassProperties.from_moments(self.reference[index], moments,
+                                           material_density(material, self.densities), thickness)
+
+    def set_material(self, prefix, material, thickness=None):
+        """Retag the components under prefix; only those are recomputed. Returns how many changed"""
+        changed = [i for i, name in enumerate(self.assembly.names)
+                   if name.startswith(prefix) and self.tags[i] != (material, thickness)]
+        for i in changed:
+            self.tags[i] = (material, thickness)
+            self.components[i] = self._component(i)
+        self.recomputed = len(changed)
+        return len(changed)
+
+    def component(self, name):
+        return self.components[self.assembly.index(name)]
+
+    def group(self, prefix=""):
+        """Rolled-up properties of every component under prefix ('' = whole assembly)"""
+        return sum((self.components[i] for i in self.assembly.select(prefix)), MassProperties())
+
+    def total(self):
+        return self.group("")
+
+    def tree(self):
+        """Properties of every node of the '/' tree, from the root ('') down to the components"""
+        nodes = {"": MassProperties()}
+        for name, props in zip(self.assembly.names, self.components):
+            parts = name.split("/")
+            for depth in range(1, len(parts) + 1):
+                node = "/".join(parts[:depth])
+                nodes[node] = nodes.get(node, MassProperties()) + props
+            nodes[""] = nodes[""] + props
+        return nodes
+
+    def table(self):
+        """(name, mass kg, centre, principal moments) per component, heaviest first"""
+        rows = [(name, p.mass, p.center, p.principal_moments()[0])
+                for name, p in zip(self.assembly.names, self.components)]
+        return sorted(rows, key=lambda row: -row[1])
+
+
+if __name__ == "__main__":
+    # Uso: python mass_properties.py [niveles_del_árbol]
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    ship = falcon_parker_assembly()
+    start = time.perf_counter()
+    model = MassModel(ship)
+    print(f"{len(ship)} componentes, {len(ship.faces)} caras en {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for node, props in sorted(model.tree().items()):
+        if node.count("/") < depth:
+            print(f"  {node or '(total)':<30} {props.mass:10.1f} kg  CdM ({props.center[0]:6.2f}, "
+                  f"{props.center[1]:6.2f}, {props.center[2]:6.2f})  I = {np.round(props.principal_moments()[0], 1)}")
+
+    # Material compuesto de composite_material.py para el escudo térmico: solo se recalculan esos componentes
+    composite = import_script(os.path.join(PYTHON_FILES, "composite_material.py"))
+    ultracarbon = composite.CompositeMaterial("UltraCarbon-X", 1600, 4200, 150, 3500, 0.95, 1.1e-6, 0.9, 150)
+    start = time.perf_counter()
+    model.set_material("thermal/", ultracarbon, 0.02)
+    total = model.total()
+    print(f"Escudo térmico de {ultracarbon.name}: {model.recomputed} componentes recalculados en "
+          f"{(time.perf_counter() - start) * 1000:.2f} ms, masa total {total.mass:.1f} kg")
+
+    vasimir = import_script(os.path.join(PYTHON_FILES, "BasicSpacecraftDesgnVASIMIR.py"))
+    spacecraft = vasimir.Spacecraft("Falcon Parker", mass=total.mass)
+    print(f"Spacecraft.status_report(): {spacecraft.status_report()['Mass (kg)']:.1f} kg")
@@ -0,0 +1,234 @@
+# mmod.py
+# Monte Carlo de impactos de micrometeoroides y basura orbital (MMOD) sobre el ensamblaje.
+# Rayos desde un disco que cubre la esfera envolvente, primer impacto por ray casting y ecuaciones de
+# límite balístico (pared simple Cour-Palais, escudo Whipple Christiansen NNO) por componente.
+# Las muestras se procesan por lotes: la memoria no depende del número total de muestras.
+
+import sys
+import time
+
+import numpy as np
+
+from assembly import falcon_parker_assembly
+from ray_caster import RayCaster, random_directions
+
+BATCH_SIZE = 1 << 20
+MAX_STANDOFF = 0.5           # m: componente detrás del primero a menos de esto = escudo Whipple
+
+# Propiedades para las ecuaciones empíricas (los no metálicos son equivalentes aproximados):
+# densidad g/cm³, dureza Brinell, velocidad del sonido km/s, límite elástico ksi
+MMOD_MATERIALS = {
+    "aluminium": (2.713, 95.0, 5.1, 40.0),
+    "aluminium_2219": (2.85, 130.0, 5.1, 57.0),
+    "carbon_composite": (1.60, 60.0, 3.0, 70.0),
+    "hdpe": (0.95, 5.0, 2.4, 3.6),
+    "tantalum": (16.69, 110.0, 3.4, 25.0),
+    "tungsten": (19.25, 300.0, 5.2, 100.0),
+}
+
+# prefijo de componente -> (material, espesor de pared en m); el primero que encaje gana
+DEFAULT_WALLS = {
+    "shielding/hex_layer_upper": ("aluminium", 0.0016),
+    "shielding/hex_layer_lower": ("aluminium", 0.0032),
+    "structure/fuselage": ("aluminium_2219", 0.004),
+    "thermal/": ("carbon_composite", 0.003),
+    "power/": ("carbon_composite", 0.001),
+    "modules/": ("aluminium", 0.003),
+    "": ("aluminium", 0.002),
+}
+
+
+# ----------------------------
+# ENTORNO DE PARTÍCULAS
+# ----------------------------
+
+class ParticleEnvironment:
+    """Omnidirectional particle population.
+
+    flux is the cumulative flux of particles larger than d_min on a randomly tumbling plate
+    (impacts / m² / year, the ORDEM/MEM convention); F(>d) falls as (d / d_min)^-size_slope.
+    Velocities are normal (km/s), truncated to [v_min, v_max].
+    """
+
+    def __init__(self, name, flux, d_min_cm, d_max_cm, size_slope, density, v_mean, v_sigma, v_min=1.0, v_max=72.0):
+        self.name = name
+        self.flux = flux
+        self.d_min_cm = d_min_cm
+        self.d_max_cm = d_max_cm
+        self.size_slope = size_slope
+        self.density = density
+        self.v_mean = v_mean
+        self.v_sigma = v_sigma
+        self.v_min = v_min
+        self.v_max = v_max
+
+    def sample_diameters(self, n, rng):
+        """Truncated power law by inverse transform of the cumulative flux"""
+        lo, hi = self.d_min_cm ** -self.size_slope, self.d_max_cm ** -self.size_slope
+        return (lo + rng.random(n) * (hi - lo)) ** (-1.0 / self.size_slope)
+
+    def sample_velocities(self, n, rng):
+        v = rng.normal(self.v_mean, self.v_sigma, n)
+        bad = (v < self.v_min) | (v > self.v_max)
+        while bad.any():
+            v[bad] = rng.normal(self.v_mean, self.v_sigma, bad.sum())
+            bad = (v < self.v_min) | (v > self.v_max)
+        return v
+
+
+# Valores de orden de magnitud para LEO; sustituir por salidas de ORDEM/MEM para un análisis real
+ORBITAL_DEBRIS = ParticleEnvironment("orbital_debris", flux=30.0, d_min_cm=0.01, d_max_cm=1.0, size_slope=2.5,
+                                     density=2.8, v_mean=9.0, v_sigma=3.5, v_max=16.0)
+METEOROIDS = ParticleEnvironment("meteoroids", flux=0.5, d_min_cm=0.01, d_max_cm=1.0, size_slope=2.2,
+                                 density=1.0, v_mean=20.0, v_sigma=6.0, v_min=11.0)
+
+
+# ----------------------------
+# ECUACIONES DE LÍMITE BALÍSTICO
+# ----------------------------
+
+def single_wall_fails(d, v, cos_theta, rho_p, wall_t_cm, rho_t, brinell, sound_speed, k=1.8):
+    """Modified Cour-Palais: fails when the wall is thinner than k times the penetration depth
+    (k = 1.8 prevents detached spall)"""
+    depth = (5.24 * d ** (19 / 18) * brinell ** -0.25 * np.sqrt(rho_p / rho_t)
+             * (v * cos_theta / sound_speed) ** (2 / 3))
+    return wall_t_cm < k * depth
+
+
+def whipple_critical_diameter(v, cos_theta, rho_p, bumper_t_cm, rho_b, wall_t_cm, yield_ksi, standoff_cm):
+    """Christiansen's new non-optimum equation for a bumper + rear wall (cm, km/s, g/cm³, ksi)"""
+    cos_theta = np.maximum(cos_theta, 0.05)
+    vn = v * cos_theta
+
+    def ballistic(v_):
+        return ((wall_t_cm * np.sqrt(yield_ksi / 40) + bumper_t_cm)
+                / (0.6 * cos_theta ** (5 / 3) * np.sqrt(rho_p) * v_ ** (2 / 3))) ** (18 / 19)
+
+    def hypervelocity(v_):
+        return (3.918 * wall_t_cm ** (2 / 3) * rho_p ** (-1 / 3) * rho_b ** (-1 / 9)
+                * (v_ * cos_theta) ** (-2 / 3) * standoff_cm ** (1 / 3) * (yield_ksi / 70) ** (1 / 3))
+
+    v3, v7 = 3.0 / cos_theta, 7.0 / cos_theta
+    d3, d7 = ballistic(v3), hypervelocity(v7)
+    shatter = d3 + (d7 - d3) * (v - v3) / (v7 - v3)
+    return np.where(vn <= 3.0, ballistic(v), np.where(vn >= 7.0, hypervelocity(v), shatter))
+
+
+# ----------------------------
+# MONTE CARLO
+# ----------------------------
+
+def resolve_walls(names, walls=None):
+    """(density, brinell, sound speed, yield ksi, thickness cm) per component"""
+    walls = DEFAULT_WALLS if walls is None else walls
+    table = np.zeros((len(names), 5))
+    for i, name in enumerate(names):
+        tag = next((tag for prefix, tag in walls.items() if name.startswith(prefix)), None)
+        if tag is None:
+            raise ValueError(f"no wall entry matches component {name!r}; add a '' catch-all prefix")
+        material, thickness = tag
+        table[i, :4] = MMOD_MATERIALS[material]
+        table[i, 4] = thickness * 100.0
+    return table
+
+
+class ImpactResult:
+    """Expected impacts and failures per component over the exposure; PNP = exp(-expected failures)"""
+
+    def __init__(self, names, samples, impacts, failures, shielded_impacts):
+        self.names = names
+        self.samples = samples
+        self.impacts = impacts                    # impactos esperados (primer impacto)
+        self.failures = failures                  # perforaciones esperadas de la pared protegida
+        self.shielded_impacts = shielded_impacts  # impactos que llegaron tras un escudo Whipple
+
+    @property
+    def pnp(self):
+        return np.exp(-self.failures)
+
+    def group_pnp(self, prefix):
+        return float(np.exp(-sum(self.failures[i] for i, name in enumerate(self.names) if name.startswith(prefix))))
+
+
+def impact_monte_carlo(assembly, environments=(ORBITAL_DEBRIS, METEOROIDS), years=1.0, n_samples=10_000_000,
+                       walls=None, batch_size=BATCH_SIZE, seed=0, caster=None, processes=1, verbose=False):
+    """Stream n_samples particles per environment onto the assembly and accumulate per-component results"""
+    caster = caster if caster is not None else RayCaster(assembly)
+    table = resolve_walls(assembly.names, walls)
+    rho_t, brinell, sound, yield_ksi, wall_t = table.T
+    n_components = len(assembly)
+    ignore_self = np.eye(n_components, dtype=bool)
+
+    center = assembly.bounds.mean(axis=0)
+    radius = np.linalg.norm(assembly.bounds[1] - assembly.bounds[0]) / 2 * 1.01
+    rng = np.random.default_rng(seed)
+    impacts = np.zeros(n_components)
+    failures = np.zeros(n_components)
+    shielded = np.zeros(n_components)
+
+    for env in environments:
+        # Flujo esférico = 2 x flujo sobre placa con giro aleatorio; cada muestra representa su parte del disco
+        weight = 2 * env.flux * np.pi * radius ** 2 * years / n_samples
+        done = 0
+        while done < n_samples:
+            n = min(batch_size, n_samples - done)
+            incoming = random_directions(n, rng)
+            t1 = np.cross(incoming, [0.0, 0.0, 1.0])
+            t1[np.linalg.norm(t1, axis=1) < 1e-6] = [1.0, 0.0, 0.0]
+            t1 /= np.linalg.norm(t1, axis=1, keepdims=True)
+            t2 = np.cross(incoming, t1)
+            r, phi = radius * np.sqrt(rng.random(n)), 2 * np.pi * rng.random(n)
+            origins = (center - incoming * radius * 1.01 + (r * np.cos(phi))[:, None] * t1
+                       + (r * np.sin(phi))[:, None] * t2)
+
+            hits = caster.intersect(origins, incoming, processes=processes)
+            idx = np.nonzero(hits.hit)[0]
+            c1 = hits.component[idx]
+            impacts += np.bincount(c1, minlength=n_components) * weight
+
+            d = env.sample_diameters(len(idx), rng)
+            v = env.sample_velocities(len(idx), rng)
+            cos1 = np.abs(np.einsum("ij,ij->i", assembly.face_normals[hits.face[idx]], incoming[idx]))
+            perforated = single_wall_fails(d, v, np.maximum(cos1, 0.05), env.density, wall_t[c1], rho_t[c1],
+                                           brinell[c1], sound[c1])
+
+            # Lo que perfora la primera pared sigue: si hay otro componente cerca detrás, es un Whipple
+            p = idx[perforated]
+            behind = caster.intersect_ignoring(hits.points[p], incoming[p], ignore_self, group=c1[perforated],
+                                               t_max=MAX_STANDOFF)
+            whipple = behind.hit
+            single = ~whipple
+            failures += np.bincount(c1[perforated][single], minlength=n_components) * weight
+
+            c2 = behind.component[whipple]
+            cb = c1[perforated][whipple]
+            cos2 = np.abs(np.einsum("ij,ij->i", assembly.face_normals[behind.face[whipple]], incoming[p][whipple]))
+            d_c = whipple_critical_diameter(v[perforated][whipple], np.minimum(cos1[perforated][whipple], 1.0),
+                                            env.density, wall_t[cb], rho_t[cb], wall_t[c2], yield_ksi[c2],
+                                            np.maximum(behind.t[whipple] * 100.0, 0.1))
+            shielded += np.bincount(c2, minlength=n_components) * weight
+            failures += np.bincount(c2[d[perforated][whipple] > d_c], minlength=n_components) * weight
+            done += n
+            if verbose:
+                print(f"  {env.name}: {done}/{n_samples} muestras")
+
+    return ImpactResult(assembly.names, n_samples * len(environments), impacts, failures, shielded)
+
+
+if __name__ == "__main__":
+    # Uso: python mmod.py [muestras_por_entorno] [años]
+    n_samples = int(float(sys.argv[1])) if len(sys.argv) > 1 else 4_000_000
+    years = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+
+    ship = falcon_parker_assembly()
+    caster = RayCaster(ship)
+    start = time.perf_counter()
+    result = impact_monte_carlo(ship, years=years, n_samples=n_samples, caster=caster)
+    elapsed = time.perf_counter() - start
+    print(f"{result.samples} muestras en {elapsed:.1f} s ({result.samples / elapsed / 1e6:.2f} M/s), {years:g} años")
+    for group in ["shielding/hex_layer_upper", "shielding/hex_layer_lower", "structure/", "modules/",
+                  "thermal/", "power/", "propulsion/", "comms/"]:
+        members = ship.select(group)
+        print(f"  {group:<28} impactos {result.impacts[members].sum():9.1f}  "
+              f"tras Whipple {result.shielded_impacts[members].sum():8.1f}  "
+              f"perforaciones {result.failures[members].sum():7.3f}  PNP {result.group_pnp(group):.4f}")
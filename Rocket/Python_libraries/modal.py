@@ -0,0 +1,242 @@
+# modal.py
+# Análisis modal sobre los modelos de pórtico de frame_fe.py: matriz de masa consistente, modos más bajos
+# con eigsh en shift-invert y animación de cada modo deformando los vértices de la malla original
+# (como create_warp_nacelle_curve deforma la góndola), renderizada con rasterizer.py a GIF.
+
+import os
+import sys
+import time
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+import trimesh
+from scipy.spatial import cKDTree
+
+from assembly import import_script
+from frame_fe import A, IY, IZ, REPO_ROOT, FrameModel, circular_section, lattice_tower
+from rasterizer import OrthoCamera, render_buffers
+
+FREE_FREE_SHIFT_HZ = 0.01    # desplazamiento negativo por defecto: admite modos de sólido rígido (libre-libre)
+MESH_NEIGHBOURS = 4          # nodos del pórtico que mueven cada vértice de la malla
+
+
+# ----------------------------
+# MATRIZ DE MASA
+# ----------------------------
+
+def local_mass(model):
+    """(E, 12, 12) consistent beam mass in local axes (axial, torsion with Ip = Iy + Iz, cubic bending)"""
+    L = model.lengths()
+    rho = model.material[:, 2]
+    m = rho * model.sections[:, A] * L
+    ip = rho * (model.sections[:, IY] + model.sections[:, IZ]) * L
+    k = np.zeros((len(L), 12, 12))
+    for (i, j), v in {(0, 0): m / 3, (0, 6): m / 6, (6, 6): m / 3, (3, 3): ip / 3, (3, 9): ip / 6,
+                      (9, 9): ip / 3}.items():
+        k[:, i, j] = v
+    c = m / 420
+    for (v1, t1, v2, t2), sign in (((1, 5, 7, 11), 1.0), ((2, 4, 8, 10), -1.0)):
+        terms = {(v1, v1): 156 * c, (v1, t1): sign * 22 * L * c, (v1, v2): 54 * c, (v1, t2): -sign * 13 * L * c,
+                 (t1, t1): 4 * L ** 2 * c, (t1, v2): sign * 13 * L * c, (t1, t2): -3 * L ** 2 * c,
+                 (v2, v2): 156 * c, (v2, t2): -sign * 22 * L * c, (t2, t2): 4 * L ** 2 * c}
+        for (i, j), v in terms.items():
+            k[:, i, j] = v
+    return k + np.triu(k, 1).transpose(0, 2, 1)
+
+
+def mass_matrix(model, lumped=False):
+    """Global mass matrix (CSR); node_mass is added on the translational DOFs"""
+    n = len(model.nodes)
+    extra = np.zeros((n, 6))
+    if lumped:
+        extra[:, :3] = model.nodal_masses()[:, None]
+        return sp.diags(extra.ravel()).tocsr()
+    T = model.transforms()
+    M = model.assemble(np.matmul(T.transpose(0, 2, 1), np.matmul(local_mass(model), T)))
+    extra[:, :3] = model.node_mass[:, None]
+    return (M + sp.diags(extra.ravel())).tocsr()
+
+
+# ----------------------------
+# MODOS
+# ----------------------------
+
+class ModalResult:
+    """Natural frequencies (Hz), mass-normalized mode shapes (n_modes, N, 6) and effective mass fractions"""
+
+    def __init__(self, frequencies, shapes, effective_mass):
+        self.frequencies = np.asarray(frequencies)
+        self.shapes = np.asarray(shapes)
+        self.effective_mass = np.asarray(effective_mass)    # (n_modes, 3) fracción de masa en x, y, z
+
+    def __len__(self):
+        return len(self.frequencies)
+
+    def save_npz(self, filename):
+        np.savez(filename, frequencies=self.frequencies, shapes=self.shapes, effective_mass=self.effective_mass)
+        return filename
+
+    @classmethod
+    def load_npz(cls, filename):
+        with np.load(filename) as data:
+            return cls(data["frequencies"], data["shapes"], data["effective_mass"])
+
+    def summary(self):
+        return [(i + 1, f, *m) for i, (f, m) in enumerate(zip(self.frequencies, self.effective_mass))]
+
+
+def modal_analysis(model, n_modes=10, shift_hz=None, lumped=False, stiffness=None, mass=None):
+    """n_modes nearest shift_hz with shift-invert Lanczos (one sparse LU of K - σM); with the default small
+    negative shift these are the lowest modes, rigid-body ones included.
+
+    Unsupported parts of a supported model are clamped as in FrameModel.solve; a model without any
+    fixed DOF is analysed free-free and its first six modes are rigid-body modes (~0 Hz).
+    """
+    K = model.stiffness_matrix() if stiffness is None else stiffness
+    M = mass_matrix(model, lumped) if mass is None else mass
+    fixed = model.fixed.copy()
+    if fixed.any():
+        fixed[model.floating_nodes()] = True
+    free = np.nonzero(~fixed.ravel())[0]
+    K_ff, M_ff = K[free][:, free].tocsc(), M[free][:, free].tocsc()
+
+    sigma = -(2 * np.pi * FREE_FREE_SHIFT_HZ) ** 2 if shift_hz is None else (2 * np.pi * shift_hz) ** 2
+    omega2, vectors = spla.eigsh(K_ff, k=min(n_modes, len(free) - 1), M=M_ff, sigma=sigma, which="LM")
+    order = np.argsort(omega2)
+    omega2, vectors = omega2[order], vectors[:, order]
+
+    shapes = np.zeros((len(omega2), model.n_dof))
+    shapes[:, free] = vectors.T
+    # Factores de participación en traslación rígida: Γ = φᵀ M r, masa efectiva = Γ² / masa total
+    rigid = np.zeros((model.n_dof, 3))
+    for axis in range(3):
+        rigid[axis::6, axis] = 1.0
+    gamma = shapes @ (M @ rigid)
+    total = rigid[:, 0] @ (M @ rigid[:, 0])
+    frequencies = np.sqrt(np.maximum(omega2, 0)) / (2 * np.pi)
+    return ModalResult(frequencies, shapes.reshape(len(omega2), -1, 6), gamma ** 2 / total)
+
+
+# ----------------------------
+# DEFORMACIÓN DE LA MALLA Y ANIMACIÓN
+# ----------------------------
+
+class MeshDeformer:
+    """Moves mesh vertices with the frame nodes: inverse-distance blend of the MESH_NEIGHBOURS nearest nodes,
+    each contributing u + θ × (vertex - node)"""
+
+    def __init__(self, model, vertices, neighbours=MESH_NEIGHBOURS):
+        self.vertices = np.asarray(vertices, dtype=float)
+        distance, self.node = cKDTree(model.nodes).query(self.vertices, k=min(neighbours, len(model.nodes)))
+        distance, self.node = np.atleast_2d(distance.T).T, np.atleast_2d(self.node.T).T
+        weight = 1.0 / np.maximum(distance, 1e-9) ** 2
+        self.weight = weight / weight.sum(axis=1, keepdims=True)
+        self.arm = self.vertices[:, None, :] - model.nodes[self.node]
+
+    def displace(self, node_displacements):
+        d = node_displacements[self.node]
+        moved = d[..., :3] + np.cross(d[..., 3:], self.arm)
+        return self.vertices + np.einsum("vk,vkj->vj", self.weight, moved)
+
+
+def mode_frames(mesh, model, result, mode, frames=24, amplitude=None):
+    """Deformed copies of mesh over one period of a mode; amplitude is the peak node translation (m)"""
+    shape = result.shapes[mode]
+    size = np.linalg.norm(np.ptp(model.nodes, axis=0))
+    amplitude = 0.05 * size if amplitude is None else amplitude
+    shape = shape * amplitude / max(np.linalg.norm(shape[:, :3], axis=1).max(), 1e-12)
+    deformer = MeshDeformer(model, mesh.vertices)
+    meshes = []
+    for phase in np.linspace(0, 2 * np.pi, frames, endpoint=False):
+        frame = mesh.copy()
+        frame.vertices = deformer.displace(shape * np.sin(phase))
+        meshes.append(frame)
+    return meshes
+
+
+def animate_mode(mesh, model, result, mode, filename="mode.gif", frames=24, amplitude=None, camera=None,
+                 duration_ms=60):
+    """Render one period of a mode to an animated GIF with the vectorized rasterizer"""
+    from PIL import Image
+
+    camera = camera or OrthoCamera(width=512, height=512, margin=1.0)
+    camera.fit(mesh.vertices)
+    images = []
+    for frame in mode_frames(mesh, model, result, mode, frames, amplitude):
+        color = render_buffers(frame, camera, buffers=("color",)).color
+        rgb = np.where(color[..., 3:] > 0, color[..., :3], 255).astype(np.uint8)   # fondo blanco
+        images.append(Image.fromarray(rgb))
+    images[0].save(filename, save_all=True, append_images=images[1:], duration=duration_ms, loop=0, disposal=2)
+    return filename
+
+
+# ----------------------------
+# PANEL SOLAR DESPLEGADO
+# ----------------------------
+
+def array_on_boom(panels, root, boom_section=None, material="carbon_composite", areal_density=2.0,
+                  element_length=0.25):
+    """Deployed array as a boom along the panel row, clamped at root, with the panel masses lumped on it.
+
+    panels are the boxes of create_solar_array; each panel mass (areal_density kg/m² over its largest face)
+    is spread over the boom nodes inside its span.
+    """
+    centers = np.array([p.bounds.mean(axis=0) for p in panels])
+    root = np.asarray(root, dtype=float)
+    tip_panel = np.argmax(np.linalg.norm(centers - root, axis=1))
+    axis = centers[tip_panel] - root
+    axis /= np.linalg.norm(axis)
+    length = max(((p.vertices - root) @ axis).max() for p in panels)
+    n = max(1, int(np.ceil(length / element_length)))
+    nodes = root + np.linspace(0, length, n + 1)[:, None] * axis
+    section = circular_section(0.1, 0.002) if boom_section is None else boom_section
+    node_mass = np.zeros(n + 1)
+    station = (nodes - root) @ axis
+    for panel in panels:
+        extent = np.sort(np.ptp(panel.vertices, axis=0))
+        along = (panel.vertices - root) @ axis
+        inside = (station >= along.min()) & (station <= along.max())
+        node_mass[inside] += areal_density * extent[1] * extent[2] / max(inside.sum(), 1)
+    model = FrameModel(nodes, np.column_stack([np.arange(n), np.arange(1, n + 1)]), section, material,
+                       node_mass=node_mass)
+    return model.fix(0)
+
+
+if __name__ == "__main__":
+    # Uso: python modal.py [GDL_objetivo] [modos]
+    target_dof = int(float(sys.argv[1])) if len(sys.argv) > 1 else 100_000
+    n_modes = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    tower = lattice_tower(max(1, target_dof // 96), cells=3, width=4.0, bay_height=0.1)
+    start = time.perf_counter()
+    result = modal_analysis(tower, n_modes)
+    print(f"Torre de celosía: {tower.n_dof} GDL, {n_modes} modos en {time.perf_counter() - start:.1f} s: "
+          f"{', '.join(f'{f:.3f}' for f in result.frequencies[:6])} Hz")
+
+    # Mástil de antena de Pannels_antennaSolarParker_render.py como voladizo: 1.875² / 2π √(EI / ρA L⁴)
+    ship = import_script(os.path.join(REPO_ROOT, "Rocket", "Python_libraries", "Pannels_antennaSolarParker_render.py"))
+    mast_mesh = ship.create_antenna_array()[0]
+    mast = FrameModel.from_meshes(mast_mesh, element_length=0.05)
+    mast.fix_below(mast.nodes[:, 2].min() + 1e-6)
+    mast_modes = modal_analysis(mast, 4)
+    E, _, rho = mast.material[0]
+    s, L = mast.sections[0], np.ptp(mast.nodes[:, 2])
+    analytic = 1.875 ** 2 / (2 * np.pi) * np.sqrt(E * s[IZ] / (rho * s[A] * L ** 4))
+    print(f"Mástil de antena: {mast_modes.frequencies[0]:.1f} Hz (analítico {analytic:.1f} Hz)")
+
+    # Panel solar desplegado de Estacion_espacial_one.py (misma posición que en create_station)
+    station = import_script(os.path.join(REPO_ROOT, "SpaceCraft_04", "special", "python", "Estacion_espacial_one.py"))
+    panels = station.create_solar_array(position=[-1.0, 0.0, 30.0])
+    boom_root = [-5.0, 0.0, 30.0]
+    array = array_on_boom(panels, boom_root)
+    array_modes = modal_analysis(array, 6)
+    for mode, f, mx, my, mz in array_modes.summary():
+        print(f"  Panel solar modo {mode}: {f:7.3f} Hz  masa efectiva x {mx:.2f} y {my:.2f} z {mz:.2f}")
+    boom = trimesh.creation.cylinder(radius=0.1, height=np.ptp(array.nodes[:, 0]))
+    boom.apply_transform(trimesh.transformations.rotation_matrix(np.pi / 2, [0, 1, 0]))
+    boom.apply_translation(array.nodes.mean(axis=0))
+    array_mesh = trimesh.util.concatenate(panels + [boom])
+    start = time.perf_counter()
+    animate_mode(array_mesh, array, array_modes, 0, "solar_array_mode1.gif")
+    print(f"Animación del primer modo en solar_array_mode1.gif ({time.perf_counter() - start:.1f} s)")
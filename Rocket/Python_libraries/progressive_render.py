@@ -0,0 +1,182 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import trimesh
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+
+from assembly import import_script
+from render_cache import default_render_cache, render_key
+
+# Pasadas de refinamiento: (dpi, máximo de caras). None = malla completa.
+# La primera pasada tiene un coste fijo, independiente del tamaño del modelo.
+DEFAULT_PASSES = [(30, 1500), (100, 20000), (300, None)]
+
+
+# ----------------------------
+# NIVEL DE DETALLE (LOD)
+# ----------------------------
+
+def select_lod_faces(mesh, max_faces):
+    """Indices of the max_faces largest faces (coarse silhouette of the model)"""
+    n_faces = len(mesh.faces)
+    if max_faces is None or n_faces <= max_faces:
+        return np.arange(n_faces)
+    areas = mesh.area_faces
+    keep = np.argpartition(areas, n_faces - max_faces)[n_faces - max_faces:]
+    return np.sort(keep)
+
+
+# ----------------------------
+# RENDER DE UNA PASADA
+# ----------------------------
+
+def render_pass(mesh, filename, dpi, max_faces, elev=35, azim=40, figsize=(14, 14), margin=3):
+    """Draw one pass with a private Agg figure (safe to run outside the main thread)"""
+    face_index = select_lod_faces(mesh, max_faces)
+    vertices = mesh.vertices
+    faces = mesh.faces[face_index]
+    face_colors = mesh.visual.face_colors[face_index] / 255.0
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111, projection='3d')
+
+    # Con pocas caras los bordes tapan el color, solo se dibujan en la malla completa
+    linewidths = 0.7 if max_faces is None else 0.0
+    collection = Poly3DCollection(vertices[faces], alpha=0.9, linewidths=linewidths, edgecolors=(0.1, 0.1, 0.1, 0.8))
+    collection.set_facecolor(face_colors)
+    ax.add_collection3d(collection)
+
+    bounds = mesh.bounds
+    ax.set_xlim(bounds[0][0] - margin, bounds[1][0] + margin)
+    ax.set_ylim(bounds[0][1] - margin, bounds[1][1] + margin)
+    ax.set_zlim(bounds[0][2] - margin, bounds[1][2] + margin)
+    ax.set_axis_off()
+    ax.view_init(elev=elev, azim=azim)
+    fig.tight_layout()
+
+    # Escritura atómica: el visor nunca lee un PNG a medias
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".png")
+    os.close(fd)
+    fig.savefig(tmp_path, dpi=dpi)
+    os.replace(tmp_path, filename)
+
+
+# ----------------------------
+# RENDER PROGRESIVO
+# ----------------------------
+
+class ProgressiveRender:
+    """Handle for a coarse-to-fine render; every pass overwrites the same output file"""
+
+    def __init__(self, mesh, filename, passes=DEFAULT_PASSES, elev=35, azim=40, figsize=(14, 14),
+                 on_pass=None, use_cache=True):
+        self.mesh = mesh
+        self.filename = filename
+        self.passes = list(passes)
+        self.view = {"elev": elev, "azim": azim, "figsize": figsize}
+        self.on_pass = on_pass
+        self.passes_done = 0
+        self.timings = []
+        self._cancel = threading.Event()
+        self._thread = None
+        self._cache = default_render_cache() if use_cache else None
+        final_dpi, final_faces = self.passes[-1]
+        self._final_key = render_key(
+            mesh,
+            camera={"elev": elev, "azim": azim, "margin": 3},
+            image={"figsize": figsize, "dpi": final_dpi, "max_faces": final_faces},
+            renderer="progressive_render",
+        )
+
+    def _run_pass(self, index):
+        dpi, max_faces = self.passes[index]
+        start = time.perf_counter()
+        render_pass(self.mesh, self.filename, dpi, max_faces, **self.view)
+        self.timings.append(time.perf_counter() - start)
+        self.passes_done = index + 1
+        if self.on_pass is not None:
+            self.on_pass(index, dpi, max_faces, self.filename)
+
+    def _refine(self):
+        for index in range(1, len(self.passes)):
+            if self._cancel.is_set():
+                return
+            self._run_pass(index)
+        if self._cache is not None:
+            self._cache.put(self._final_key, self.filename)
+
+    def start(self, background=True):
+        if self._cache is not None:
+            cached_path = self._cache.get(self._final_key)
+            if cached_path is not None:
+                with open(cached_path, "rb") as src, open(self.filename, "wb") as dst:
+                    dst.write(src.read())
+                self.passes_done = len(self.passes)
+                return self
+
+        # Primera imagen síncrona: baja resolución y pocas caras
+        self._run_pass(0)
+        if background:
+            # Hilo no-daemon: el script termina cuando acaba la última pasada
+            self._thread = threading.Thread(target=self._refine, name="progressive-render")
+            self._thread.start()
+        else:
+            self._refine()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.passes_done == len(self.passes)
+
+
+def progressive_plot_mesh(mesh, filename="progressive_render.png", passes=DEFAULT_PASSES, elev=35, azim=40,
+                          figsize=(14, 14), on_pass=None, background=True, use_cache=True):
+    """Write a low-LOD preview immediately and refine it in the background"""
+    render = ProgressiveRender(mesh, filename, passes=passes, elev=elev, azim=azim, figsize=figsize,
+                               on_pass=on_pass, use_cache=use_cache)
+    return render.start(background=background)
+
+
+# ----------------------------
+# CARGA DE MODELOS
+# ----------------------------
+
+def load_model(spec):
+    """Load a mesh from an STL/OBJ path or from 'script.py:builder_function'"""
+    if ".py:" in spec:
+        path, function_name = spec.rsplit(":", 1)
+        model = getattr(import_script(path), function_name)()
+        if isinstance(model, (list, tuple)):
+            model = trimesh.util.concatenate(list(model))
+        return model
+    return trimesh.load(spec, force="mesh")
+
+
+if __name__ == "__main__":
+    # Ejemplo:
+    #   python progressive_render.py ../../SpaceCraft_04/special/python/Estacion.py:create_star_trek_station_v2 estacion.png
+    if len(sys.argv) < 3:
+        print("Uso: python progressive_render.py <modelo.stl | script.py:funcion> <salida.png>")
+        sys.exit(1)
+
+    model = load_model(sys.argv[1])
+
+    def report(index, dpi, max_faces, filename):
+        detail = "completo" if max_faces is None else f"{max_faces} caras"
+        print(f"Pasada {index + 1}: {dpi} dpi, {detail} -> {filename}")
+
+    render = progressive_plot_mesh(model, sys.argv[2], on_pass=report)
+    render.wait()
+    print("Tiempos por pasada (s): " + ", ".join(f"{t:.2f}" for t in render.timings))
@@ -0,0 +1,284 @@
+import os
+import sys
+
+import numpy as np
+
+from assembly import Assembly, falcon_parker_assembly
+
+# Píxeles candidatos por bloque de triángulos (limita la memoria del rasterizado)
+CHUNK_PIXELS = 4_000_000
+
+
+# ----------------------------
+# CÁMARA ORTOGRÁFICA
+# ----------------------------
+
+class OrthoCamera:
+    """Orthographic camera with the same elev/azim convention as matplotlib's view_init"""
+
+    def __init__(self, elev=35, azim=40, width=1024, height=1024, margin=3.0, center=None, extent=None):
+        self.elev = elev
+        self.azim = azim
+        self.width = width
+        self.height = height
+        self.margin = margin
+        self.center = center
+        self.extent = extent
+
+        e, a = np.radians(elev), np.radians(azim)
+        # eye: dirección desde el modelo hacia la cámara
+        self.eye = np.array([np.cos(e) * np.cos(a), np.cos(e) * np.sin(a), np.sin(e)])
+        self.right = np.array([-np.sin(a), np.cos(a), 0.0])
+        self.up = np.cross(self.eye, self.right)
+
+    @classmethod
+    def from_direction(cls, direction, **kwargs):
+        """Camera looking along -direction (direction points from the model to the camera)"""
+        d = np.asarray(direction, dtype=float)
+        d = d / np.linalg.norm(d)
+        elev = np.degrees(np.arcsin(np.clip(d[2], -1, 1)))
+        azim = np.degrees(np.arctan2(d[1], d[0]))
+        return cls(elev=elev, azim=azim, **kwargs)
+
+    def fit(self, vertices):
+        """Fix center and scale so the bounding sphere of the vertices (plus margin) fills the image"""
+        lo, hi = vertices.min(axis=0), vertices.max(axis=0)
+        center = (lo + hi) / 2 if self.center is None else np.asarray(self.center, dtype=float)
+        extent = self.extent
+        if extent is None:
+            extent = np.linalg.norm(hi - lo) + 2 * self.margin
+        self._center = center
+        self._scale = min(self.width, self.height) / extent  # píxeles por metro
+        return self
+
+    @property
+    def pixel_area(self):
+        return 1.0 / self._scale ** 2
+
+    def project(self, points):
+        """World points -> (column, row, depth); row grows downwards, depth grows away from the camera"""
+        rel = points - self._center
+        col = rel @ self.right * self._scale + self.width / 2
+        row = -(rel @ self.up) * self._scale + self.height / 2
+        depth = -(rel @ self.eye)
+        return col, row, depth
+
+    def unproject(self, col, row, depth):
+        u = (col - self.width / 2) / self._scale
+        v = -(row - self.height / 2) / self._scale
+        return self._center + u[..., None] * self.right + v[..., None] * self.up - depth[..., None] * self.eye
+
+
+# ----------------------------
+# BUFFERS
+# ----------------------------
+
+class RenderBuffers:
+    """Per-pixel outputs of one rasterization pass; -1 / inf mark empty pixels"""
+
+    def __init__(self, camera, face_id, depth, assembly, memmap_dir=None, buffers=("color", "depth", "normal", "component")):
+        self.camera = camera
+        self.face_id = face_id
+        hit = face_id >= 0
+        shape = face_id.shape
+
+        def allocate(name, dtype, extra=()):
+            if memmap_dir is None:
+                return np.empty(shape + extra, dtype=dtype)
+            os.makedirs(memmap_dir, exist_ok=True)
+            return np.lib.format.open_memmap(os.path.join(memmap_dir, f"{name}.npy"), mode="w+",
+                                             dtype=dtype, shape=shape + extra)
+
+        self.depth = None
+        self.normal = None
+        self.component = None
+        self.color = None
+        ids = face_id[hit]
+
+        if "depth" in buffers:
+            self.depth = allocate("depth", np.float32)
+            self.depth[...] = np.inf
+            self.depth[hit] = depth[hit]
+        if "normal" in buffers or "color" in buffers:
+            normals = assembly.face_normals[ids]
+            # Normales orientadas hacia la cámara (mallas abiertas o con caras invertidas)
+            flip = normals @ camera.eye < 0
+            normals[flip] *= -1
+        if "normal" in buffers:
+            self.normal = allocate("normal", np.float32, (3,))
+            self.normal[...] = 0
+            self.normal[hit] = normals
+        if "component" in buffers:
+            self.component = allocate("component", np.int32)
+            self.component[...] = -1
+            self.component[hit] = assembly.face_component[ids]
+        if "color" in buffers:
+            self.color = allocate("color", np.uint8, (4,))
+            self.color[...] = 0
+            shade = 0.35 + 0.65 * np.clip(normals @ camera.eye, 0, 1)
+            rgb = assembly.face_colors[ids, :3] * shade[:, None]
+            self.color[hit, :3] = np.clip(rgb, 0, 255).astype(np.uint8)
+            self.color[hit, 3] = 255
+
+    def save_color(self, filename):
+        import matplotlib.image
+        matplotlib.image.imsave(filename, self.color)
+        return filename
+
+
+# ----------------------------
+# RASTERIZADO VECTORIZADO
+# ----------------------------
+
+def rasterize_faces(camera, vertices, faces):
+    """Z-buffer rasterization; returns (face_id, depth) images with pixel-center sampling"""
+    col, row, depth = camera.project(vertices)
+    x = col[faces]
+    y = row[faces]
+    z = depth[faces]
+
+    W, H = camera.width, camera.height
+    x0 = np.clip(np.floor(x.min(axis=1)).astype(np.int64), 0, W)
+    x1 = np.clip(np.ceil(x.max(axis=1)).astype(np.int64), 0, W)
+    y0 = np.clip(np.floor(y.min(axis=1)).astype(np.int64), 0, H)
+    y1 = np.clip(np.ceil(y.max(axis=1)).astype(np.int64), 0, H)
+    bw = x1 - x0
+    bh = y1 - y0
+    area2 = (x[:, 1] - x[:, 0]) * (y[:, 2] - y[:, 0]) - (x[:, 2] - x[:, 0]) * (y[:, 1] - y[:, 0])
+    valid = (bw > 0) & (bh > 0) & (np.abs(area2) > 1e-12)
+    tri_ids = np.nonzero(valid)[0]
+    counts = (bw * bh)[tri_ids]
+
+    best_depth = np.full(W * H, np.inf)
+    best_face = np.full(W * H, -1, dtype=np.int64)
+
+    # Bloques de triángulos con un número acotado de píxeles candidatos
+    cumulative = np.cumsum(counts)
+    start = 0
+    while start < len(tri_ids):
+        base = cumulative[start - 1] if start > 0 else 0
+        stop = int(np.searchsorted(cumulative, base + CHUNK_PIXELS, side="right"))
+        stop = max(stop, start + 1)
+        tris = tri_ids[start:stop]
+        n = counts[start:stop]
+        start = stop
+
+        owner = np.repeat(np.arange(len(tris)), n)
+        offset = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+        t = tris[owner]
+        px = x0[t] + offset % bw[t]
+        py = y0[t] + offset // bw[t]
+        cx = px + 0.5
+        cy = py + 0.5
+
+        xa, xb, xc = x[t, 0], x[t, 1], x[t, 2]
+        ya, yb, yc = y[t, 0], y[t, 1], y[t, 2]
+        inv = 1.0 / area2[t]
+        w0 = ((xb - cx) * (yc - cy) - (xc - cx) * (yb - cy)) * inv
+        w1 = ((xc - cx) * (ya - cy) - (xa - cx) * (yc - cy)) * inv
+        w2 = 1.0 - w0 - w1
+        inside = (w0 >= 0) & (w1 >= 0) & (w2 >= 0)
+        if not inside.any():
+            continue
+
+        pid = (py * W + px)[inside]
+        zz = (w0 * z[t, 0] + w1 * z[t, 1] + w2 * z[t, 2])[inside]
+        ff = t[inside]
+
+        # El más cercano por píxel dentro del bloque, y luego contra el z-buffer
+        order = np.lexsort((zz, pid))
+        pid, zz, ff = pid[order], zz[order], ff[order]
+        first = np.ones(len(pid), dtype=bool)
+        first[1:] = pid[1:] != pid[:-1]
+        pid, zz, ff = pid[first], zz[first], ff[first]
+        closer = zz < best_depth[pid]
+        best_depth[pid[closer]] = zz[closer]
+        best_face[pid[closer]] = ff[closer]
+
+    return best_face.reshape(H, W), best_depth.reshape(H, W)
+
+
+def render_buffers(model, camera=None, buffers=("color", "depth", "normal", "component"), memmap_dir=None):
+    """Rasterize an Assembly (or a trimesh mesh) and return color/depth/normal/component buffers"""
+    assembly = model if isinstance(model, Assembly) else Assembly.from_meshes([model])
+    camera = camera or OrthoCamera()
+    if not hasattr(camera, "_scale"):
+        camera.fit(assembly.vertices)
+    face_id, depth = rasterize_faces(camera, assembly.vertices, assembly.faces)
+    return RenderBuffers(camera, face_id, depth, assembly, memmap_dir=memmap_dir, buffers=buffers)
+
+
+# ----------------------------
+# MÉTRICAS EN ESPACIO IMAGEN
+# ----------------------------
+
+def silhouette_mask(component):
+    """Pixels whose 4-neighbourhood contains a different component (or background)"""
+    edge = np.zeros(component.shape, dtype=bool)
+    edge[:-1, :] |= component[:-1, :] != component[1:, :]
+    edge[1:, :] |= component[1:, :] != component[:-1, :]
+    edge[:, :-1] |= component[:, :-1] != component[:, 1:]
+    edge[:, 1:] |= component[:, 1:] != component[:, :-1]
+    return edge & (component >= 0)
+
+
+def component_metrics(buffers, assembly):
+    """Visible projected area, unoccluded projected area, visible fraction and silhouette length per component"""
+    n = len(assembly)
+    component = buffers.component if buffers.component is not None else np.where(
+        buffers.face_id >= 0, assembly.face_component[np.maximum(buffers.face_id, 0)], -1)
+    pixel_area = buffers.camera.pixel_area
+    pixel_size = np.sqrt(pixel_area)
+
+    covered = component[component >= 0]
+    visible_area = np.bincount(covered, minlength=n) * pixel_area
+
+    # Área proyectada sin oclusión de otros componentes: caras frontales (∑ A·cosθ)
+    facing = np.clip(assembly.face_normals @ buffers.camera.eye, 0, None) * assembly.face_areas
+    facing_back = np.clip(-(assembly.face_normals @ buffers.camera.eye), 0, None) * assembly.face_areas
+    # Mallas abiertas o con normales invertidas: se toma la mayor de las dos orientaciones
+    projected_area = np.maximum(np.bincount(assembly.face_component, weights=facing, minlength=n),
+                                np.bincount(assembly.face_component, weights=facing_back, minlength=n))
+
+    edges = component[silhouette_mask(component)]
+    silhouette_length = np.bincount(edges, minlength=n) * pixel_size
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        visible_fraction = np.where(projected_area > 0, np.minimum(visible_area / projected_area, 1.0), 0.0)
+
+    return {
+        "names": assembly.names,
+        "visible_area": visible_area,
+        "projected_area": projected_area,
+        "visible_fraction": visible_fraction,
+        "silhouette_length": silhouette_length,
+    }
+
+
+def group_metrics(metrics, assembly, prefix):
+    """Sum of the metrics over a subtree of the assembly (e.g. 'power/solar_panel')"""
+    idx = assembly.select(prefix)
+    visible = metrics["visible_area"][idx].sum()
+    projected = metrics["projected_area"][idx].sum()
+    return {"visible_area": visible, "projected_area": projected,
+            "visible_fraction": visible / projected if projected > 0 else 0.0}
+
+
+if __name__ == "__main__":
+    # Ejemplo: fracción visible de los paneles solares de la Falcon Parker desde una dirección
+    elev = float(sys.argv[1]) if len(sys.argv) > 1 else 35
+    azim = float(sys.argv[2]) if len(sys.argv) > 2 else 40
+
+    ship = falcon_parker_assembly()
+    camera = OrthoCamera(elev=elev, azim=azim, width=1024, height=1024)
+    buffers = render_buffers(ship, camera)
+    buffers.save_color("falcon_parker_buffers_color.png")
+    np.save("falcon_parker_buffers_depth.npy", buffers.depth)
+    np.save("falcon_parker_buffers_component.npy", buffers.component)
+
+    metrics = component_metrics(buffers, ship)
+    panels = group_metrics(metrics, ship, "power/solar_panel_")
+    print(f"Paneles solares visibles desde elev={elev}, azim={azim}: {panels['visible_fraction'] * 100:.1f}%")
+    for group in ["structure/", "power/", "thermal/", "shielding/", "comms/", "modules/", "propulsion/"]:
+        g = group_metrics(metrics, ship, group)
+        print(f"  {group:<12} visible {g['visible_area']:7.2f} m² de {g['projected_area']:7.2f} m²")
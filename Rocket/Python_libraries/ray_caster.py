@@ -0,0 +1,570 @@
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from assembly import Assembly, falcon_parker_assembly
+from render_cache import DiskLRUCache, cache_dir
+
+try:
+    import numba
+except ImportError:  # sin numba se usa la traversal NumPy por frentes de onda
+    numba = None
+
+SAH_BINS = 16
+LEAF_SIZE = 4          # por debajo de esto siempre es hoja
+MAX_LEAF_SIZE = 16     # por encima de esto nunca es hoja
+TRAVERSAL_COST = 1.0
+INTERSECT_COST = 1.5
+PACKET_SIZE = 32768    # rayos por paquete (acota la memoria de la traversal)
+EPSILON = 1e-9
+# fastmath sin nnan/ninf: la traversal usa inf para direcciones nulas y como t_max por defecto
+FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+BVH_CACHE_DIR = cache_dir("bvh")
+
+
+# ----------------------------
+# BVH CON SAH (BINNED)
+# ----------------------------
+
+class BVH:
+    """Flat BVH: node i is a leaf if count[i] > 0, otherwise its children are left[i] and left[i] + 1"""
+
+    def __init__(self, bounds_min, bounds_max, left, start, count, order, depth=None):
+        self.bounds_min = bounds_min
+        self.bounds_max = bounds_max
+        self.left = left
+        self.start = start
+        self.count = count
+        self.order = order  # índice original de la cara en cada posición de hoja
+        # Niveles del árbol: dimensiona las pilas de las traversals compiladas (las cachés antiguas no lo guardan)
+        self.depth = _tree_depth(left, count) if depth is None else int(depth)
+
+    @property
+    def node_count(self):
+        return len(self.left)
+
+    def arrays(self):
+        return {"bounds_min": self.bounds_min, "bounds_max": self.bounds_max, "left": self.left,
+                "start": self.start, "count": self.count, "order": self.order, "depth": self.depth}
+
+
+def _tree_depth(left, count):
+    """Number of levels of a flat BVH (children are always stored after their parent)"""
+    depth, level = 0, np.zeros(1, dtype=np.int64)
+    while len(level):
+        depth += 1
+        inner = level[(count[level] == 0) & (left[level] > level)]
+        level = np.concatenate([left[inner], left[inner] + 1])
+    return depth
+
+
+def _surface_area(lo, hi):
+    d = np.maximum(hi - lo, 0)
+    return 2 * (d[..., 0] * d[..., 1] + d[..., 1] * d[..., 2] + d[..., 2] * d[..., 0])
+
+
+def build_bvh(triangles):
+    """Binned SAH build over (F, 3, 3) triangles"""
+    n_faces = len(triangles)
+    tri_min = triangles.min(axis=1)
+    tri_max = triangles.max(axis=1)
+    centroids = (tri_min + tri_max) / 2
+
+    order = np.arange(n_faces)
+    capacity = max(2 * n_faces, 1)
+    bounds_min = np.empty((capacity, 3))
+    bounds_max = np.empty((capacity, 3))
+    left = np.zeros(capacity, dtype=np.int64)
+    start = np.zeros(capacity, dtype=np.int64)
+    count = np.zeros(capacity, dtype=np.int64)
+
+    n_nodes = 1
+    stack = [(0, 0, n_faces)]
+    while stack:
+        node, lo, hi = stack.pop()
+        prims = order[lo:hi]
+        bounds_min[node] = tri_min[prims].min(axis=0)
+        bounds_max[node] = tri_max[prims].max(axis=0)
+        n = hi - lo
+
+        split = None
+        if n > LEAF_SIZE:
+            c = centroids[prims]
+            c_lo, c_hi = c.min(axis=0), c.max(axis=0)
+            extent = c_hi - c_lo
+            best_cost = INTERSECT_COST * n
+            parent_area = _surface_area(bounds_min[node], bounds_max[node])
+            for axis in range(3):
+                if extent[axis] <= 0:
+                    continue
+                bins = np.minimum(((c[:, axis] - c_lo[axis]) / extent[axis] * SAH_BINS).astype(np.int64), SAH_BINS - 1)
+                bin_count = np.bincount(bins, minlength=SAH_BINS)
+                sorted_idx = np.argsort(bins, kind="stable")
+                used = np.nonzero(bin_count)[0]
+                offsets = np.concatenate([[0], np.cumsum(bin_count[used])[:-1]])
+                b_min = np.full((SAH_BINS, 3), np.inf)
+                b_max = np.full((SAH_BINS, 3), -np.inf)
+                b_min[used] = np.minimum.reduceat(tri_min[prims][sorted_idx], offsets, axis=0)
+                b_max[used] = np.maximum.reduceat(tri_max[prims][sorted_idx], offsets, axis=0)
+
+                # Barridos izquierda->derecha y derecha->izquierda sobre los bins
+                l_min = np.minimum.accumulate(b_min, axis=0)[:-1]
+                l_max = np.maximum.accumulate(b_max, axis=0)[:-1]
+                r_min = np.minimum.accumulate(b_min[::-1], axis=0)[::-1][1:]
+                r_max = np.maximum.accumulate(b_max[::-1], axis=0)[::-1][1:]
+                l_count = np.cumsum(bin_count)[:-1]
+                r_count = n - l_count
+                cost = TRAVERSAL_COST + INTERSECT_COST * (
+                    _surface_area(l_min, l_max) * l_count + _surface_area(r_min, r_max) * r_count
+                ) / max(parent_area, EPSILON)
+                cost[(l_count == 0) | (r_count == 0)] = np.inf
+                k = int(np.argmin(cost))
+                if cost[k] < best_cost:
+                    best_cost = cost[k]
+                    split = (axis, bins <= k)
+            if split is None and n > MAX_LEAF_SIZE:
+                # SAH no encuentra partición útil: mediana sobre el eje más largo
+                axis = int(np.argmax(extent))
+                median_order = np.argsort(c[:, axis], kind="stable")
+                mask = np.zeros(n, dtype=bool)
+                mask[median_order[: n // 2]] = True
+                split = (axis, mask)
+
+        if split is None:
+            start[node] = lo
+            count[node] = n
+            continue
+
+        _, mask = split
+        order[lo:hi] = np.concatenate([prims[mask], prims[~mask]])
+        mid = lo + int(mask.sum())
+        left[node] = n_nodes
+        n_nodes += 2
+        stack.append((left[node] + 1, mid, hi))
+        stack.append((left[node], lo, mid))
+
+    return BVH(bounds_min[:n_nodes].copy(), bounds_max[:n_nodes].copy(), left[:n_nodes].copy(),
+               start[:n_nodes].copy(), count[:n_nodes].copy(), order)
+
+
+# ----------------------------
+# TRAVERSAL VECTORIZADA
+# ----------------------------
+
+def _slab_test(origins, inv_dirs, lo, hi, t_max):
+    t0 = (lo - origins) * inv_dirs
+    t1 = (hi - origins) * inv_dirs
+    t_near = np.nanmax(np.minimum(t0, t1), axis=1)
+    t_far = np.nanmin(np.maximum(t0, t1), axis=1)
+    return (t_near <= t_far) & (t_far >= 0) & (t_near < t_max)
+
+
+def _intersect_triangles(origins, directions, v0, e1, e2):
+    """Möller–Trumbore for aligned arrays of rays and triangles; returns t (inf when missed)"""
+    p = np.cross(directions, e2)
+    det = np.einsum("ij,ij->i", e1, p)
+    ok = np.abs(det) > EPSILON
+    inv_det = 1.0 / np.where(ok, det, 1.0)
+    s = origins - v0
+    u = np.einsum("ij,ij->i", s, p) * inv_det
+    q = np.cross(s, e1)
+    v = np.einsum("ij,ij->i", directions, q) * inv_det
+    t = np.einsum("ij,ij->i", e2, q) * inv_det
+    hit = ok & (u >= 0) & (v >= 0) & (u + v <= 1) & (t > EPSILON)
+    return np.where(hit, t, np.inf)
+
+
+def closest_hits(bvh_arrays, v0, e1, e2, origins, directions, t_max):
+    """Closest hit for a packet of rays: (t, leaf position); position -1 when nothing is hit"""
+    bounds_min = bvh_arrays["bounds_min"]
+    bounds_max = bvh_arrays["bounds_max"]
+    left = bvh_arrays["left"]
+    start = bvh_arrays["start"]
+    count = bvh_arrays["count"]
+
+    n_rays = len(origins)
+    with np.errstate(divide="ignore"):
+        inv_dirs = 1.0 / directions
+    best_t = np.array(t_max, dtype=float) * np.ones(n_rays)
+    best_prim = np.full(n_rays, -1, dtype=np.int64)
+
+    ray = np.arange(n_rays)
+    node = np.zeros(n_rays, dtype=np.int64)
+    with np.errstate(invalid="ignore"):
+        while len(ray):
+            keep = _slab_test(origins[ray], inv_dirs[ray], bounds_min[node], bounds_max[node], best_t[ray])
+            ray, node = ray[keep], node[keep]
+            is_leaf = count[node] > 0
+
+            # Hojas: pares (rayo, triángulo)
+            leaf_ray, leaf_node = ray[is_leaf], node[is_leaf]
+            if len(leaf_ray):
+                n = count[leaf_node]
+                pair_ray = np.repeat(leaf_ray, n)
+                pair_prim = np.repeat(start[leaf_node], n) + (np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n))
+                t = _intersect_triangles(origins[pair_ray], directions[pair_ray], v0[pair_prim], e1[pair_prim], e2[pair_prim])
+                hit = t < best_t[pair_ray]
+                if hit.any():
+                    pair_ray, pair_prim, t = pair_ray[hit], pair_prim[hit], t[hit]
+                    order = np.lexsort((t, pair_ray))
+                    pair_ray, pair_prim, t = pair_ray[order], pair_prim[order], t[order]
+                    first = np.ones(len(pair_ray), dtype=bool)
+                    first[1:] = pair_ray[1:] != pair_ray[:-1]
+                    pair_ray, pair_prim, t = pair_ray[first], pair_prim[first], t[first]
+                    closer = t < best_t[pair_ray]
+                    best_t[pair_ray[closer]] = t[closer]
+                    best_prim[pair_ray[closer]] = pair_prim[closer]
+
+            # Nodos internos: se expanden a sus dos hijos
+            inner_ray, inner_node = ray[~is_leaf], node[~is_leaf]
+            ray = np.concatenate([inner_ray, inner_ray])
+            node = np.concatenate([left[inner_node], left[inner_node] + 1])
+
+    return best_t, best_prim
+
+
+# ----------------------------
+# TRAVERSAL COMPILADA (OPCIONAL, NUMBA)
+# ----------------------------
+
+if numba is not None:
+
+    @numba.njit(parallel=True, fastmath=FASTMATH, cache=True)
+    def _closest_hits_jit(bounds_min, bounds_max, left, start, count, depth, v0, e1, e2, origins, directions,
+                          t_max):
+        n_rays = origins.shape[0]
+        best_t = t_max.copy()
+        best_prim = np.full(n_rays, -1, dtype=np.int64)
+        for r in numba.prange(n_rays):
+            ox, oy, oz = origins[r, 0], origins[r, 1], origins[r, 2]
+            dx, dy, dz = directions[r, 0], directions[r, 1], directions[r, 2]
+            ix = 1.0 / dx if dx != 0.0 else np.inf
+            iy = 1.0 / dy if dy != 0.0 else np.inf
+            iz = 1.0 / dz if dz != 0.0 else np.inf
+            # Cada nivel deja como mucho un hermano pendiente en la pila
+            stack = np.empty(depth + 1, dtype=np.int64)
+            stack[0] = 0
+            top = 1
+            t_best = best_t[r]
+            prim_best = -1
+            while top > 0:
+                top -= 1
+                node = stack[top]
+                # Slab test
+                a = (bounds_min[node, 0] - ox) * ix
+                b = (bounds_max[node, 0] - ox) * ix
+                t_near = min(a, b)
+                t_far = max(a, b)
+                a = (bounds_min[node, 1] - oy) * iy
+                b = (bounds_max[node, 1] - oy) * iy
+                t_near = max(t_near, min(a, b))
+                t_far = min(t_far, max(a, b))
+                a = (bounds_min[node, 2] - oz) * iz
+                b = (bounds_max[node, 2] - oz) * iz
+                t_near = max(t_near, min(a, b))
+                t_far = min(t_far, max(a, b))
+                if t_near > t_far or t_far < 0.0 or t_near >= t_best:
+                    continue
+                if count[node] > 0:
+                    for k in range(start[node], start[node] + count[node]):
+                        px = dy * e2[k, 2] - dz * e2[k, 1]
+                        py = dz * e2[k, 0] - dx * e2[k, 2]
+                        pz = dx * e2[k, 1] - dy * e2[k, 0]
+                        det = e1[k, 0] * px + e1[k, 1] * py + e1[k, 2] * pz
+                        if abs(det) < EPSILON:
+                            continue
+                        inv = 1.0 / det
+                        sx, sy, sz = ox - v0[k, 0], oy - v0[k, 1], oz - v0[k, 2]
+                        u = (sx * px + sy * py + sz * pz) * inv
+                        if u < 0.0 or u > 1.0:
+                            continue
+                        qx = sy * e1[k, 2] - sz * e1[k, 1]
+                        qy = sz * e1[k, 0] - sx * e1[k, 2]
+                        qz = sx * e1[k, 1] - sy * e1[k, 0]
+                        v = (dx * qx + dy * qy + dz * qz) * inv
+                        if v < 0.0 or u + v > 1.0:
+                            continue
+                        t = (e2[k, 0] * qx + e2[k, 1] * qy + e2[k, 2] * qz) * inv
+                        if t > EPSILON and t < t_best:
+                            t_best = t
+                            prim_best = k
+                else:
+                    # Primero el hijo más cercano según el signo de la dirección en el eje mayor
+                    child = left[node]
+                    axis = 0
+                    if abs(dy) > abs(dx) and abs(dy) >= abs(dz):
+                        axis = 1
+                    elif abs(dz) > abs(dx) and abs(dz) > abs(dy):
+                        axis = 2
+                    if directions[r, axis] >= 0.0:
+                        stack[top] = child + 1
+                        stack[top + 1] = child
+                    else:
+                        stack[top] = child
+                        stack[top + 1] = child + 1
+                    top += 2
+            best_t[r] = t_best
+            best_prim[r] = prim_best
+        return best_t, best_prim
+
+
+def closest_hits_fast(bvh_arrays, v0, e1, e2, origins, directions, t_max):
+    """Compiled traversal when numba is available, NumPy wavefront otherwise"""
+    if numba is None:
+        return closest_hits(bvh_arrays, v0, e1, e2, origins, directions, t_max)
+    t_max = np.ascontiguousarray(np.broadcast_to(np.asarray(t_max, dtype=float), (len(origins),)))
+    return _closest_hits_jit(bvh_arrays["bounds_min"], bvh_arrays["bounds_max"], bvh_arrays["left"],
+                             bvh_arrays["start"], bvh_arrays["count"], bvh_arrays["depth"], v0, e1, e2, origins,
+                             directions, t_max)
+
+
+# ----------------------------
+# POOL DE PROCESOS
+# ----------------------------
+
+_worker = {}
+
+
+def _init_worker(bvh_arrays, v0, e1, e2):
+    _worker.update(bvh=bvh_arrays, v0=v0, e1=e1, e2=e2)
+
+
+def _cast_packet(args):
+    origins, directions, t_max = args
+    return closest_hits_fast(_worker["bvh"], _worker["v0"], _worker["e1"], _worker["e2"], origins, directions, t_max)
+
+
+# ----------------------------
+# API
+# ----------------------------
+
+class RayHits:
+    """Result of a batch query; t is inf and face/component are -1 where a ray misses.
+    unresolved marks rays whose query gave up before reaching a final answer (see intersect_ignoring)"""
+
+    def __init__(self, t, face, component, origins, directions, unresolved=None):
+        self.t = t
+        self.face = face
+        self.component = component
+        self.origins = origins
+        self.directions = directions
+        self.unresolved = np.zeros(len(t), dtype=bool) if unresolved is None else unresolved
+
+    @property
+    def hit(self):
+        return self.face >= 0
+
+    @property
+    def points(self):
+        return self.origins + np.where(self.hit, self.t, 0)[:, None] * self.directions
+
+
+class RayCaster:
+    """Batch ray queries against an Assembly, with one BVH reused across calls (and runs, via cache)"""
+
+    def __init__(self, model, use_cache=True):
+        self.assembly = model if isinstance(model, Assembly) else Assembly.from_meshes([model])
+        triangles = self.assembly.vertices[self.assembly.faces]
+
+        self.bvh = None
+        cache = DiskLRUCache(BVH_CACHE_DIR) if use_cache else None
+        key = f"{self.assembly.fingerprint()}-sah{SAH_BINS}-leaf{LEAF_SIZE}"
+        if cache is not None:
+            cached = cache.get(key, ".npz")
+            if cached is not None:
+                with np.load(cached) as data:
+                    self.bvh = BVH(**{name: data[name] for name in data.files})
+        if self.bvh is None:
+            self.bvh = build_bvh(triangles)
+            if cache is not None:
+                tmp = cache.path_for(key, ".build.npz")
+                np.savez(tmp, **self.bvh.arrays())
+                cache.put(key, tmp, ".npz")
+                os.remove(tmp)
+
+        # Triángulos en el orden de las hojas: accesos contiguos durante la traversal
+        ordered = triangles[self.bvh.order]
+        self.v0 = ordered[:, 0].copy()
+        self.e1 = ordered[:, 1] - ordered[:, 0]
+        self.e2 = ordered[:, 2] - ordered[:, 0]
+
+    def _packets(self, origins, directions, t_max):
+        for lo in range(0, len(origins), PACKET_SIZE):
+            hi = lo + PACKET_SIZE
+            t = t_max if np.isscalar(t_max) else t_max[lo:hi]
+            yield origins[lo:hi], directions[lo:hi], t
+
+    def intersect(self, origins, directions, t_max=np.inf, processes=1):
+        """Closest hit per ray. directions need not be normalized (t is in units of |direction|)"""
+        origins = np.ascontiguousarray(np.broadcast_to(origins, np.shape(directions)), dtype=float)
+        directions = np.ascontiguousarray(directions, dtype=float)
+        bvh = self.bvh.arrays()
+
+        if numba is not None:
+            # La versión compilada ya reparte los rayos entre núcleos con hilos
+            results = [closest_hits_fast(bvh, self.v0, self.e1, self.e2, origins, directions, t_max)]
+        elif processes == 1 or len(origins) <= PACKET_SIZE:
+            results = [closest_hits(bvh, self.v0, self.e1, self.e2, o, d, t)
+                       for o, d, t in self._packets(origins, directions, t_max)]
+        else:
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                     initargs=(bvh, self.v0, self.e1, self.e2)) as pool:
+                results = list(pool.map(_cast_packet, self._packets(origins, directions, t_max)))
+
+        if results:
+            t = np.concatenate([r[0] for r in results])
+            prim = np.concatenate([r[1] for r in results])
+        else:
+            t = np.zeros(0)
+            prim = np.zeros(0, dtype=np.int64)
+        hit = prim >= 0
+        face = np.where(hit, self.bvh.order[np.maximum(prim, 0)], -1)
+        component = np.where(hit, self.assembly.face_component[np.maximum(face, 0)], -1)
+        t = np.where(hit, t, np.inf)
+        return RayHits(t, face, component, origins, directions)
+
+    def occluded(self, origins, directions, t_max=np.inf, processes=1):
+        """True where something is hit before t_max (shadow / line-of-sight queries)"""
+        return self.intersect(origins, directions, t_max=t_max, processes=processes).hit
+
+    def intersect_ignoring(self, origins, directions, ignore, group=None, t_max=np.inf, max_passes=8, processes=1):
+        """Closest hit skipping ignored components, reusing the same BVH.
+
+        ignore is a boolean (n_components,) mask, or (n_groups, n_components) with group giving the row of
+        every ray. Rays that land on an ignored component are continued from the hit point (up to max_passes);
+        rays still on ignored surfaces after max_passes are returned as misses with unresolved set, so callers
+        must decide whether they count as blocked.
+        """
+        origins = np.ascontiguousarray(np.broadcast_to(origins, np.shape(directions)), dtype=float)
+        directions = np.ascontiguousarray(directions, dtype=float)
+        ignore = np.atleast_2d(ignore)
+        group = np.zeros(len(origins), dtype=np.int64) if group is None else np.asarray(group)
+        t_max = np.broadcast_to(np.asarray(t_max, dtype=float), (len(origins),))
+
+        t = np.full(len(origins), np.inf)
+        face = np.full(len(origins), -1, dtype=np.int64)
+        component = np.full(len(origins), -1, dtype=np.int64)
+        pending = np.arange(len(origins))
+        travelled = np.zeros(len(origins))
+        for _ in range(max_passes):
+            if not len(pending):
+                break
+            hits = self.intersect(origins[pending] + travelled[pending, None] * directions[pending],
+                                  directions[pending], t_max=t_max[pending] - travelled[pending],
+                                  processes=processes)
+            skip = hits.hit & ignore[group[pending], np.maximum(hits.component, 0)]
+            done = pending[hits.hit & ~skip]
+            t[done] = travelled[done] + hits.t[hits.hit & ~skip]
+            face[done] = hits.face[hits.hit & ~skip]
+            component[done] = hits.component[hits.hit & ~skip]
+            # Se continúa justo detrás de la superficie ignorada
+            travelled[pending[skip]] += hits.t[skip] + 1e-6
+            pending = pending[skip]
+        unresolved = np.zeros(len(origins), dtype=bool)
+        unresolved[pending] = True
+        return RayHits(t, face, component, origins, directions, unresolved)
+
+    def intersect_all(self, origins, directions, t_max=np.inf, max_hits=64, processes=1):
+        """Every surface crossing along each ray, sorted by ray and then by t.
+
+        Returns flat arrays (ray, t, face, component); crossings are found by continuing each ray from its
+        last hit, so max_hits bounds the work per ray.
+        """
+        origins = np.ascontiguousarray(np.broadcast_to(origins, np.shape(directions)), dtype=float)
+        directions = np.ascontiguousarray(directions, dtype=float)
+        t_max = np.broadcast_to(np.asarray(t_max, dtype=float), (len(origins),))
+
+        rays, ts, faces = [], [], []
+        pending = np.arange(len(origins))
+        travelled = np.zeros(len(origins))
+        for _ in range(max_hits):
+            if not len(pending):
+                break
+            hits = self.intersect(origins[pending] + travelled[pending, None] * directions[pending],
+                                  directions[pending], t_max=t_max[pending] - travelled[pending],
+                                  processes=processes)
+            pending, t = pending[hits.hit], hits.t[hits.hit]
+            travelled[pending] += t
+            rays.append(pending)
+            ts.append(travelled[pending].copy())
+            faces.append(hits.face[hits.hit])
+            travelled[pending] += 1e-6
+
+        ray = np.concatenate(rays) if rays else np.zeros(0, dtype=np.int64)
+        t = np.concatenate(ts) if ts else np.zeros(0)
+        face = np.concatenate(faces) if faces else np.zeros(0, dtype=np.int64)
+        order = np.lexsort((t, ray))
+        return ray[order], t[order], face[order], self.assembly.face_component[face[order]]
+
+
+def random_directions(n, rng=None):
+    rng = np.random.default_rng(rng)
+    v = rng.normal(size=(n, 3))
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+# ----------------------------
+# MUESTREO DE SUPERFICIES
+# ----------------------------
+
+def _allocate(weights, n):
+    """Integer counts proportional to weights that add up to n (largest remainder)"""
+    share = weights / weights.sum() * n
+    counts = np.floor(share).astype(np.int64)
+    remainder = n - counts.sum()
+    if remainder > 0:
+        counts[np.argsort(share - counts)[::-1][:remainder]] += 1
+    return counts
+
+
+def surface_samples(assembly, index, n_samples, rng=None):
+    """Stratified points on the faces of one component: area-proportional counts per face and jittered
+    low-discrepancy points inside every triangle. Returns points, normals, face index and area per sample."""
+    rng = np.random.default_rng(rng)
+    faces = assembly.component_faces(index)
+    areas = assembly.face_areas[faces]
+    counts = _allocate(areas, n_samples)
+    face = np.repeat(faces, counts)
+
+    # Secuencia R2 (golden ratio 2D) desplazada al azar dentro de cada triángulo
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    g = 1.32471795724474602596
+    uv = (np.outer(local + 0.5, [1 / g, 1 / g ** 2]) + rng.random((len(face), 2)) / np.maximum(np.repeat(counts, counts), 1)[:, None]) % 1.0
+    r1 = np.sqrt(uv[:, 0])
+    a, b = 1 - r1, r1 * (1 - uv[:, 1])
+    triangles = assembly.vertices[assembly.faces[face]]
+    points = a[:, None] * triangles[:, 0] + b[:, None] * triangles[:, 1] + (1 - a - b)[:, None] * triangles[:, 2]
+    weights = assembly.face_areas[face] / np.repeat(counts, counts)
+    return points, assembly.face_normals[face], face, weights
+
+
+if __name__ == "__main__":
+    n_rays = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+
+    ship = falcon_parker_assembly()
+    start = time.perf_counter()
+    caster = RayCaster(ship)
+    print(f"BVH: {caster.bvh.node_count} nodos para {len(ship.faces)} caras ({time.perf_counter() - start:.2f} s)")
+
+    # Rayos desde una esfera alrededor de la nave hacia puntos aleatorios del eje
+    rng = np.random.default_rng(0)
+    center = ship.bounds.mean(axis=0)
+    radius = np.linalg.norm(ship.bounds[1] - ship.bounds[0])
+    origins = center + random_directions(n_rays, rng) * radius
+    targets = center + rng.uniform(-0.5, 0.5, size=(n_rays, 3)) * (ship.bounds[1] - ship.bounds[0])
+    directions = targets - origins
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+
+    start = time.perf_counter()
+    hits = caster.intersect(origins, directions, processes=processes)
+    elapsed = time.perf_counter() - start
+    print(f"{n_rays} rayos en {elapsed:.2f} s ({n_rays / elapsed / 1e6:.2f} Mrayos/s, {processes} procesos), "
+          f"{hits.hit.mean() * 100:.1f}% impactan")
+    counts = np.bincount(hits.component[hits.hit], minlength=len(ship))
+    for i in np.argsort(counts)[::-1][:5]:
+        print(f"  {ship.names[i]:<40} {counts[i]} impactos")
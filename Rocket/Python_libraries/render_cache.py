@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# ----------------------------
+# CONFIGURACIÓN DE LA CACHÉ
+# ----------------------------
+
+# Raíz de todas las cachés (renders, BVH, tablas...); ROCKET_RENDER_CACHE solo cambia la carpeta de renders
+CACHE_ROOT = os.environ.get(
+    "ROCKET_CACHE_ROOT",
+    os.path.join(os.path.expanduser("~"), ".cache", "rocket_structures"),
+)
+CACHE_DIR = os.environ.get("ROCKET_RENDER_CACHE", os.path.join(CACHE_ROOT, "renders"))
+CACHE_MAX_BYTES = int(os.environ.get("ROCKET_RENDER_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+CACHE_DISABLED = os.environ.get("ROCKET_RENDER_CACHE_DISABLE", "") not in ("", "0")
+
+
+def cache_dir(name):
+    """Directory of one of the caches under CACHE_ROOT"""
+    return os.path.join(CACHE_ROOT, name)
+
+
+# ----------------------------
+# HUELLA DE GEOMETRÍA
+# ----------------------------
+
+def geometry_fingerprint(mesh):
+    """Fast digest of vertices, faces and face colors of a trimesh mesh"""
+    digest = hashlib.blake2b(digest_size=16)
+    vertices = np.ascontiguousarray(mesh.vertices, dtype=np.float64)
+    faces = np.ascontiguousarray(mesh.faces, dtype=np.int64)
+    digest.update(np.array(vertices.shape, dtype=np.int64).tobytes())
+    digest.update(vertices.tobytes())
+    digest.update(np.array(faces.shape, dtype=np.int64).tobytes())
+    digest.update(faces.tobytes())
+    visual = getattr(mesh, "visual", None)
+    if visual is not None and getattr(visual, "kind", None) is not None:
+        colors = np.ascontiguousarray(visual.face_colors, dtype=np.uint8)
+        digest.update(colors.tobytes())
+    return digest.hexdigest()
+
+
+def render_key(mesh, camera=None, image=None, renderer=""):
+    """Cache key: geometry fingerprint + camera + image settings + renderer name"""
+    settings = json.dumps(
+        {"camera": camera or {}, "image": image or {}, "renderer": renderer},
+        sort_keys=True,
+        default=str,
+    )
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(geometry_fingerprint(mesh).encode())
+    digest.update(settings.encode())
+    return digest.hexdigest()
+
+
+# ----------------------------
+# CACHÉ LRU EN DISCO
+# ----------------------------
+
+class DiskLRUCache:
+    """Directory of files addressed by key, evicted least-recently-used above max_bytes"""
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path_for(self, key, suffix=".png"):
+        return os.path.join(self.directory, f"{key}{suffix}")
+
+    def get(self, key, suffix=".png"):
+        path = self.path_for(key, suffix)
+        if not os.path.exists(path):
+            return None
+        os.utime(path)  # marca como usado recientemente
+        return path
+
+    def put(self, key, source_path, suffix=".png"):
+        # Copia atómica: otro proceso nunca ve un fichero a medias
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        shutil.copyfile(source_path, tmp_path)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, self.path_for(key, suffix))
+        self.evict()
+        return self.path_for(key, suffix)
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
+
+
+_default_cache = None
+
+
+def default_render_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = DiskLRUCache()
+    return _default_cache
+
+
+# ----------------------------
+# RENDER CON CACHÉ
+# ----------------------------
+
+def cached_render(mesh, filename, render_fn, camera=None, image=None, cache=None):
+    """Run render_fn(mesh, filename) only if the same geometry/camera/image was not rendered before"""
+    if CACHE_DISABLED:
+        render_fn(mesh, filename)
+        return filename
+
+    cache = cache or default_render_cache()
+    suffix = os.path.splitext(filename)[1] or ".png"
+    renderer = getattr(render_fn, "__qualname__", repr(render_fn))
+    key = render_key(mesh, camera=camera, image=image, renderer=renderer)
+
+    cached_path = cache.get(key, suffix)
+    if cached_path is not None:
+        shutil.copyfile(cached_path, filename)
+        print(f"Imagen recuperada de la caché: {filename}")
+        return filename
+
+    render_fn(mesh, filename)
+    cache.put(key, filename, suffix)
+    return filename
@@ -0,0 +1,214 @@
+# shape_index.py
+# Índice de descriptores de forma para buscar piezas STL parecidas (p. ej. las variantes VectorThruster*).
+# Descriptores invariantes a rotación: histograma D2, invariantes de momentos y proporciones de la caja
+# orientada. Se calculan en paralelo y solo se recalculan los ficheros que cambian (mtime y tamaño).
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import trimesh
+
+from render_cache import CACHE_ROOT
+
+D2_BINS = 64
+D2_PAIRS = 16384
+SHAPE_FEATURES = 8
+SEED = 0
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+INDEX_PATH = os.path.join(CACHE_ROOT, "shape_index.npz")
+
+# Peso de cada bloque en la distancia: histograma D2, forma (momentos + proporciones), tamaño absoluto
+D2_WEIGHT, SHAPE_WEIGHT, SIZE_WEIGHT = 1.0, 1.0, 0.25
+
+
+# ----------------------------
+# DESCRIPTORES
+# ----------------------------
+
+def _surface_points(mesh, n, rng):
+    triangles = mesh.triangles
+    areas = mesh.area_faces
+    face = rng.choice(len(triangles), size=n, p=areas / areas.sum())
+    r1, r2 = np.sqrt(rng.random(n)), rng.random(n)
+    t = triangles[face]
+    return (1 - r1)[:, None] * t[:, 0] + (r1 * (1 - r2))[:, None] * t[:, 1] + (r1 * r2)[:, None] * t[:, 2]
+
+
+def shape_descriptor(mesh):
+    """Feature vector: D2 histogram (D2_BINS), shape ratios (SHAPE_FEATURES) and log size"""
+    rng = np.random.default_rng(SEED)
+    points = _surface_points(mesh, 2 * D2_PAIRS, rng)
+    distances = np.linalg.norm(points[:D2_PAIRS] - points[D2_PAIRS:], axis=1)
+    # Distancias relativas a la media: el histograma no depende de la escala
+    scale = max(distances.mean(), 1e-12)
+    hist, _ = np.histogram(distances / scale, bins=D2_BINS, range=(0, 4))
+    hist = hist / D2_PAIRS
+
+    # Momentos de segundo orden de la superficie: autovalores invariantes a la rotación
+    centered = points - points.mean(axis=0)
+    eig = np.sort(np.linalg.eigvalsh(centered.T @ centered / len(points)))[::-1]
+    eig = np.maximum(eig, 1e-18)
+    j1, j2, j3 = eig.sum(), eig[0] * eig[1] + eig[1] * eig[2] + eig[2] * eig[0], eig.prod()
+
+    # Caja orientada por los ejes principales
+    _, axes = np.linalg.eigh(np.cov(mesh.vertices.T))
+    extents = np.sort(np.ptp(mesh.vertices @ axes, axis=0))[::-1]
+    extents = np.maximum(extents, 1e-12)
+
+    hull = mesh.convex_hull
+    volume = abs(mesh.volume) if mesh.is_watertight else hull.volume
+    sphericity = np.pi ** (1 / 3) * (6 * volume) ** (2 / 3) / max(mesh.area, 1e-12)
+    shape = np.array([eig[1] / eig[0], eig[2] / eig[0], j2 / j1 ** 2, j3 / j1 ** 3 * 27,
+                      extents[1] / extents[0], extents[2] / extents[0],
+                      min(sphericity, 1.0), volume / max(hull.volume, 1e-12)])
+    size = np.log10(np.linalg.norm(extents))
+    return np.concatenate([hist, shape, [size]]).astype(np.float32)
+
+
+def _weights():
+    return np.concatenate([np.full(D2_BINS, D2_WEIGHT * 4.0), np.full(SHAPE_FEATURES, SHAPE_WEIGHT),
+                           [SIZE_WEIGHT]]).astype(np.float32)
+
+
+def _describe_file(path):
+    """(path, descriptor, error); descriptor is None and error says why when the file cannot be indexed"""
+    try:
+        mesh = trimesh.load(path, force="mesh")
+        if len(mesh.faces) == 0:
+            return path, None, "malla vacía"
+        return path, shape_descriptor(mesh), None
+    except Exception as exc:  # ficheros corruptos o vacíos no paran el índice
+        return path, None, str(exc)
+
+
+# ----------------------------
+# ÍNDICE
+# ----------------------------
+
+def find_stl_files(roots):
+    files = []
+    for root in roots:
+        for folder, dirs, names in os.walk(root):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            files.extend(os.path.join(folder, name) for name in names if name.lower().endswith(".stl"))
+    return sorted(os.path.abspath(f) for f in files)
+
+
+class ShapeIndex:
+    """Compact array index: one float32 row per part plus the (mtime, size) it was computed from.
+    Files that could not be read are kept in failed with their (mtime, size) and skipped until they change"""
+
+    def __init__(self, paths=(), stamps=None, features=None, failed=None):
+        self.paths = list(paths)
+        self.stamps = np.zeros((0, 2), dtype=np.int64) if stamps is None else np.asarray(stamps, dtype=np.int64)
+        width = D2_BINS + SHAPE_FEATURES + 1
+        self.features = np.zeros((0, width), dtype=np.float32) if features is None else np.asarray(features, dtype=np.float32)
+        self.failed = {} if failed is None else {p: tuple(int(v) for v in s) for p, s in dict(failed).items()}
+        self._weights = _weights()
+
+    def __len__(self):
+        return len(self.paths)
+
+    @classmethod
+    def load(cls, filename=INDEX_PATH):
+        if not os.path.exists(filename):
+            return cls()
+        with np.load(filename) as data:
+            failed = (zip([str(p) for p in data["failed_paths"]], data["failed_stamps"])
+                      if "failed_paths" in data.files else None)
+            return cls([str(p) for p in data["paths"]], data["stamps"], data["features"], failed)
+
+    def save(self, filename=INDEX_PATH):
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        tmp = filename + ".tmp.npz"
+        np.savez(tmp, paths=np.array(self.paths), stamps=self.stamps, features=self.features,
+                 failed_paths=np.array(list(self.failed), dtype=str),
+                 failed_stamps=np.array(list(self.failed.values()), dtype=np.int64).reshape(-1, 2))
+        os.replace(tmp, filename)
+        return filename
+
+    def update(self, roots, processes=None, verbose=False):
+        """Add new files, recompute changed ones and drop deleted ones; returns (added/changed, removed)"""
+        files = find_stl_files(roots)
+        stamps = {}
+        for path in files:
+            st = os.stat(path)
+            stamps[path] = (st.st_mtime_ns, st.st_size)
+        known = {path: i for i, path in enumerate(self.paths)}
+        stale = [p for p in files if self.failed.get(p) != stamps[p]
+                 and (p not in known or tuple(self.stamps[known[p]]) != stamps[p])]
+        stale_set = set(stale)
+        keep = [i for i, p in enumerate(self.paths) if p in stamps and p not in stale_set]
+        removed = len(self.paths) - len(keep) - sum(1 for p in stale if p in known)
+
+        if processes == 1 or len(stale) <= 1:
+            results = [_describe_file(p) for p in stale]
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                results = list(pool.map(_describe_file, stale))
+        fresh = [(p, f) for p, f, _ in results if f is not None]
+        failures = [(p, error) for p, f, error in results if f is None]
+        self.failed = {p: s for p, s in self.failed.items() if p in stamps and p not in stale_set}
+        self.failed.update((p, stamps[p]) for p, _ in failures)
+        if verbose:
+            for p, error in failures:
+                print(f"No se pudo leer {p}: {error}")
+
+        self.paths = [self.paths[i] for i in keep] + [p for p, _ in fresh]
+        self.stamps = np.array([self.stamps[i] for i in keep] + [stamps[p] for p, _ in fresh],
+                               dtype=np.int64).reshape(-1, 2)
+        self.features = np.vstack([self.features[keep]] + [f[None] for _, f in fresh]).astype(np.float32)
+        return len(fresh), removed
+
+    def query(self, target, k=5, exclude_self=True):
+        """k nearest parts to an STL path, a mesh or a descriptor: list of (path, distance)"""
+        if isinstance(target, str):
+            descriptor = shape_descriptor(trimesh.load(target, force="mesh"))
+            self_path = os.path.abspath(target)
+        else:
+            descriptor = target if isinstance(target, np.ndarray) else shape_descriptor(target)
+            self_path = None
+        distances = np.sqrt((((self.features - descriptor) * self._weights) ** 2).sum(axis=1))
+        if exclude_self and self_path in self.paths:
+            distances[self.paths.index(self_path)] = np.inf
+        k = min(k, len(distances))
+        nearest = np.argpartition(distances, k - 1)[:k] if k < len(distances) else np.arange(len(distances))
+        nearest = nearest[np.argsort(distances[nearest])]
+        return [(self.paths[i], float(distances[i])) for i in nearest if np.isfinite(distances[i])]
+
+    def similar_pairs(self, threshold):
+        """Pairs of indexed parts closer than threshold (candidate duplicates)"""
+        weighted = self.features * self._weights
+        sq = (weighted ** 2).sum(axis=1)
+        distances = np.sqrt(np.maximum(sq[:, None] + sq[None, :] - 2 * weighted @ weighted.T, 0))
+        i, j = np.nonzero(np.triu(distances < threshold, k=1))
+        return [(self.paths[a], self.paths[b], float(distances[a, b])) for a, b in zip(i, j)]
+
+
+if __name__ == "__main__":
+    # Uso: python shape_index.py [pieza.stl] [k]
+    index = ShapeIndex.load()
+    start = time.perf_counter()
+    changed, removed = index.update([REPO_ROOT], verbose=True)
+    index.save()
+    print(f"Índice: {len(index)} piezas ({changed} recalculadas, {removed} eliminadas) en "
+          f"{time.perf_counter() - start:.2f} s -> {INDEX_PATH}")
+
+    if len(sys.argv) > 1:
+        k = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+        start = time.perf_counter()
+        matches = index.query(sys.argv[1], k)
+        print(f"Piezas parecidas a {os.path.basename(sys.argv[1])} ({(time.perf_counter() - start) * 1000:.1f} ms):")
+        for path, distance in matches:
+            print(f"  {distance:7.4f}  {os.path.relpath(path, REPO_ROOT)}")
+    else:
+        for path in index.paths:
+            if "VectorThruster" in path:
+                start = time.perf_counter()
+                descriptor = index.features[index.paths.index(path)]
+                nearest, distance = next(m for m in index.query(descriptor, 2) if m[0] != path)
+                print(f"  {os.path.basename(path):<30} -> {os.path.basename(nearest):<30} "
+                      f"{distance:.4f} ({(time.perf_counter() - start) * 1000:.2f} ms)")
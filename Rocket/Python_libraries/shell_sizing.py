@@ -0,0 +1,262 @@
+# shell_sizing.py
+# Dimensionado de cáscaras delgadas: fuselaje de create_advanced_fuselage y depósitos de propulsante.
+# Tensiones de membrana (circunferencial, axial, cúpula), pandeo con factores de reducción NASA SP-8007 /
+# SP-8032 y espesor mínimo por bisección vectorizada sobre rejillas radio x longitud x material.
+# Los espesores resultantes se pasan a MassModel (mass_properties.py).
+
+import sys
+import time
+
+import numpy as np
+
+from frame_fe import FALCON9_LOAD_FACTORS, FRAME_MATERIALS, G0
+
+# Límite elástico y de rotura (Pa) de los materiales de FRAME_MATERIALS
+MATERIAL_STRENGTH = {
+    "aluminium": (276e6, 310e6),           # 6061-T6
+    "aluminium_2219": (352e6, 455e6),      # 2219-T87, depósitos criogénicos
+    "titanium": (880e6, 950e6),            # Ti-6Al-4V
+    "steel": (1000e6, 1100e6),             # 4130 templado
+    "carbon_composite": (500e6, 550e6),    # laminado cuasi-isótropo
+}
+
+SF_YIELD, SF_ULTIMATE, SF_BUCKLING = 1.1, 1.4, 1.4
+MIN_GAUGE = 0.5e-3           # m
+BISECTION_STEPS = 50
+
+# Presiones de ullage típicas (Pa): la alimentación por bombas necesita poca presión en el depósito;
+# la alimentación a presión desplaza el propulsante directamente (TANK PRESSURIZATION, MERLINTEMPERATURECLEAN.txt)
+TANK_PRESSURE = {"pump_fed": 0.35e6, "pressure_fed": 2.5e6}
+CABIN_PRESSURE = 101.3e3
+
+# Los modos -2 y -1 no son ratios: ni el espesor máximo cumple / basta el espesor mínimo
+MODES = ("hoop", "axial", "axial_buckling", "external_pressure", "dome_pressure", "dome_buckling", "infeasible",
+         "min_gauge")
+
+
+class VesselMaterial:
+    """Isotropic wall material; has a .density (kg/m³) so it can be handed to MassModel.set_material"""
+
+    def __init__(self, name, E, nu, density, yield_strength, ultimate_strength):
+        self.name = name
+        self.E = E
+        self.nu = nu
+        self.density = density
+        self.yield_strength = yield_strength
+        self.ultimate_strength = ultimate_strength
+
+    def __repr__(self):
+        return f"VesselMaterial({self.name!r})"
+
+
+VESSEL_MATERIALS = {name: VesselMaterial(name, *FRAME_MATERIALS[name], *MATERIAL_STRENGTH[name])
+                    for name in MATERIAL_STRENGTH}
+
+
+def allowable_stress(material):
+    """Membrane allowable (Pa): the lower of yield / SF_YIELD and ultimate / SF_ULTIMATE"""
+    return min(material.yield_strength / SF_YIELD, material.ultimate_strength / SF_ULTIMATE)
+
+
+# ----------------------------
+# TENSIONES Y PANDEO
+# ----------------------------
+
+def membrane_stresses(pressure, radius, thickness, axial_load=0.0, bending_moment=0.0):
+    """(hoop, axial min, axial max, dome) stresses in Pa; axial_load positive in tension"""
+    hoop = pressure * radius / thickness
+    axial = pressure * radius / (2 * thickness) + axial_load / (2 * np.pi * radius * thickness)
+    bending = bending_moment / (np.pi * radius ** 2 * thickness)
+    return hoop, axial - bending, axial + bending, pressure * radius / (2 * thickness)
+
+
+def knockdown_axial(radius, thickness):
+    """NASA SP-8007: γ = 1 - 0.901 (1 - exp(-φ)), φ = sqrt(R/t) / 16"""
+    return 1 - 0.901 * (1 - np.exp(-np.sqrt(radius / thickness) / 16))
+
+
+def knockdown_bending(radius, thickness):
+    """NASA SP-8007: γ = 1 - 0.731 (1 - exp(-φ))"""
+    return 1 - 0.731 * (1 - np.exp(-np.sqrt(radius / thickness) / 16))
+
+
+def classical_axial_stress(E, nu, radius, thickness):
+    return E * thickness / (radius * np.sqrt(3 * (1 - nu ** 2)))
+
+
+def axial_buckling_ratio(radius, thickness, E, nu, compression, bending_compression):
+    """Interaction ratio of axial compression and bending against their knocked-down critical stresses
+    (internal-pressure stabilization is conservatively ignored)"""
+    sigma = classical_axial_stress(E, nu, radius, thickness)
+    return (compression / (knockdown_axial(radius, thickness) * sigma)
+            + bending_compression / (knockdown_bending(radius, thickness) * sigma))
+
+
+def external_pressure_critical(radius, length, thickness, E, gamma=0.56):
+    """Lateral pressure buckling of a moderate-length cylinder: 0.92 γ E (R/L) (t/R)^2.5 (SP-8007)"""
+    return 0.92 * gamma * E * (radius / length) * (thickness / radius) ** 2.5
+
+
+def dome_buckling_critical(radius, thickness, E, nu):
+    """Hemispherical dome under external pressure (SP-8032): γ 2E (t/R)² / sqrt(3(1-ν²)),
+    γ = 0.14 + 3.2 / λ², λ = 2 (3(1-ν²))^¼ sqrt(R/t)"""
+    lam = 2 * (3 * (1 - nu ** 2)) ** 0.25 * np.sqrt(radius / thickness)
+    gamma = np.minimum(0.14 + 3.2 / lam ** 2, 1.0)
+    return gamma * 2 * E * (thickness / radius) ** 2 / np.sqrt(3 * (1 - nu ** 2))
+
+
+# ----------------------------
+# DIMENSIONADO
+# ----------------------------
+
+def _cylinder_ratios(t, R, L, E, nu, allowable, p_int, p_ext, axial_load, bending):
+    """(..., 4) demand/capacity ratios of the cylinder wall, <= 1 is acceptable"""
+    net = p_int - p_ext
+    hoop, axial_min, axial_max, _ = membrane_stresses(net, R, t, axial_load, bending)
+    compression = np.maximum(-(net * R / (2 * t) + axial_load / (2 * np.pi * R * t)), 0.0)
+    bending_compression = bending / (np.pi * R ** 2 * t)
+    return np.stack([
+        np.abs(hoop) / allowable,
+        np.maximum(np.abs(axial_min), np.abs(axial_max)) / allowable,
+        SF_BUCKLING * axial_buckling_ratio(R, t, E, nu, compression, bending_compression),
+        SF_BUCKLING * np.maximum(p_ext - p_int, 0.0) / external_pressure_critical(R, L, t, E),
+    ], axis=-1)
+
+
+def _dome_ratios(t, R, E, nu, allowable, p_int, p_ext):
+    net = p_int - p_ext
+    return np.stack([np.abs(net) * R / (2 * t) / allowable,
+                     SF_BUCKLING * np.maximum(-net, 0.0) / dome_buckling_critical(R, t, E, nu)], axis=-1)
+
+
+def _bisect(ratios, t_max, shape):
+    """Smallest t in [MIN_GAUGE, t_max] with every ratio <= 1 (ratios fall monotonically with t); NaN with
+    mode -2 (infeasible) where not even t_max passes"""
+    lo = np.full(shape, MIN_GAUGE)
+    hi = np.broadcast_to(t_max, shape).astype(float)
+    ok_at_min = ratios(lo).max(axis=-1) <= 1
+    for _ in range(BISECTION_STEPS):
+        mid = (lo + hi) / 2
+        feasible = ratios(mid).max(axis=-1) <= 1
+        hi = np.where(feasible, mid, hi)
+        lo = np.where(feasible, lo, mid)
+    ok_at_max = ratios(hi).max(axis=-1) <= 1
+    t = np.where(ok_at_min, MIN_GAUGE, np.where(ok_at_max, hi, np.nan))
+    governing = np.where(ok_at_min, -1, np.where(ok_at_max, ratios(hi).argmax(axis=-1), -2))
+    return t, governing
+
+
+class SizingResult:
+    """Minimum wall (cylinder) and dome thickness over a radius x length x material grid"""
+
+    def __init__(self, radius, length, materials, wall, dome, wall_mode, dome_mode):
+        self.radius = radius
+        self.length = length
+        self.materials = list(materials)
+        self.wall = wall              # (R, L, M) m
+        self.dome = dome              # (R, 1, M) m
+        self.wall_mode = wall_mode    # índices de MODES
+        self.dome_mode = dome_mode
+
+    def mass(self, domes=2):
+        """Structural mass (kg): cylinder plus domes (two hemispheres by default, 0 for an open fuselage);
+        NaN for infeasible designs"""
+        rho = np.array([VESSEL_MATERIALS[m].density for m in self.materials])
+        R, L = self.radius[:, None, None], self.length[None, :, None]
+        dome = np.nan_to_num(self.dome) if domes == 0 else self.dome
+        return rho * (2 * np.pi * R * L * self.wall + domes * 2 * np.pi * R ** 2 * dome)
+
+    def governing(self, i, j, k):
+        """(wall, dome) governing mode names of one design"""
+        wall, dome = self.wall_mode[i, j, k], self.dome_mode[i, 0, k]
+        return MODES[wall], MODES[4 + dome] if dome >= 0 else MODES[dome]
+
+    def lightest(self, domes=2):
+        """Index of the lightest feasible material per (radius, length), -1 where none is feasible"""
+        mass = self.mass(domes)
+        feasible = ~np.isnan(mass)
+        return np.where(feasible.any(axis=-1), np.where(feasible, mass, np.inf).argmin(axis=-1), -1)
+
+
+def size_vessel(radius, length, materials=None, internal_pressure=0.0, external_pressure=0.0, axial_load=0.0,
+                bending_moment=0.0):
+    """Minimum thicknesses for every radius x length x material; loads are limit loads (N, N·m, Pa)
+    and broadcast over the grid"""
+    materials = list(VESSEL_MATERIALS) if materials is None else list(materials)
+    R = np.atleast_1d(np.asarray(radius, dtype=float))[:, None, None]
+    L = np.atleast_1d(np.asarray(length, dtype=float))[None, :, None]
+    mats = [VESSEL_MATERIALS[m] for m in materials]
+    E = np.array([m.E for m in mats])
+    nu = np.array([m.nu for m in mats])
+    allowable = np.array([allowable_stress(m) for m in mats])
+    shape = np.broadcast_shapes(R.shape, L.shape, E.shape)
+
+    wall, wall_mode = _bisect(lambda t: _cylinder_ratios(t, R, L, E, nu, allowable, internal_pressure,
+                                                         external_pressure, axial_load, bending_moment),
+                              R / 5, shape)
+    dome, dome_mode = _bisect(lambda t: _dome_ratios(t, R, E, nu, allowable, internal_pressure, external_pressure),
+                              R / 5, (shape[0], 1, shape[2]))
+    return SizingResult(R[:, 0, 0], L[0, :, 0], materials, wall, dome, wall_mode, dome_mode)
+
+
+def launch_loads(mass, arm, factors=None):
+    """Worst axial compression (N, negative) and bending moment (N·m) over the load-factor envelope for a
+    mass above the section with its centre of mass at arm"""
+    factors = FALCON9_LOAD_FACTORS if factors is None else factors
+    axial = min(-a * mass * G0 for a, _ in factors.values())
+    bending = max(l * mass * G0 * arm for _, l in factors.values())
+    return axial, bending
+
+
+def apply_to_mass_model(model, prefix, material, thickness):
+    """Feed a sized wall back into a MassModel; returns how many components were recomputed"""
+    if not np.isfinite(thickness):
+        raise ValueError(f"{prefix}: infeasible design ({material} has no thickness up to R/5)")
+    return model.set_material(prefix, VESSEL_MATERIALS[material], thickness)
+
+
+if __name__ == "__main__":
+    # Uso: python shell_sizing.py [puntos_de_rejilla]
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    import Pannels_antennaSolarParker_render as ship
+    from assembly import falcon_parker_assembly
+    from mass_properties import MassModel
+
+    assembly = falcon_parker_assembly()
+    model = MassModel(assembly)
+    total = model.total()
+    # Sección de la base del fuselaje: carga toda la masa con el centro de masas como brazo
+    axial, bending = launch_loads(total.mass, total.center[2])
+
+    radii = np.linspace(0.5, 3.0, n)
+    lengths = np.linspace(2.0, 40.0, n)
+    start = time.perf_counter()
+    grid = size_vessel(radii, lengths, internal_pressure=CABIN_PRESSURE, axial_load=axial, bending_moment=bending)
+    elapsed = time.perf_counter() - start
+    print(f"Rejilla {n}x{n}x{len(grid.materials)} ({grid.wall.size} diseños) en {elapsed * 1000:.0f} ms; "
+          f"masa {total.mass:.0f} kg, compresión {-axial / 1e3:.0f} kN, flexión {bending / 1e3:.0f} kN·m")
+
+    # Fuselaje de create_advanced_fuselage
+    fuselage = size_vessel(ship.FUSELAGE_RADIUS, ship.FUSELAGE_LENGTH, internal_pressure=CABIN_PRESSURE,
+                           axial_load=axial, bending_moment=bending)
+    mass = fuselage.mass(domes=0)[0, 0]
+    for k, material in enumerate(fuselage.materials):
+        print(f"  {material:<18} pared {fuselage.wall[0, 0, k] * 1000:6.2f} mm "
+              f"({fuselage.governing(0, 0, k)[0]:<15}) masa {mass[k]:7.0f} kg")
+    best = int(fuselage.lightest(domes=0)[0, 0])
+    if best < 0:
+        print("MassModel: structure/fuselage sin diseño factible con ningún material, no se modifica")
+    else:
+        material, thickness = fuselage.materials[best], float(fuselage.wall[0, 0, best])
+        before = model.total().mass
+        changed = apply_to_mass_model(model, "structure/fuselage", material, thickness)
+        print(f"MassModel: structure/fuselage -> {material} {thickness * 1000:.2f} mm ({changed} componente "
+              f"recalculado), masa total {before:.0f} -> {model.total().mass:.0f} kg")
+
+    # Depósitos de propulsante: alimentación por bombas frente a alimentación a presión
+    tank_radii = np.array([0.5, 1.0, 1.35])
+    for feed, pressure in TANK_PRESSURE.items():
+        tanks = size_vessel(tank_radii, [4.0], ["aluminium_2219", "titanium"], internal_pressure=pressure)
+        rows = ", ".join(f"R={r:.2f} m: {tanks.wall[i, 0, 0] * 1000:.2f}/{tanks.dome[i, 0, 0] * 1000:.2f} mm"
+                         for i, r in enumerate(tank_radii))
+        print(f"  Depósito {feed:<13} ({pressure / 1e6:.2f} MPa, 2219): {rows}")
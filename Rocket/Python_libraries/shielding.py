@@ -0,0 +1,230 @@
+# shielding.py
+# Análisis sectorial de blindaje: rayos en 4π desde puntos de dosis, recorrido por componente y
+# densidad superficial (g/cm²) según la tabla de materiales.
+# La geometría se traza una vez; cambiar materiales o espesores solo re-pondera el resultado guardado.
+
+import hashlib
+import os
+import sys
+import time
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from assembly import falcon_parker_assembly
+from ray_caster import RayCaster
+from render_cache import DiskLRUCache, cache_dir
+
+SECTOR_RAYS = 4096
+MAX_CROSSINGS = 64     # cruces por rayo en la primera pasada; se amplía si algún rayo llega al tope
+SECTOR_CACHE_DIR = cache_dir("shielding")
+
+# Densidades en g/cm³ (materiales de SpaceComponentsExample.py / ComponentsDiffuserHeat.py)
+MATERIAL_DENSITY = {
+    "hdpe": 0.95,
+    "boron": 2.34,
+    "tantalum": 16.69,
+    "tungsten": 19.25,
+    "aluminium": 2.70,
+    "carbon_composite": 1.60,
+    "water": 1.00,
+    "void": 0.0,
+}
+
+# prefijo de componente -> (material, espesor de pared en m; None = sólido macizo)
+DEFAULT_TAGS = {
+    "structure/fuselage": ("aluminium", 0.004),
+    "structure/": ("aluminium", 0.002),
+    "shielding/": ("hdpe", 0.02),
+    "thermal/": ("carbon_composite", 0.01),
+    "modules/": ("aluminium", 0.003),
+    "propulsion/": ("aluminium", 0.005),
+    "power/": ("carbon_composite", 0.002),
+    "": ("aluminium", 0.001),
+}
+
+
+# ----------------------------
+# DIRECCIONES
+# ----------------------------
+
+def sector_directions(n):
+    """Fibonacci lattice on the sphere: n directions with (almost) equal solid angle"""
+    k = np.arange(n) + 0.5
+    z = 1 - 2 * k / n
+    phi = np.pi * (1 + 5 ** 0.5) * k
+    r = np.sqrt(1 - z ** 2)
+    return np.column_stack([r * np.cos(phi), r * np.sin(phi), z])
+
+
+def component_dose_points(assembly, names):
+    """Dose point at the centre of each named component (e.g. crew or electronics modules)"""
+    points = []
+    for name in names:
+        mesh = assembly.meshes[assembly.index(name)]
+        points.append(mesh.center_mass if mesh.is_watertight else mesh.bounds.mean(axis=0))
+    return np.array(points)
+
+
+def resolve_tags(names, tags=None, densities=None):
+    """Per-component density (g/cm³) and wall thickness (m, nan for solids); first matching prefix wins"""
+    tags = DEFAULT_TAGS if tags is None else tags
+    densities = MATERIAL_DENSITY if densities is None else densities
+    rho = np.zeros(len(names))
+    thickness = np.full(len(names), np.nan)
+    for i, name in enumerate(names):
+        material, wall = next((tag for prefix, tag in tags.items() if name.startswith(prefix)), ("void", None))
+        rho[i] = densities[material]
+        if wall is not None:
+            thickness[i] = wall
+    return rho, thickness
+
+
+# ----------------------------
+# TRAZADO (GEOMETRÍA PURA)
+# ----------------------------
+
+class SectorTrace:
+    """Material-independent trace: for each (dose point, direction, component) the solid chord length and
+    the sum of 1/|cos| over wall crossings, stored as sparse entries"""
+
+    def __init__(self, names, points, directions, point, direction, component, chord, obliquity):
+        self.names = list(names)
+        self.points = points
+        self.directions = directions
+        self.point = point            # índices de las entradas dispersas
+        self.direction = direction
+        self.component = component
+        self.chord = chord            # recorrido dentro del sólido (m)
+        self.obliquity = obliquity    # Σ 1/|cos θ| de los cruces de pared
+
+    def areal_density(self, tags=None, densities=None):
+        """(points, directions) areal density in g/cm² for a material assignment"""
+        rho, thickness = resolve_tags(self.names, tags, densities)
+        wall = thickness[self.component]
+        path = np.where(np.isnan(wall), self.chord, np.nan_to_num(wall) * self.obliquity)
+        n_dirs = len(self.directions)
+        bucket = self.point * n_dirs + self.direction
+        density = np.bincount(bucket, rho[self.component] * path * 100.0, minlength=len(self.points) * n_dirs)
+        return density.reshape(len(self.points), n_dirs)
+
+    def component_contribution(self, tags=None, densities=None):
+        """(points, components) areal density averaged over the sphere, to see which parts shield most"""
+        rho, thickness = resolve_tags(self.names, tags, densities)
+        wall = thickness[self.component]
+        path = np.where(np.isnan(wall), self.chord, np.nan_to_num(wall) * self.obliquity)
+        bucket = self.point * len(self.names) + self.component
+        total = np.bincount(bucket, rho[self.component] * path * 100.0,
+                            minlength=len(self.points) * len(self.names))
+        return total.reshape(len(self.points), len(self.names)) / len(self.directions)
+
+    def save_npz(self, filename):
+        np.savez(filename, names=np.array(self.names), points=self.points, directions=self.directions,
+                 point=self.point, direction=self.direction, component=self.component,
+                 chord=self.chord, obliquity=self.obliquity)
+        return filename
+
+    @classmethod
+    def load_npz(cls, filename):
+        with np.load(filename) as data:
+            return cls([str(n) for n in data["names"]], data["points"], data["directions"], data["point"],
+                       data["direction"], data["component"], data["chord"], data["obliquity"])
+
+
+def trace_sectors(assembly, points, n_directions=SECTOR_RAYS, caster=None, processes=1, use_cache=True):
+    """Cast n_directions rays from every dose point and record every surface crossing"""
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    key = f"{assembly.fingerprint()}-{hashlib.blake2b(points.tobytes(), digest_size=8).hexdigest()}-n{n_directions}"
+    cache = DiskLRUCache(SECTOR_CACHE_DIR) if use_cache else None
+    if cache is not None:
+        cached = cache.get(key, ".npz")
+        if cached is not None:
+            return SectorTrace.load_npz(cached)
+
+    caster = caster if caster is not None else RayCaster(assembly)
+    directions = sector_directions(n_directions)
+    origins = np.repeat(points, n_directions, axis=0)
+    ray_dirs = np.tile(directions, (len(points), 1))
+    # Un rayo truncado deja la última entrada sin su salida y descuadra la cuerda: se repite con más cruces
+    max_hits = MAX_CROSSINGS
+    while True:
+        ray, t, face, component = caster.intersect_all(origins, ray_dirs, max_hits=max_hits, processes=processes)
+        if not len(ray) or np.bincount(ray).max() < max_hits:
+            break
+        max_hits *= 4
+
+    # Sólidos: cada salida suma +t y cada entrada -t (el punto puede estar dentro del componente)
+    cos = np.einsum("ij,ij->i", ray_dirs[ray], assembly.face_normals[face])
+    signed_t = np.where(cos > 0, t, -t)
+    inv_cos = 1.0 / np.maximum(np.abs(cos), 0.05)   # se acota el rasante a ~87°
+
+    n_components = len(assembly)
+    bucket = ray * n_components + component
+    unique, inverse = np.unique(bucket, return_inverse=True)
+    chord = np.maximum(np.bincount(inverse, signed_t), 0.0)
+    obliquity = np.bincount(inverse, inv_cos)
+    ray_of, component_of = unique // n_components, unique % n_components
+
+    trace = SectorTrace(assembly.names, points, directions, ray_of // n_directions, ray_of % n_directions,
+                        component_of, chord, obliquity)
+    if cache is not None:
+        tmp = cache.path_for(key, ".build.npz")
+        trace.save_npz(tmp)
+        cache.put(key, tmp, ".npz")
+        os.remove(tmp)
+    return trace
+
+
+# ----------------------------
+# RESUMEN Y MAPAS
+# ----------------------------
+
+def shielding_distribution(density, levels=(1, 5, 10, 20, 50)):
+    """Fraction of the 4π sphere with areal density below each level (g/cm²), per dose point"""
+    density = np.atleast_2d(density)
+    return {level: (density < level).mean(axis=1) for level in levels}
+
+
+def plot_sector_map(trace, density, point_index=0, filename="shielding_map.png", dpi=150):
+    directions = trace.directions
+    lon = np.arctan2(directions[:, 1], directions[:, 0])
+    lat = np.arcsin(np.clip(directions[:, 2], -1, 1))
+    fig = Figure(figsize=(10, 5.5))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111, projection="mollweide")
+    sc = ax.scatter(lon, lat, c=density[point_index], s=6, cmap="viridis")
+    fig.colorbar(sc, ax=ax, orientation="horizontal", pad=0.08, label="Densidad superficial (g/cm²)")
+    px, py, pz = trace.points[point_index]
+    ax.set_title(f"Blindaje 4π desde ({px:.2f}, {py:.2f}, {pz:.2f}) m")
+    ax.grid(True, alpha=0.3)
+    fig.savefig(filename, dpi=dpi)
+    return filename
+
+
+if __name__ == "__main__":
+    # Uso: python shielding.py [rayos_por_punto]
+    n_directions = int(sys.argv[1]) if len(sys.argv) > 1 else SECTOR_RAYS
+    ship = falcon_parker_assembly()
+    dose_names = ["modules/scientific_module", "modules/payload_module", "modules/dome"]
+    points = component_dose_points(ship, dose_names)
+
+    start = time.perf_counter()
+    trace = trace_sectors(ship, points, n_directions)
+    print(f"{len(points)} puntos x {n_directions} rayos trazados en {time.perf_counter() - start:.2f} s")
+
+    swaps = {
+        "HDPE 2 cm": DEFAULT_TAGS,
+        "Tantalio 2 mm": {**DEFAULT_TAGS, "shielding/": ("tantalum", 0.002)},
+        "Wolframio 2 mm": {**DEFAULT_TAGS, "shielding/": ("tungsten", 0.002)},
+    }
+    for label, tags in swaps.items():
+        start = time.perf_counter()
+        density = trace.areal_density(tags)
+        below = shielding_distribution(density)[5]
+        print(f"{label} ({(time.perf_counter() - start) * 1000:.1f} ms):")
+        for p, name in enumerate(dose_names):
+            print(f"  {name:<28} media {density[p].mean():6.2f} g/cm²  mínima {density[p].min():5.2f}  "
+                  f"<5 g/cm² en {below[p] * 100:4.1f}% de 4π")
+    plot_sector_map(trace, trace.areal_density(), 0, "shielding_map.png")
+    print("Mapa guardado en shielding_map.png")
@@ -0,0 +1,176 @@
+# solar_shadowing.py
+# Fracción iluminada de paneles solares y radiadores a lo largo de un perfil de órbita/actitud.
+# Los puntos de muestreo y el BVH se crean una vez y se reutilizan en todos los instantes.
+
+import csv
+import sys
+import time
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from assembly import falcon_parker_assembly
+from ray_caster import RayCaster, surface_samples
+
+SAMPLES_PER_PANEL = 512
+RAYS_PER_BATCH = 2_000_000   # acota la memoria: instantes por lote = RAYS_PER_BATCH / muestras
+DEFAULT_TARGETS = ("power/solar_panel", "thermal/radiator_panel")
+
+
+# ----------------------------
+# PERFILES DE SOL
+# ----------------------------
+
+def orbit_sun_vectors(n_steps, beta_deg=0.0, axis=(0, 0, 1), eclipse_fraction=0.0):
+    """Sun direction in body axes over one orbit of a vehicle rotating about `axis` once per orbit.
+
+    beta_deg is the angle between the sun and the plane normal to `axis`. Steps inside the eclipse arc
+    (centred opposite to the start) get a zero vector.
+    """
+    axis = np.asarray(axis, dtype=float)
+    axis /= np.linalg.norm(axis)
+    e1 = np.cross(axis, [1, 0, 0] if abs(axis[0]) < 0.9 else [0, 1, 0])
+    e1 /= np.linalg.norm(e1)
+    e2 = np.cross(axis, e1)
+
+    theta = np.linspace(0, 2 * np.pi, n_steps, endpoint=False)
+    beta = np.radians(beta_deg)
+    sun = np.cos(beta) * (np.outer(np.cos(theta), e1) + np.outer(np.sin(theta), e2)) + np.sin(beta) * axis
+    in_eclipse = np.abs(theta - np.pi) < eclipse_fraction * np.pi
+    sun[in_eclipse] = 0.0
+    return sun
+
+
+def load_sun_vectors(path):
+    """Text file with 'x y z' or 't x y z' per line (body axes); returns times and vectors"""
+    data = np.atleast_2d(np.loadtxt(path))
+    if data.shape[1] == 3:
+        return np.arange(len(data), dtype=float), data
+    return data[:, 0], data[:, 1:4]
+
+
+# ----------------------------
+# PANELES A ANALIZAR
+# ----------------------------
+
+def panel_targets(assembly, prefixes=DEFAULT_TARGETS):
+    """Component indices to analyse and, per panel, the components that do not count as shadow:
+    the panel itself and, for solar panels, the frame that encloses it"""
+    panels = np.concatenate([assembly.select(prefix) for prefix in prefixes])
+    ignore = np.zeros((len(panels), len(assembly)), dtype=bool)
+    for row, index in enumerate(panels):
+        ignore[row, index] = True
+        frame = assembly.names[index].replace("solar_panel", "solar_frame")
+        if frame != assembly.names[index] and frame in assembly.names:
+            ignore[row, assembly.index(frame)] = True
+    return panels, ignore
+
+
+# ----------------------------
+# ANÁLISIS
+# ----------------------------
+
+class ShadowingResult:
+    """fraction[t, p]: illuminated share of the sun-facing projected area of panel p at step t"""
+
+    def __init__(self, names, times, sun_vectors, lit_area, facing_area):
+        self.names = names
+        self.times = times
+        self.sun_vectors = sun_vectors
+        self.lit_area = lit_area          # área proyectada iluminada (m²), útil para potencia
+        self.facing_area = facing_area    # área proyectada orientada al sol (m²)
+        self.fraction = np.divide(lit_area, facing_area, out=np.zeros_like(lit_area), where=facing_area > 0)
+
+    def save_csv(self, filename):
+        with open(filename, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["t", "sun_x", "sun_y", "sun_z"] + [f"{name}_fraction" for name in self.names]
+                            + [f"{name}_lit_area" for name in self.names])
+            for t, sun, fraction, lit in zip(self.times, self.sun_vectors, self.fraction, self.lit_area):
+                writer.writerow([f"{t:g}", *(f"{v:.6f}" for v in sun), *(f"{v:.4f}" for v in fraction),
+                                 *(f"{v:.4f}" for v in lit)])
+        return filename
+
+    def plot(self, filename="solar_shadowing.png", dpi=150):
+        fig = Figure(figsize=(12, 5))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
+        for p, name in enumerate(self.names):
+            ax.plot(self.times, self.fraction[:, p], label=name)
+        ax.set_xlabel("Paso de tiempo")
+        ax.set_ylabel("Fracción iluminada")
+        ax.set_ylim(-0.05, 1.05)
+        ax.set_title("Autosombreado de paneles solares y radiadores")
+        ax.grid(True, alpha=0.3)
+        ax.legend(fontsize=8, loc="lower right")
+        fig.tight_layout()
+        fig.savefig(filename, dpi=dpi)
+        return filename
+
+
+class ShadowingAnalysis:
+    """Fixed stratified samples on every panel, cast towards the sun against the rest of the assembly"""
+
+    def __init__(self, assembly, targets=DEFAULT_TARGETS, samples_per_panel=SAMPLES_PER_PANEL, caster=None, rng=0):
+        self.assembly = assembly
+        self.caster = caster if caster is not None else RayCaster(assembly)
+        self.panels, self.ignore = panel_targets(assembly, targets)
+        self.names = [assembly.names[i] for i in self.panels]
+
+        rng = np.random.default_rng(rng)
+        samples = [surface_samples(assembly, index, samples_per_panel, rng) for index in self.panels]
+        self.points = np.vstack([s[0] for s in samples])
+        self.normals = np.vstack([s[1] for s in samples])
+        self.weights = np.concatenate([s[3] for s in samples])
+        self.sample_panel = np.repeat(np.arange(len(self.panels)), [len(s[0]) for s in samples])
+
+    def run(self, sun_vectors, times=None, rays_per_batch=RAYS_PER_BATCH, processes=1):
+        sun_vectors = np.atleast_2d(np.asarray(sun_vectors, dtype=float))
+        norm = np.linalg.norm(sun_vectors, axis=1, keepdims=True)
+        sun = np.divide(sun_vectors, norm, out=np.zeros_like(sun_vectors), where=norm > 0)
+        n_steps, n_panels = len(sun), len(self.panels)
+        times = np.arange(n_steps, dtype=float) if times is None else np.asarray(times, dtype=float)
+
+        lit_area = np.zeros(n_steps * n_panels)
+        facing_area = np.zeros(n_steps * n_panels)
+        steps_per_batch = max(1, rays_per_batch // len(self.points))
+        for lo in range(0, n_steps, steps_per_batch):
+            cos = self.normals @ sun[lo:lo + steps_per_batch].T
+            sample, step = np.nonzero(cos > 0)
+            projected = self.weights[sample] * cos[sample, step]
+            bucket = (lo + step) * n_panels + self.sample_panel[sample]
+            facing_area += np.bincount(bucket, projected, minlength=len(facing_area))
+
+            hits = self.caster.intersect_ignoring(self.points[sample], sun[lo + step], self.ignore,
+                                                  group=self.sample_panel[sample], processes=processes)
+            # Rayos sin resolver (más de max_passes superficies propias atravesadas): se cuentan como sombra
+            lit = ~hits.hit & ~hits.unresolved
+            lit_area += np.bincount(bucket[lit], projected[lit], minlength=len(lit_area))
+
+        return ShadowingResult(self.names, times, sun, lit_area.reshape(n_steps, n_panels),
+                               facing_area.reshape(n_steps, n_panels))
+
+
+if __name__ == "__main__":
+    # Uso: python solar_shadowing.py [sol.txt | n_pasos] [beta_grados]
+    ship = falcon_parker_assembly()
+    if len(sys.argv) > 1 and not sys.argv[1].isdigit():
+        times, sun_vectors = load_sun_vectors(sys.argv[1])
+    else:
+        n_steps = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+        beta = float(sys.argv[2]) if len(sys.argv) > 2 else 20.0
+        times, sun_vectors = np.arange(n_steps), orbit_sun_vectors(n_steps, beta_deg=beta, eclipse_fraction=0.35)
+
+    start = time.perf_counter()
+    analysis = ShadowingAnalysis(ship)
+    result = analysis.run(sun_vectors, times)
+    elapsed = time.perf_counter() - start
+    print(f"{len(times)} instantes x {len(analysis.points)} muestras en {elapsed:.2f} s")
+    for p, name in enumerate(result.names):
+        sunlit = result.facing_area[:, p] > 0
+        print(f"  {name:<30} iluminado medio {result.fraction[sunlit, p].mean() * 100:5.1f}%  "
+              f"mínimo {result.fraction[sunlit, p].min() * 100:5.1f}%")
+    result.save_csv("solar_shadowing.csv")
+    result.plot("solar_shadowing.png")
+    print("Resultados guardados en solar_shadowing.csv y solar_shadowing.png")
@@ -0,0 +1,215 @@
+# view_factors.py
+# Factores de vista componente-componente y componente-espacio por emisión Monte Carlo de rayos.
+# Cada lote es una estimación independiente (muestreo estratificado con otra semilla); la dispersión
+# entre lotes da el error estándar. Los resultados se guardan en caché por huella de la geometría.
+
+import csv
+import hashlib
+import os
+import sys
+import time
+
+import numpy as np
+
+from assembly import falcon_parker_assembly
+from ray_caster import RayCaster, surface_samples
+from render_cache import DiskLRUCache, cache_dir
+
+RAYS_PER_BATCH = 4096        # rayos por componente emisor y lote
+MIN_BATCHES = 4
+MAX_BATCHES = 64
+TOLERANCE = 2e-3             # error estándar máximo aceptado en cualquier factor
+RAY_OFFSET = 1e-6
+STEFAN_BOLTZMANN = 5.670374419e-8
+T_SPACE = 2.7
+
+VIEW_FACTOR_CACHE_DIR = cache_dir("view_factors")
+
+
+# ----------------------------
+# EMISIÓN DIFUSA ESTRATIFICADA
+# ----------------------------
+
+def _tangent_frames(normals):
+    helper = np.where(np.abs(normals[:, [0]]) < 0.9, [[1.0, 0, 0]], [[0, 1.0, 0]])
+    t1 = np.cross(normals, helper)
+    t1 /= np.linalg.norm(t1, axis=1, keepdims=True)
+    return t1, np.cross(normals, t1)
+
+
+def cosine_directions(normals, rng):
+    """Lambertian directions about each normal, Latin-hypercube stratified over the unit square"""
+    n = len(normals)
+    u1 = (rng.permutation(n) + rng.random(n)) / n
+    u2 = (rng.permutation(n) + rng.random(n)) / n
+    r, phi = np.sqrt(u1), 2 * np.pi * u2
+    t1, t2 = _tangent_frames(normals)
+    return (r * np.cos(phi))[:, None] * t1 + (r * np.sin(phi))[:, None] * t2 + np.sqrt(1 - u1)[:, None] * normals
+
+
+# ----------------------------
+# RESULTADO
+# ----------------------------
+
+class ViewFactors:
+    """F[e, j]: fraction of the energy leaving emitter e that reaches component j; the last column is space"""
+
+    def __init__(self, names, emitters, areas, F, stderr, batches):
+        self.names = list(names)
+        self.emitters = np.asarray(emitters)
+        self.areas = np.asarray(areas)          # área de cada emisor (m²)
+        self.F = np.asarray(F)
+        self.stderr = np.asarray(stderr)
+        self.batches = int(batches)
+
+    @property
+    def to_space(self):
+        return self.F[:, -1]
+
+    def row(self, name):
+        return int(np.nonzero(self.emitters == self.names.index(name))[0][0])
+
+    def factor(self, emitter, target):
+        """View factor from one named component to another ('space' for deep space)"""
+        column = len(self.names) if target == "space" else self.names.index(target)
+        row = self.row(emitter)
+        return self.F[row, column], self.stderr[row, column]
+
+    def group(self, prefix):
+        """View factors from every emitter to a whole subtree (e.g. 'power/')"""
+        columns = [j for j, name in enumerate(self.names) if name.startswith(prefix)]
+        return self.F[:, columns].sum(axis=1)
+
+    def reciprocity_error(self):
+        """max |A_i F_ij - A_j F_ji| / max(A_i F_ij) over emitter pairs; large values also flag interpenetrating parts"""
+        exchange = self.areas[:, None] * self.F[:, self.emitters]
+        scale = max(np.abs(exchange).max(), 1e-12)
+        return np.abs(exchange - exchange.T).max() / scale
+
+    def save_npz(self, filename):
+        np.savez(filename, names=np.array(self.names), emitters=self.emitters, areas=self.areas,
+                 F=self.F, stderr=self.stderr, batches=self.batches)
+        return filename
+
+    @classmethod
+    def load_npz(cls, filename):
+        with np.load(filename) as data:
+            return cls([str(n) for n in data["names"]], data["emitters"], data["areas"], data["F"],
+                       data["stderr"], data["batches"])
+
+    def save_csv(self, filename):
+        with open(filename, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["emitter", "area_m2"] + self.names + ["space"])
+            for row, index in enumerate(self.emitters):
+                writer.writerow([self.names[index], f"{self.areas[row]:.4f}"] + [f"{v:.5f}" for v in self.F[row]])
+        return filename
+
+
+# ----------------------------
+# CÁLCULO
+# ----------------------------
+
+def _batch(caster, samples_per_emitter, emitters, rng, processes):
+    """One independent estimate of the (emitters x components+1) matrix"""
+    assembly = caster.assembly
+    n_columns = len(assembly) + 1
+    origins, directions, rows, weights = [], [], [], []
+    for row, index in enumerate(emitters):
+        points, normals, _, w = surface_samples(assembly, index, samples_per_emitter, rng)
+        origins.append(points + RAY_OFFSET * normals)
+        directions.append(cosine_directions(normals, rng))
+        rows.append(np.full(len(points), row))
+        weights.append(w / w.sum())
+    hits = caster.intersect(np.vstack(origins), np.vstack(directions), processes=processes)
+    column = np.where(hits.hit, hits.component, n_columns - 1)
+    bucket = np.concatenate(rows) * n_columns + column
+    return np.bincount(bucket, np.concatenate(weights), minlength=len(emitters) * n_columns).reshape(len(emitters), n_columns)
+
+
+def compute_view_factors(assembly, emitters=None, rays_per_batch=RAYS_PER_BATCH, tolerance=TOLERANCE,
+                         min_batches=MIN_BATCHES, max_batches=MAX_BATCHES, seed=0, processes=1,
+                         caster=None, use_cache=True, verbose=False):
+    """Monte Carlo view factors, adding batches until every standard error is below tolerance"""
+    emitters = np.arange(len(assembly)) if emitters is None else np.asarray(emitters)
+    emitter_hash = hashlib.blake2b(emitters.astype(np.int64).tobytes(), digest_size=8).hexdigest()
+    key = (f"{assembly.fingerprint()}-e{emitter_hash}"
+           f"-n{rays_per_batch}-tol{tolerance:g}-b{min_batches}-{max_batches}-s{seed}")
+    cache = DiskLRUCache(VIEW_FACTOR_CACHE_DIR) if use_cache else None
+    if cache is not None:
+        cached = cache.get(key, ".npz")
+        if cached is not None:
+            return ViewFactors.load_npz(cached)
+
+    caster = caster if caster is not None else RayCaster(assembly)
+    rng = np.random.default_rng(seed)
+    estimates = []
+    while len(estimates) < max_batches:
+        estimates.append(_batch(caster, rays_per_batch, emitters, rng, processes))
+        if len(estimates) >= min_batches:
+            stderr = np.std(estimates, axis=0, ddof=1) / np.sqrt(len(estimates))
+            if verbose:
+                print(f"  lote {len(estimates)}: error estándar máximo {stderr.max():.2e}")
+            if stderr.max() < tolerance:
+                break
+
+    areas = np.array([assembly.face_areas[assembly.component_faces(i)].sum() for i in emitters])
+    result = ViewFactors(assembly.names, emitters, areas, np.mean(estimates, axis=0), stderr, len(estimates))
+    if cache is not None:
+        tmp = cache.path_for(key, ".build.npz")
+        result.save_npz(tmp)
+        cache.put(key, tmp, ".npz")
+        os.remove(tmp)
+    return result
+
+
+# ----------------------------
+# RED TÉRMICA
+# ----------------------------
+
+def radiative_conductance(view_factors, emissivity=0.85):
+    """Grey-body exchange factors GR[e, j] = sigma * eps_e * eps_j * A_e * F_ej (W/K^4), space as last column.
+
+    emissivity can be a scalar, or a dict of name prefix -> emissivity (first matching prefix wins).
+    Reflections between surfaces are neglected, which is exact in the black-body limit.
+    """
+    names = view_factors.names
+    if isinstance(emissivity, dict):
+        eps = np.array([next((v for prefix, v in emissivity.items() if name.startswith(prefix)), 0.85)
+                        for name in names])
+    else:
+        eps = np.full(len(names), float(emissivity))
+    eps_columns = np.append(eps, 1.0)
+    eps_rows = eps[view_factors.emitters]
+    return STEFAN_BOLTZMANN * eps_rows[:, None] * eps_columns[None, :] * view_factors.areas[:, None] * view_factors.F
+
+
+def net_radiated_power(view_factors, temperatures, emissivity=0.85, t_space=T_SPACE):
+    """Net power (W) leaving each emitter for the given component temperatures (K)"""
+    gr = radiative_conductance(view_factors, emissivity)
+    t_columns = np.append(np.broadcast_to(np.asarray(temperatures, dtype=float), (len(view_factors.names),)), t_space)
+    t_rows = t_columns[view_factors.emitters]
+    return (gr * (t_rows[:, None] ** 4 - t_columns[None, :] ** 4)).sum(axis=1)
+
+
+if __name__ == "__main__":
+    # Uso: python view_factors.py [rayos_por_lote] [tolerancia]
+    rays = int(sys.argv[1]) if len(sys.argv) > 1 else RAYS_PER_BATCH
+    tolerance = float(sys.argv[2]) if len(sys.argv) > 2 else TOLERANCE
+
+    ship = falcon_parker_assembly()
+    emitters = np.concatenate([ship.select("thermal/"), ship.select("power/solar_panel")])
+    start = time.perf_counter()
+    vf = compute_view_factors(ship, emitters, rays_per_batch=rays, tolerance=tolerance, verbose=True)
+    print(f"{len(emitters)} emisores, {vf.batches} lotes en {time.perf_counter() - start:.2f} s, "
+          f"error de reciprocidad {vf.reciprocity_error():.2e}")
+
+    temperatures = np.full(len(ship), 300.0)
+    temperatures[ship.select("thermal/radiator_panel")] = 350.0
+    power = net_radiated_power(vf, temperatures, emissivity={"thermal/radiator": 0.9, "power/": 0.8})
+    for row, index in enumerate(vf.emitters):
+        print(f"  {ship.names[index]:<30} F_espacio {vf.to_space[row]:.3f} ± {vf.stderr[row, -1]:.3f}  "
+              f"F_fuselaje {vf.F[row, ship.index('structure/fuselage')]:.3f}  "
+              f"F_paneles {vf.group('power/solar_panel')[row]:.3f}  Q_neto {power[row] / 1000:.2f} kW")
+    vf.save_csv("view_factors.csv")
+    print("Matriz guardada en view_factors.csv")
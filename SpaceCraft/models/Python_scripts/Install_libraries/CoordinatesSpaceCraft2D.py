@@ -1,31 +1,34 @@
-import matplotlib.pyplot as plt
-import numpy as np
+import os
+import sys
 
-# Crear una figura
-fig, ax = plt.subplots(figsize=(10, 6))
+# schematic_svg vive en SpaceCraft_2/Components/functions (backend SVG/PDF compartido, sin matplotlib)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "..",
+                                "SpaceCraft_2", "Components", "functions"))
+from schematic_svg import Schematic
+
+# Crear esquema (fondo negro para líneas blancas); 10.5 x 6 mantiene la escala igual en los dos ejes (7 x 4)
+sch = Schematic(figsize=(10.5, 6), xlim=(0, 7), ylim=(3, 7), background="black")
 
 # Dibujar líneas del diseño (ejemplo: un diodo, resistencias, láser, etc.)
 # Línea láser
-ax.plot([1, 4], [5, 5], 'w', linewidth=2, label='Láser')
+sch.line(1, 5, 4, 5, color='white', linewidth=2)
 
 # Splitter
-ax.plot([4, 5], [5, 6], 'w', linewidth=2, label='Beam Splitter')
-ax.plot([4, 5], [5, 4], 'w', linewidth=2)
+sch.line(4, 5, 5, 6, color='white', linewidth=2)
+sch.line(4, 5, 5, 4, color='white', linewidth=2)
 
 # Fotodetector
-ax.plot([5, 6], [6, 6], 'w', linewidth=2, label='Fotodetector')
+sch.line(5, 6, 6, 6, color='white', linewidth=2)
 
 # Espejo
-ax.plot([5, 6], [4, 4], 'w', linewidth=2, label='Espejo')
-
-# Ajustes visuales
-ax.set_facecolor("black")  # Fondo negro para líneas blancas
-ax.set_xlim(0, 7)
-ax.set_ylim(3, 7)
-ax.set_aspect('equal')
-ax.axis('off')
-ax.legend()
+sch.line(5, 4, 6, 4, color='white', linewidth=2)
 
-# Guardar como imagen PNG
-plt.savefig("laser_design.png", bbox_inches='tight', dpi=300)
+# Leyenda (muestra de línea + etiqueta)
+for i, label in enumerate(['Láser', 'Beam Splitter', 'Fotodetector', 'Espejo']):
+    y = 6.8 - 0.25 * i
+    sch.line(0.2, y, 0.6, y, color='white', linewidth=2)
+    sch.text(0.7, y - 0.05, label, color='white', fontsize=9)
 
+# Guardar como SVG (usa .pdf para salida PDF)
+sch.save("laser_design.svg")
+print("Esquema guardado como laser_design.svg")
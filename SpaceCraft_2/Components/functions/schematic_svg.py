@@ -0,0 +1,288 @@
+# schematic_svg.py
+# Esquemas 2D (láseres, módulos, motores...) sin matplotlib: lista de formas -> SVG / PDF
+
+import os
+import zlib
+
+# ----------------------------
+# COLORES
+# ----------------------------
+
+NAMED_COLORS = {
+    "black": (0, 0, 0), "white": (255, 255, 255), "gray": (128, 128, 128), "grey": (128, 128, 128),
+    "lightgrey": (211, 211, 211), "lightgray": (211, 211, 211), "silver": (192, 192, 192),
+    "red": (255, 0, 0), "darkred": (139, 0, 0), "orangered": (255, 69, 0), "orange": (255, 165, 0),
+    "gold": (255, 215, 0), "yellow": (255, 255, 0), "lime": (0, 255, 0), "green": (0, 128, 0),
+    "cyan": (0, 255, 255), "deepskyblue": (0, 191, 255), "dodgerblue": (30, 144, 255),
+    "blue": (0, 0, 255), "slateblue": (106, 90, 205), "purple": (128, 0, 128), "magenta": (255, 0, 255),
+}
+
+DASHES = {"-": None, "--": (6, 4), ":": (1.5, 3), "-.": (6, 3, 1.5, 3)}
+
+
+def to_rgb(color):
+    if isinstance(color, (tuple, list)):
+        return tuple(int(c) for c in color[:3])
+    if color.startswith("#"):
+        return tuple(int(color[i:i + 2], 16) for i in (1, 3, 5))
+    return NAMED_COLORS[color.lower()]
+
+
+def to_hex(color):
+    if color in (None, "none"):
+        return "none"
+    return "#%02x%02x%02x" % to_rgb(color)
+
+
+def _escape_xml(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _escape_pdf(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+# ----------------------------
+# ESQUEMA (LISTA DE FORMAS)
+# ----------------------------
+
+class Schematic:
+    """Retained list of 2D shapes in data coordinates, written directly as SVG or PDF"""
+
+    def __init__(self, figsize=(10, 6), xlim=(0, 10), ylim=(0, 10), background="black", title=None,
+                 title_color="white", title_size=12):
+        self.width = figsize[0] * 72.0  # puntos
+        self.height = figsize[1] * 72.0
+        self.xlim = xlim
+        self.ylim = ylim
+        self.background = background
+        self.title = title
+        self.title_color = title_color
+        self.title_size = title_size
+        self.shapes = []
+
+    # --- primitivas ---
+
+    def rect(self, x, y, width, height, facecolor="gray", edgecolor="white", linewidth=1.0):
+        self.shapes.append(("rect", (x, y, width, height), facecolor, edgecolor, linewidth, "-"))
+
+    def circle(self, x, y, radius, facecolor="gray", edgecolor="white", linewidth=1.0, linestyle="-"):
+        self.shapes.append(("circle", (x, y, radius), facecolor, edgecolor, linewidth, linestyle))
+
+    def line(self, x1, y1, x2, y2, color="white", linewidth=1.0, linestyle="-"):
+        self.shapes.append(("line", (x1, y1, x2, y2), None, color, linewidth, linestyle))
+
+    def text(self, x, y, label, color="white", fontsize=10, ha="left"):
+        self.shapes.append(("text", (x, y, label, fontsize, ha), color, None, 0, "-"))
+
+    # --- componentes de los esquemas ---
+
+    def draw_module(self, x, y, width, height, label, color="deepskyblue"):
+        self.rect(x, y, width, height, facecolor=color, edgecolor="white", linewidth=1.5)
+        self.text(x + width / 2, y + height + 0.2, label, fontsize=8, ha="center")
+
+    def draw_line(self, x1, y1, x2, y2, color="white", linewidth=1, linestyle="--"):
+        self.line(x1, y1, x2, y2, color=color, linewidth=linewidth, linestyle=linestyle)
+
+    def draw_laser(self, x, y, width=1, height=0.5, color="gray", beam_length=2):
+        self.rect(x, y, width, height, facecolor=color, edgecolor="white")
+        self.line(x + width, y + height / 2, x + width + beam_length, y + height / 2, color="red", linewidth=2)
+        self.text(x + 0.2 * width, y + height + 0.1, "Láser")
+
+    def draw_beam_splitter(self, x, y):
+        self.rect(x, y, 0.6, 0.6, facecolor="blue", edgecolor="white")
+        self.line(x + 0.3, y + 0.3, x + 1.2, y + 1.2, linewidth=2)
+        self.line(x + 0.3, y + 0.3, x + 1.2, y - 0.6, linewidth=2)
+        self.text(x - 0.1, y + 0.7, "Beam Splitter")
+
+    def draw_mirror(self, x, y):
+        self.line(x, y, x, y + 1, color="cyan", linewidth=3)
+        self.text(x - 0.3, y + 1.1, "Espejo")
+
+    def draw_detector(self, x, y):
+        self.rect(x, y, 1, 0.5, facecolor="green", edgecolor="white")
+        self.text(x + 0.1, y + 0.6, "Detector")
+
+    def draw_main_body(self, x, y):
+        self.rect(x, y, 2, 1, facecolor="gray", edgecolor="white")
+        self.text(x + 0.3, y + 1.1, "Cuerpo central")
+
+    def draw_arm(self, x1, y1, x2, y2):
+        self.line(x1, y1, x2, y2, color="silver", linewidth=4)
+
+    def draw_motor(self, x, y):
+        self.circle(x, y, 0.2, facecolor="red", edgecolor="white")
+        self.circle(x, y, 0.4, facecolor="none", edgecolor="white", linestyle="--")
+        self.text(x - 0.3, y - 0.5, "Motor")
+
+    # --- transformación datos -> puntos (origen abajo a la izquierda) ---
+
+    def _sx(self):
+        return self.width / (self.xlim[1] - self.xlim[0])
+
+    def _sy(self):
+        return self.height / (self.ylim[1] - self.ylim[0])
+
+    def _px(self, x):
+        return (x - self.xlim[0]) * self._sx()
+
+    def _py(self, y):
+        return (y - self.ylim[0]) * self._sy()
+
+    # ----------------------------
+    # SALIDA SVG
+    # ----------------------------
+
+    def to_svg(self):
+        height = self.height
+        out = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width:.0f}pt" height="{height:.0f}pt" '
+            f'viewBox="0 0 {self.width:.2f} {height:.2f}">',
+            f'<rect width="100%" height="100%" fill="{to_hex(self.background)}"/>',
+        ]
+        for kind, geom, fill, stroke, lw, ls in self.shapes:
+            dash = DASHES.get(ls)
+            stroke_attrs = f'stroke="{to_hex(stroke)}" stroke-width="{lw:g}"'
+            if dash:
+                stroke_attrs += ' stroke-dasharray="%s"' % ",".join(f"{d * lw:g}" for d in dash)
+            if kind == "rect":
+                x, y, w, h = geom
+                out.append(
+                    f'<rect x="{self._px(x):.2f}" y="{height - self._py(y + h):.2f}" width="{w * self._sx():.2f}" '
+                    f'height="{h * self._sy():.2f}" fill="{to_hex(fill)}" {stroke_attrs}/>'
+                )
+            elif kind == "circle":
+                x, y, r = geom
+                out.append(
+                    f'<ellipse cx="{self._px(x):.2f}" cy="{height - self._py(y):.2f}" rx="{r * self._sx():.2f}" '
+                    f'ry="{r * self._sy():.2f}" fill="{to_hex(fill)}" {stroke_attrs}/>'
+                )
+            elif kind == "line":
+                x1, y1, x2, y2 = geom
+                out.append(
+                    f'<line x1="{self._px(x1):.2f}" y1="{height - self._py(y1):.2f}" x2="{self._px(x2):.2f}" '
+                    f'y2="{height - self._py(y2):.2f}" {stroke_attrs}/>'
+                )
+            else:
+                x, y, label, size, ha = geom
+                anchor = {"left": "start", "center": "middle", "right": "end"}[ha]
+                lines = label.split("\n")
+                # Como matplotlib: la línea base de la última línea queda en y
+                for i, text_line in enumerate(lines):
+                    dy = (len(lines) - 1 - i) * size * 1.2
+                    out.append(
+                        f'<text x="{self._px(x):.2f}" y="{height - self._py(y) - dy:.2f}" font-family="DejaVu Sans, sans-serif" '
+                        f'font-size="{size}" fill="{to_hex(fill)}" text-anchor="{anchor}">{_escape_xml(text_line)}</text>'
+                    )
+        if self.title:
+            out.append(
+                f'<text x="{self.width / 2:.2f}" y="{self.title_size * 1.5:.2f}" font-family="DejaVu Sans, sans-serif" '
+                f'font-size="{self.title_size}" fill="{to_hex(self.title_color)}" text-anchor="middle">'
+                f'{_escape_xml(self.title)}</text>'
+            )
+        out.append("</svg>")
+        return "\n".join(out)
+
+    # ----------------------------
+    # SALIDA PDF (una página, fuente Helvetica)
+    # ----------------------------
+
+    def _pdf_content(self):
+        ops = []
+
+        def color_op(color, stroke):
+            r, g, b = to_rgb(color)
+            return f"{r / 255:.3f} {g / 255:.3f} {b / 255:.3f} {'RG' if stroke else 'rg'}"
+
+        def circle_path(cx, cy, rx, ry):
+            k = 0.5523  # aproximación de Bézier de un cuarto de círculo
+            return (
+                f"{cx + rx:.2f} {cy:.2f} m "
+                f"{cx + rx:.2f} {cy + k * ry:.2f} {cx + k * rx:.2f} {cy + ry:.2f} {cx:.2f} {cy + ry:.2f} c "
+                f"{cx - k * rx:.2f} {cy + ry:.2f} {cx - rx:.2f} {cy + k * ry:.2f} {cx - rx:.2f} {cy:.2f} c "
+                f"{cx - rx:.2f} {cy - k * ry:.2f} {cx - k * rx:.2f} {cy - ry:.2f} {cx:.2f} {cy - ry:.2f} c "
+                f"{cx + k * rx:.2f} {cy - ry:.2f} {cx + rx:.2f} {cy - k * ry:.2f} {cx + rx:.2f} {cy:.2f} c h"
+            )
+
+        ops.append(color_op(self.background, False))
+        ops.append(f"0 0 {self.width:.2f} {self.height:.2f} re f")
+        for kind, geom, fill, stroke, lw, ls in self.shapes:
+            if kind == "text":
+                x, y, label, size, ha = geom
+                lines = label.split("\n")
+                for i, text_line in enumerate(lines):
+                    width = 0.52 * size * len(text_line)  # ancho medio aproximado de Helvetica
+                    offset = {"left": 0.0, "center": width / 2, "right": width}[ha]
+                    dy = (len(lines) - 1 - i) * size * 1.2
+                    encoded = _escape_pdf(text_line.encode("cp1252", "replace").decode("latin-1"))
+                    ops.append(
+                        f"BT {color_op(fill, False)} /F1 {size} Tf {self._px(x) - offset:.2f} {self._py(y) + dy:.2f} Td "
+                        f"({encoded}) Tj ET"
+                    )
+                continue
+
+            dash = DASHES.get(ls)
+            ops.append("q")
+            ops.append(f"{lw:g} w")
+            ops.append("[%s] 0 d" % (" ".join(f"{d * lw:g}" for d in dash) if dash else ""))
+            has_fill = fill not in (None, "none")
+            if has_fill:
+                ops.append(color_op(fill, False))
+            if stroke not in (None, "none"):
+                ops.append(color_op(stroke, True))
+            paint = "B" if has_fill else "S"
+            if kind == "rect":
+                x, y, w, h = geom
+                ops.append(f"{self._px(x):.2f} {self._py(y):.2f} {w * self._sx():.2f} {h * self._sy():.2f} re {paint}")
+            elif kind == "circle":
+                x, y, r = geom
+                ops.append(circle_path(self._px(x), self._py(y), r * self._sx(), r * self._sy()) + f" {paint}")
+            else:
+                x1, y1, x2, y2 = geom
+                ops.append(f"{self._px(x1):.2f} {self._py(y1):.2f} m {self._px(x2):.2f} {self._py(y2):.2f} l S")
+            ops.append("Q")
+        if self.title:
+            width = 0.52 * self.title_size * len(self.title)
+            encoded = _escape_pdf(self.title.encode("cp1252", "replace").decode("latin-1"))
+            ops.append(
+                f"BT {color_op(self.title_color, False)} /F1 {self.title_size} Tf "
+                f"{self.width / 2 - width / 2:.2f} {self.height - self.title_size * 1.5:.2f} Td ({encoded}) Tj ET"
+            )
+        return "\n".join(ops).encode("latin-1")
+
+    def to_pdf(self):
+        content = zlib.compress(self._pdf_content())
+        objects = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+            (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {self.width:.2f} {self.height:.2f}] "
+             f"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>").encode(),
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+            f"<< /Length {len(content)} /Filter /FlateDecode >>\nstream\n".encode() + content + b"\nendstream",
+        ]
+        pdf = bytearray(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(len(pdf))
+            pdf += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+        xref = len(pdf)
+        pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+        for offset in offsets:
+            pdf += f"{offset:010d} 00000 n \n".encode()
+        pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+        return bytes(pdf)
+
+    def save(self, filename):
+        if filename.lower().endswith(".pdf"):
+            with open(filename, "wb") as f:
+                f.write(self.to_pdf())
+        else:
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write(self.to_svg())
+        return filename
+
+
+def save_all(schematics, directory, fmt="svg"):
+    """Write a dict {name: Schematic} to directory/name.fmt (batch of subsystem diagrams)"""
+    os.makedirs(directory, exist_ok=True)
+    return [sch.save(os.path.join(directory, f"{name}.{fmt}")) for name, sch in schematics.items()]
@@ -5,9 +5,9 @@ import math
 # --- INICIO DEL BLOQUE DE DISEÑO ---
 
 class Spacecraft:
-    def __init__(self, name):
+    def __init__(self, name, mass=50000):
         self.name = name
-        self.mass = 50000  # kg
+        self.mass = mass  # kg (p. ej. MassModel(...).total().mass de mass_properties.py)
         self.fuselage = CompositeFuselage()
         self.engine = HybridPlasmaEngine()
         self.control_unit = FPGAControlSystem()
@@ -70,20 +70,25 @@ class OrbitDynamics:
 
 # --- FIN DEL BLOQUE DE DISEÑO ---
 
-# Crear nave
-ship = Spacecraft("Aetherion MkII")
-report = ship.status_report()
+def status_lines(ship):
+    # Convertir el status report a texto visualizable
+    report = ship.status_report()
+    return [f"{key}: {value}" for key, value in report.items()]
 
-# Convertir el status report a texto visualizable
-lines = [f"{key}: {value}" for key, value in report.items()]
-full_text = "\n".join(lines)
+def save_status_report(ship, filename="spacecraft_status.png"):
+    full_text = "\n".join(status_lines(ship))
 
-# Crear imagen
-fig, ax = plt.subplots(figsize=(6, 4))
-ax.axis('off')
-ax.text(0.01, 0.95, f"Spacecraft Report: {ship.name}\n\n{full_text}", fontsize=12, va='top', family='monospace')
+    # Crear imagen
+    fig, ax = plt.subplots(figsize=(6, 4))
+    ax.axis('off')
+    ax.text(0.01, 0.95, f"Spacecraft Report: {ship.name}\n\n{full_text}", fontsize=12, va='top', family='monospace')
 
-# Guardar como PNG
-plt.savefig("spacecraft_status.png", bbox_inches='tight', dpi=300)
-#plt.show()
+    # Guardar como PNG
+    plt.savefig(filename, bbox_inches='tight', dpi=300)
+    plt.close(fig)
+    #plt.show()
 
+if __name__ == "__main__":
+    # Crear nave
+    ship = Spacecraft("Aetherion MkII")
+    save_status_report(ship)
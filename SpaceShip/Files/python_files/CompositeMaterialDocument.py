@@ -17,15 +17,8 @@ class CompositeMaterial:
         self.plasma_resistance = plasma_resistance
         self.gravitational_resistance = gravitational_resistance
 
-def visualize_material(material):
-    fig, ax = plt.subplots(figsize=(8, 5))
-    ax.axis('off')
-    ax.text(0.5, 1.05, f"{material.name} - Composite Material", fontsize=16, ha='center', weight='bold')
-
-    rect = Rectangle((0, 0), 1, 1, linewidth=2, edgecolor='black', facecolor='lightgray', alpha=0.1)
-    ax.add_patch(rect)
-
-    props = {
+def material_properties(material):
+    return {
         "Density (kg/m³)": material.density,
         "Melting Point (K)": material.melting_point,
         "Thermal Conductivity (W/m·K)": material.thermal_conductivity,
@@ -36,6 +29,16 @@ def visualize_material(material):
         "Gravitational Resistance (G)": material.gravitational_resistance
     }
 
+def visualize_material(material, filename="composite_material_profile_two.png"):
+    fig, ax = plt.subplots(figsize=(8, 5))
+    ax.axis('off')
+    ax.text(0.5, 1.05, f"{material.name} - Composite Material", fontsize=16, ha='center', weight='bold')
+
+    rect = Rectangle((0, 0), 1, 1, linewidth=2, edgecolor='black', facecolor='lightgray', alpha=0.1)
+    ax.add_patch(rect)
+
+    props = material_properties(material)
+
     y_pos = 0.9
     for prop, val in props.items():
         ax.text(0.05, y_pos, f"{prop}:", fontsize=10, weight='bold', va='center')
@@ -43,20 +46,21 @@ def visualize_material(material):
         y_pos -= 0.1
 
     plt.tight_layout()
-    plt.savefig("composite_material_profile_two.png", dpi=300)
-    print("Image saved as composite_material_profile_two.png")
-
-# Instancia del material y llamada
-material = CompositeMaterial(
-    name="UltraCarbon-X",
-    density=1600,
-    melting_point=4200,
-    thermal_conductivity=150,
-    tensile_strength=3500,
-    radiation_resistance=0.95,
-    thermal_expansion=1.1e-6,
-    plasma_resistance=0.9,
-    gravitational_resistance=150
-)
-
-visualize_material(material)
+    plt.savefig(filename, dpi=300)
+    print(f"Image saved as {filename}")
+
+if __name__ == "__main__":
+    # Instancia del material y llamada
+    material = CompositeMaterial(
+        name="UltraCarbon-X",
+        density=1600,
+        melting_point=4200,
+        thermal_conductivity=150,
+        tensile_strength=3500,
+        radiation_resistance=0.95,
+        thermal_expansion=1.1e-6,
+        plasma_resistance=0.9,
+        gravitational_resistance=150
+    )
+
+    visualize_material(material)
@@ -0,0 +1,211 @@
+# report_cards.py
+# Tarjetas PNG (materiales, estado de nave, tablas) para catálogos completos.
+# La figura se construye una sola vez por proceso y solo se cambian los textos por elemento.
+
+import csv
+import os
+import sys
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.patches import Rectangle
+
+from composite_material import CompositeMaterial, material_properties
+
+MATERIAL_FIELDS = ["name", "density", "melting_point", "thermal_conductivity", "tensile_strength",
+                   "radiation_resistance", "thermal_expansion", "plasma_resistance", "gravitational_resistance"]
+
+
+# ----------------------------
+# PLANTILLAS
+# ----------------------------
+
+class CardTemplate(ABC):
+    """Figure laid out once; fill() only swaps text, save() writes the PNG"""
+
+    figsize = (8, 5)
+
+    def __init__(self, dpi=300, compress_level=1):
+        self.dpi = dpi
+        # zlib nivel 1: PNG algo más grande pero mucho más rápido de escribir
+        self.compress_level = compress_level
+        self.fig = None
+
+    def build(self):
+        self.fig = Figure(figsize=self.figsize)
+        FigureCanvasAgg(self.fig)
+        self.layout(self.fig)
+        return self
+
+    @abstractmethod
+    def layout(self, fig):
+        """Create the static artists and keep the text handles that fill() updates"""
+
+    @abstractmethod
+    def fill(self, item):
+        """Set the texts of one item"""
+
+    def render(self, item, filename):
+        if self.fig is None:
+            self.build()
+        self.fill(item)
+        self.fig.savefig(filename, dpi=self.dpi, pil_kwargs={"compress_level": self.compress_level})
+        return filename
+
+
+class MaterialCardTemplate(CardTemplate):
+    """Same card as visualize_material in composite_material.py"""
+
+    figsize = (8, 5)
+    labels = list(material_properties(CompositeMaterial("", *[0] * 8)).keys())
+
+    def layout(self, fig):
+        ax = fig.add_subplot(111)
+        ax.axis('off')
+        self.title = ax.text(0.5, 1.05, "", fontsize=16, ha='center', weight='bold')
+        ax.add_patch(Rectangle((0, 0), 1, 1, linewidth=2, edgecolor='black', facecolor='lightgray', alpha=0.1))
+        self.values = []
+        y_pos = 0.9
+        for label in self.labels:
+            ax.text(0.05, y_pos, f"{label}:", fontsize=10, weight='bold', va='center')
+            self.values.append(ax.text(0.55, y_pos, "", fontsize=10, va='center'))
+            y_pos -= 0.1
+        # El ajuste de márgenes se hace una vez, con un título de longitud típica
+        self.title.set_text("UltraCarbon-X - Composite Material")
+        fig.tight_layout()
+
+    def fill(self, item):
+        self.title.set_text(f"{item['name']} - Composite Material")
+        for text, label in zip(self.values, self.labels):
+            text.set_text(f"{item['values'][label]}")
+
+
+class StatusCardTemplate(CardTemplate):
+    """Same card as save_status_report in BasicSpacecraftDesgnVASIMIR.py"""
+
+    figsize = (6, 4)
+
+    def layout(self, fig):
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.axis('off')
+        self.block = ax.text(0.03, 0.95, "", fontsize=12, va='top', family='monospace')
+
+    def fill(self, item):
+        full_text = "\n".join(item["lines"])
+        self.block.set_text(f"Spacecraft Report: {item['name']}\n\n{full_text}")
+
+
+class TableCardTemplate(CardTemplate):
+    """Fixed table (CompositesNACA / Composites_simulation style); each card is a page of rows"""
+
+    def __init__(self, columns, rows_per_card=10, dpi=300, header_color="#cce6ff", compress_level=1):
+        super().__init__(dpi=dpi, compress_level=compress_level)
+        self.columns = list(columns)
+        self.rows_per_card = rows_per_card
+        self.header_color = header_color
+        self.figsize = (18, rows_per_card * 0.7)
+
+    def layout(self, fig):
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.axis("off")
+        empty = [[""] * len(self.columns) for _ in range(self.rows_per_card)]
+        self.table = ax.table(cellText=empty, colLabels=self.columns, loc="center", cellLoc='center',
+                              colLoc='center', colColours=[self.header_color] * len(self.columns))
+        self.table.auto_set_font_size(False)
+        self.table.set_fontsize(10)
+        self.table.scale(1, 1.5)
+
+    def fill(self, item):
+        rows = item["rows"]
+        for r in range(self.rows_per_card):
+            row = rows[r] if r < len(rows) else [""] * len(self.columns)
+            for c, value in enumerate(row):
+                self.table[(r + 1, c)].get_text().set_text(f"{value}")
+
+
+# ----------------------------
+# ELEMENTOS DEL CATÁLOGO
+# ----------------------------
+
+def material_item(material):
+    return {"name": material.name, "values": material_properties(material)}
+
+
+def status_item(ship):
+    from BasicSpacecraftDesgnVASIMIR import status_lines
+    return {"name": ship.name, "lines": status_lines(ship)}
+
+
+def table_items(rows, rows_per_card=10):
+    return [{"name": f"page_{i // rows_per_card:04d}", "rows": rows[i:i + rows_per_card]}
+            for i in range(0, len(rows), rows_per_card)]
+
+
+def load_material_catalog(path):
+    """CSV with one material per row and the CompositeMaterial field names as header"""
+    materials = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            args = [row["name"]] + [float(row[field]) for field in MATERIAL_FIELDS[1:]]
+            materials.append(CompositeMaterial(*args))
+    return materials
+
+
+# ----------------------------
+# RENDER EN PARALELO
+# ----------------------------
+
+_worker_template = None
+
+
+def _init_worker(template):
+    global _worker_template
+    _worker_template = template.build()
+
+
+def _render_chunk(jobs):
+    for item, filename in jobs:
+        _worker_template.render(item, filename)
+    return len(jobs)
+
+
+def _safe_name(name):
+    return "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in name)
+
+
+def render_catalog(template, items, out_dir, processes=None, chunksize=32, suffix="card"):
+    """Render one PNG per item with a pool of processes, each holding its own pre-built template"""
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(item, os.path.join(out_dir, f"{i:05d}_{_safe_name(item['name'])}_{suffix}.png"))
+            for i, item in enumerate(items)]
+    chunks = [jobs[i:i + chunksize] for i in range(0, len(jobs), chunksize)]
+
+    if processes == 1:
+        _init_worker(template)
+        done = sum(_render_chunk(chunk) for chunk in chunks)
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(template,)) as pool:
+            done = sum(pool.map(_render_chunk, chunks))
+    return [filename for _, filename in jobs[:done]]
+
+
+if __name__ == "__main__":
+    # Uso: python report_cards.py [catalogo.csv] [carpeta_salida]
+    out_dir = sys.argv[2] if len(sys.argv) > 2 else "material_cards"
+    if len(sys.argv) > 1:
+        catalog = load_material_catalog(sys.argv[1])
+    else:
+        # Catálogo de ejemplo: variantes de UltraCarbon-X
+        catalog = [
+            CompositeMaterial(f"UltraCarbon-X{i}", 1600 + i, 4200, 150, 3500 + 10 * i, 0.95,
+                              1.1e-6, 0.9, 150)
+            for i in range(200)
+        ]
+
+    start = time.perf_counter()
+    files = render_catalog(MaterialCardTemplate(), [material_item(m) for m in catalog], out_dir)
+    elapsed = time.perf_counter() - start
+    print(f"{len(files)} tarjetas guardadas en {out_dir} ({elapsed:.1f} s, {elapsed / max(len(files), 1) * 1000:.0f} ms/tarjeta)")